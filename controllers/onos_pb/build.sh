@@ -0,0 +1,23 @@
+#!/bin/bash
+
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+# The ONOS handlers are part of nstat, there is nothing to fetch. The
+# controller itself is downloaded by get_controller.sh.
+
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+echo $SCRIPT_DIR
+
+for handler in get_controller.sh start.sh stop.sh status.sh clean.sh; do
+    chmod +x $SCRIPT_DIR/$handler
+    if [ $? -ne 0 ]; then
+        echo "[build.sh] Handler $handler is missing. Exiting ..."
+        exit 1
+    fi
+done
+
+echo "[build.sh] Building ONOS handlers completed successfully"
@@ -0,0 +1,24 @@
+#!/bin/bash
+
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+echo $SCRIPT_DIR
+
+HANDLERS="build.sh clean.sh get_controller.sh start.sh stop.sh status.sh"
+
+for item in $( ls -1 $SCRIPT_DIR ); do
+    if [[ " $HANDLERS " != *" $item "* ]]; then
+        rm -rf "${SCRIPT_DIR:?}/${item:?}"
+        if [ $? -ne 0 ]; then
+            echo "[clean.sh] Cleanup of ONOS failed. Exiting ..."
+            exit 1
+        fi
+    fi
+done
+
+echo "[clean.sh] Cleanup of ONOS completed successfully"
@@ -0,0 +1,33 @@
+#!/bin/bash
+
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+# If the ONOS archive exists in /opt, it extracts it in the
+# current directory (the "fast" path).
+# If it doesn't exist, it downloads it in /opt and then extracts it.
+
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+echo $SCRIPT_DIR
+
+ONOS_VERSION="1.8.0"
+ONOS_ARCHIVE="onos-$ONOS_VERSION.tar.gz"
+ONOS_LOCATION="http://downloads.onosproject.org/release/$ONOS_ARCHIVE"
+
+if [ ! -f /opt/$ONOS_ARCHIVE ]; then
+    wget -nv -P /opt $ONOS_LOCATION
+    if [ $? -ne 0 ]; then
+        echo "[get_controller.sh] Downloading ONOS failed. Exiting ..."
+        exit 1
+    fi
+fi
+tar -xzf /opt/$ONOS_ARCHIVE -C $SCRIPT_DIR
+if [ $? -ne 0 ]; then
+    echo "[get_controller.sh] Extracting ONOS failed. Exiting ..."
+    exit 1
+fi
+
+echo "[get_controller.sh] Getting ONOS completed successfully"
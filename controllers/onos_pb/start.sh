@@ -0,0 +1,22 @@
+#!/bin/bash
+
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+# Starts ONOS in the background, with the JAVA_OPTS of the caller.
+
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+KARAF_DIR=$(ls -d $SCRIPT_DIR/onos-*/apache-karaf-* 2>/dev/null | head -1)
+
+if [ -z "$KARAF_DIR" ]; then
+    echo "[start.sh] ONOS is not installed. Exiting ..."
+    exit 1
+fi
+$KARAF_DIR/bin/start
+if [ $? -ne 0 ]; then
+    echo "[start.sh] Starting ONOS failed. Exiting ..."
+    exit 1
+fi
@@ -0,0 +1,18 @@
+#!/bin/bash
+
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+# Prints 1 if ONOS is running, 0 otherwise.
+
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+KARAF_DIR=$(ls -d $SCRIPT_DIR/onos-*/apache-karaf-* 2>/dev/null | head -1)
+
+if [ -n "$KARAF_DIR" ] && $KARAF_DIR/bin/status > /dev/null 2>&1; then
+    echo "1"
+else
+    echo "0"
+fi
@@ -0,0 +1,27 @@
+#!/bin/bash
+
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+# Stops ONOS and waits up to a minute for it to exit.
+
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+KARAF_DIR=$(ls -d $SCRIPT_DIR/onos-*/apache-karaf-* 2>/dev/null | head -1)
+
+if [ -z "$KARAF_DIR" ]; then
+    echo "[stop.sh] ONOS is not installed. Exiting ..."
+    exit 1
+fi
+$KARAF_DIR/bin/stop
+for i in $(seq 1 60); do
+    if [ "$($SCRIPT_DIR/status.sh)" == "0" ]; then
+        exit 0
+    fi
+    sleep 1
+done
+
+echo "[stop.sh] ONOS still running after 60 seconds. Exiting ..."
+exit 1
@@ -0,0 +1,119 @@
+#! /usr/bin/env python3
+
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Sampling agent, deployed by nstat on the controller node. It samples the
+/proc entries of a process at a fixed rate and stores the samples in a
+ring-buffer file, which nstat fetches in bulk.
+
+Ring-buffer file layout: an 8-byte header with the total number of samples
+written so far, followed by 'capacity' fixed-size records. Sample n is
+stored in record n % capacity. Every record holds the sample timestamp,
+the user and system cpu time of the process (clock ticks), its virtual
+memory size (bytes), its number of threads and its number of open file
+descriptors. The agent exits when the sampled process terminates.
+
+Only the python standard library is used, since the agent runs outside of
+the nstat virtual environment.
+"""
+
+import argparse
+import os
+import struct
+import time
+
+HEADER_FORMAT = '<Q'
+RECORD_FORMAT = '<dqqqqq'
+
+
+def sample(pid):
+    """
+    Takes a single sample of the /proc entries of a process
+
+    :param pid: the process ID of the target process
+    :returns: tuple with the timestamp, cpu user time, cpu system time, \
+        virtual memory size, number of threads and number of file \
+        descriptors of the process
+    :rtype: tuple
+    :type pid: int
+    :raises IOError: if the process does not exist or has terminated
+    """
+    timestamp = time.time()
+    with open('/proc/{0}/stat'.format(pid)) as stat_file:
+        stat_fields = stat_file.read().rsplit(') ', 1)[1].split()
+    if stat_fields[0] in ('Z', 'X'):
+        raise IOError('process {0} has terminated'.format(pid))
+    vm_size = 0
+    num_threads = 0
+    with open('/proc/{0}/status'.format(pid)) as status_file:
+        for line in status_file:
+            if line.startswith('VmSize:'):
+                vm_size = int(line.split()[1]) * 1024
+            elif line.startswith('Threads:'):
+                num_threads = int(line.split()[1])
+    num_fds = len(os.listdir('/proc/{0}/fd'.format(pid)))
+    return (timestamp, int(stat_fields[11]), int(stat_fields[12]), vm_size,
+            num_threads, num_fds)
+
+
+def run(pid, rate_hz, capacity, output_file):
+    """
+    Samples a process at a fixed rate into a ring-buffer file, until the \
+        process terminates
+
+    :param pid: the process ID of the target process
+    :param rate_hz: sampling rate in samples per second
+    :param capacity: maximum number of samples kept in the ring-buffer file
+    :param output_file: path of the ring-buffer file
+    :type pid: int
+    :type rate_hz: float
+    :type capacity: int
+    :type output_file: str
+    """
+    header_size = struct.calcsize(HEADER_FORMAT)
+    record_size = struct.calcsize(RECORD_FORMAT)
+    period = 1.0 / rate_hz
+    num_samples = 0
+    with open(output_file, 'wb') as ring_file:
+        ring_file.write(struct.pack(HEADER_FORMAT, 0))
+        ring_file.flush()
+        next_tick = time.time()
+        while True:
+            try:
+                record = struct.pack(RECORD_FORMAT, *sample(pid))
+            except (IOError, OSError):
+                break
+            ring_file.seek(header_size + (num_samples % capacity) *
+                           record_size)
+            ring_file.write(record)
+            num_samples += 1
+            ring_file.seek(0)
+            ring_file.write(struct.pack(HEADER_FORMAT, num_samples))
+            ring_file.flush()
+            next_tick += period
+            sleep_time = next_tick - time.time()
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+            else:
+                next_tick = time.time()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pid', required=True, type=int,
+                        help='process ID of the sampled process')
+    parser.add_argument('--rate-hz', required=True, type=float,
+                        help='samples per second')
+    parser.add_argument('--capacity', required=True, type=int,
+                        help='number of samples kept in the ring buffer')
+    parser.add_argument('--output', required=True,
+                        help='path of the ring-buffer file')
+    args = parser.parse_args()
+    with open(args.output + '.pid', 'w') as pid_file:
+        pid_file.write(str(os.getpid()))
+    run(args.pid, args.rate_hz, args.capacity, args.output)
@@ -4,17 +4,50 @@
 # terms of the Eclipse Public License v1.0 which accompanies this distribution,
 # and is available at http://www.eclipse.org/legal/epl-v10.html
 
+import functools
 import logging
 import os
 import sys
 import stress_test.controller_exceptions
+import threading
 import time
 import traceback
+import util.cmdtimings
+import util.convergence
 import util.file_ops
 import util.netutil
 import util.process
+import util.restconf
 import queue
 
+# Phases of the controller startup, in seconds from the invocation of the
+# start handler: the start handler has spawned the JVM, the OpenFlow port
+# accepts connections, the controller features are started
+STARTUP_PHASES = ['controller_spawn_secs', 'controller_listen_secs',
+                  'controller_ready_secs']
+
+# Settings of the ODL configuration and the attribute of their handler, in
+# the order the handlers run
+ODL_CONFIG_HANDLERS = [('persistence', 'persistence_hnd'),
+                       ('statistics_period_ms', 'statistics_hnd'),
+                       ('flowmods', 'flowmods_conf_hnd')]
+
+# ONOS components polling the statistics of the switches, with their
+# polling period property (in seconds)
+ONOS_STATISTICS_COMPONENTS = [
+    ('org.onosproject.provider.of.flow.impl.OpenFlowRuleProvider',
+     'flowPollFrequency'),
+    ('org.onosproject.provider.of.device.impl.OpenFlowDeviceProvider',
+     'portStatsPollFrequency')]
+# ONOS application installing flows as a response to Packet_INs, and the
+# one whose activation makes ONOS accept switches
+ONOS_FLOWMODS_APP = 'org.onosproject.fwd'
+ONOS_OPENFLOW_APP = 'org.onosproject.openflow'
+
+# Configuration files generated by the first start of an ODL distribution,
+# relative to the distribution directory
+ODL_GENERATED_XMLS = ['etc/opendaylight/karaf/*.xml']
+
 
 class Controller:
     """
@@ -56,8 +89,48 @@ class Controller:
         self.clean_hnd = (self.base_dir +
                           test_config['controller_clean_handler'])
         self.java_opts = ' '.join(test_config['java_opts'])
+
+        # Readiness detection: the controller ports are probed with TCP
+        # connects every readiness_interval_ms. If a log marker is given, the
+        # controller is ready once the marker appears in ready_log, otherwise
+        # once the status handler reports it running. Both are checked over
+        # ssh, every second or as soon as the RESTCONF port opens.
+        self.readiness_interval_ms = 100
+        if 'controller_readiness_interval_ms' in test_config:
+            self.readiness_interval_ms = \
+                test_config['controller_readiness_interval_ms']
+        self.ready_log_marker = None
+        self.ready_log = os.path.join(self.logs_dir, 'karaf.log')
+        if 'controller_ready_log_marker' in test_config:
+            self.ready_log_marker = test_config['controller_ready_log_marker']
+        if 'controller_ready_log' in test_config:
+            self.ready_log = os.path.join(self.logs_dir,
+                                          test_config['controller_ready_log'])
+        self._ready_log_offset = 0
+        self.startup_timeline = dict.fromkeys(STARTUP_PHASES, -1)
+
+        # Warm mode: between sweep points the controller keeps running and
+        # only its state is reset, see sweep_point_start()
+        self.warm_mode = False
+        if 'controller_warm_mode' in test_config:
+            self.warm_mode = test_config['controller_warm_mode']
+        self.reset_deadline_ms = 30000
+        if 'controller_reset_deadline_ms' in test_config:
+            self.reset_deadline_ms = \
+                test_config['controller_reset_deadline_ms']
+        self.restart_mode = 'cold'
+        self.reset_time_secs = -1
+        # Number of the current sweep point, counted by sweep_point_start(),
+        # -1 before the first one
+        self.sweep_point_id = -1
+        # Configuration last applied on the controller node and the one the
+        # running controller was started with, see ODL.apply_config()
+        self.applied_config = {}
+        self._started_config = None
+
         self.pid = -1
         self._ssh_conn = None
+        self._verified_hnds = set()
         util.file_ops.check_filelist([self.build_hnd,
                                       self.clean_hnd])
 
@@ -74,12 +147,33 @@ class Controller:
         """
         name = test_config['controller_name']
         if (name == 'ODL'):
+            if len(test_config.get('controller_cluster_members', [])) > 1:
+                return ODLCluster(ctrl_base_dir, test_config)
             return ODL(ctrl_base_dir, test_config)
         elif name == 'ONOS':
-            raise NotImplementedError('ONOS is not supported yet')
+            return ONOS(ctrl_base_dir, test_config)
         else:
             raise NotImplementedError('Not supported yet')
 
+    def get_members(self):
+        """
+        Returns the members of the controller, i.e. the controller itself \
+            unless it is a cluster
+
+        :returns: the member controller objects
+        :rtype: list<Controller>
+        """
+        return [self]
+
+    def get_member_ips(self):
+        """
+        Returns the IP addresses of the members of the controller
+
+        :returns: the IP addresses, the first one is the controller itself
+        :rtype: list<str>
+        """
+        return [member.ip for member in self.get_members()]
+
     def _error_handling(self, error_message, error_num=1):
         """
         Handles custom errors of controller
@@ -134,6 +228,27 @@ class Controller:
         except stress_test.controller_exceptions.CtrlError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    def init_oper_ssh(self):
+        """
+        Returns the ssh client to use for a poll of the operational \
+            datastore of the controller, so that concurrent pollers do not \
+            share a connection.
+
+        :returns: a new SSH client object to the controller node
+        :rtype: paramiko.SSHClient
+        """
+        return self.init_ssh()
+
+    def get_handlers(self):
+        """
+        Returns the handlers of the controller
+
+        :returns: full paths of all handlers of the controller
+        :rtype: list<str>
+        """
+        return [self.get_hnd, self.build_hnd, self.start_hnd, self.stop_hnd,
+                self.status_hnd, self.clean_hnd]
+
     def cleanup(self):
         """
         Wrapper to the controller cleanup handler
@@ -145,19 +260,14 @@ class Controller:
         logging.info('[Controller] Cleaning up')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.clean_hnd]):
-                    raise(IOError(
-                        '{0} clean handler does not exist'.
-                        format('[controller.cleanup]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.clean_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.clean_hnd], self._verified_hnds, '[Controller]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, self.clean_hnd,
                     '[controller.clean_handler]')
+                self._verified_hnds.clear()
+                self.applied_config = {}
                 if exit_status == 0:
                     logging.info('[controller.clean_handler] controller '
                                  'successfully cleaned.')
@@ -186,16 +296,9 @@ class Controller:
         logging.info('[Controller] Checking the status')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.status_hnd]):
-                    raise(IOError(
-                        '{0} status handler does not exist'.
-                        format('[controller.status]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.status_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.status_hnd], self._verified_hnds, '[Controller]')
                 q = queue.Queue()
                 util.netutil.ssh_run_command(self._ssh_conn, self.status_hnd,
                                              '[controller.status]', q)
@@ -263,6 +366,9 @@ class Controller:
         """
         Wrapper to the controller start handler
 
+        :returns: True if the controller was started, False if it was \
+            already running
+        :rtype: bool
         :raises IOError: if the handler does not exist on the remote host
         :raises controller_exceptions.CtrlStartError: When controller fails to \
             start.
@@ -270,16 +376,9 @@ class Controller:
         logging.info('[Controller.start] Starting')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.start_hnd]):
-                    raise(IOError(
-                        '{0} start handler does not exist'.
-                        format('[controller.stop]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.start_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.start_hnd], self._verified_hnds, '[Controller]')
                 if self._ssh_conn is None:
                     os.environ['JAVA_OPTS'] = self.java_opts
                     cmd = [self.start_hnd]
@@ -287,22 +386,36 @@ class Controller:
                     cmd = ['export JAVA_OPTS="{0}";'.format(self.java_opts),
                            self.start_hnd]
                 if self.check_status() == '0':
+                    self.startup_timeline = dict.fromkeys(STARTUP_PHASES, -1)
+                    self._ready_log_offset = self._ready_log_size()
+                    t_start = time.time()
                     exit_status, cmd_output = util.netutil.ssh_run_command(
                         self._ssh_conn, ' '.join(cmd),
                         '[Controller.start]')
+                    self.startup_timeline['controller_spawn_secs'] = \
+                        time.time() - t_start
                     self.pid = self.wait_until_listens(420000)
+                    self.startup_timeline['controller_listen_secs'] = \
+                        time.time() - t_start
                     logging.info('[Controller.start] Controller '
                                  'pid: {0}'.format(self.pid))
                     self.wait_until_up(420000)
+                    self.startup_timeline['controller_ready_secs'] = \
+                        time.time() - t_start
+                    self._started_config = dict(self.applied_config)
+                    logging.info('[Controller.start] Startup timeline: {0}'.
+                                 format(self.startup_timeline))
                     if exit_status != 0 or self.pid == -1:
                         raise(stress_test.controller_exceptions.CtrlStartError(
                             '[Controller.start] Fail to start. Start handler '
                             'exited with non zero exit status. \n '
                             'Handler output: {0}'.format(cmd_output),
                             exit_status))
+                    return True
                 elif self.check_status() == '1':
                     logging.info('[Controller.start] Controller already '
                                  'started.')
+                return False
             except stress_test.controller_exceptions.CtrlError as e:
                 self._error_handling(e.err_msg, e.err_code)
             except:
@@ -310,6 +423,59 @@ class Controller:
         except stress_test.controller_exceptions.CtrlError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    def reset_state(self):
+        """
+        Clears the state of the running controller, so that it can be \
+            reused for the next sweep point. Controllers without a way to \
+            reset their state are restarted instead.
+
+        :returns: True if the state of the controller is clean
+        :rtype: bool
+        """
+        return False
+
+    def sweep_point_start(self):
+        """
+        Brings the controller up for the next sweep point. In warm mode a \
+            running controller is kept and its state is reset with \
+            reset_state(). A cold restart is still done when the controller \
+            is not running, when its configuration was changed since it \
+            was started (e.g. a new statistics period), or when its state \
+            could not be verified clean. The kind of start is kept in \
+            restart_mode ('warm' or 'cold') and the duration of the reset in \
+            reset_time_secs (-1 for cold starts).
+        """
+        self.sweep_point_id += 1
+        if self.warm_mode and self.check_status() == '1':
+            if self._started_config != self.applied_config:
+                logging.info('[Controller] Configuration changed, cold '
+                             'restart required')
+            else:
+                t_start = time.time()
+                if self.reset_state():
+                    self.reset_time_secs = time.time() - t_start
+                    logging.info('[Controller] Warm start, controller state '
+                                 'reset in {0} seconds'.
+                                 format(self.reset_time_secs))
+                    self.restart_mode = 'warm'
+                    self.startup_timeline = dict.fromkeys(STARTUP_PHASES,
+                                                          -1)
+                    return
+                logging.warning('[Controller] Controller state is not clean '
+                                'after reset, cold restart required')
+            self.stop()
+        self.start()
+        self.restart_mode = 'cold'
+        self.reset_time_secs = -1
+
+    def sweep_point_stop(self):
+        """
+        Stops the controller at the end of a sweep point, unless it is kept \
+            running for the next point in warm mode
+        """
+        if not self.warm_mode:
+            self.stop()
+
     def stop(self):
         """
         Wrapper to the controller stop handler
@@ -320,16 +486,9 @@ class Controller:
         """
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.stop_hnd]):
-                    raise(IOError(
-                        '{0} stop handler does not exist'.
-                        format('[controller.stop]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.stop_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.stop_hnd], self._verified_hnds, '[Controller]')
                 if self.check_status() == '1':
                     logging.info('[Controller.stop] Stopping. Controller '
                                  'PID: {0}'.format(self.pid))
@@ -365,16 +524,9 @@ class Controller:
         logging.info('[Controller] Downloading...')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.get_hnd]):
-                    raise(IOError(
-                        '{0} get controller handler does not exist'.
-                        format('[controller.build]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.get_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.get_hnd], self._verified_hnds, '[Controller]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, ' '.join([self.get_hnd]),
                     '[controller.get]')
@@ -395,7 +547,9 @@ class Controller:
 
     def build(self):
         """
-        Wrapper to the controller build handler
+        Wrapper to the controller build handler. After a successful build \
+            the handlers of the controller are all checked at once, see \
+            get_handlers().
 
         :raises IOError: if the handler does not exist on the remote host
         :raises controller_exceptions.CtrlBuildError: if build process fails
@@ -403,16 +557,11 @@ class Controller:
         logging.info('[Controller] Building')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.build_hnd]):
-                    raise(IOError(
-                        '{0} build handler does not exist'.
-                        format('[controller.build]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.build_hnd)
+                self._verified_hnds.clear()
+                self.applied_config = {}
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.build_hnd], self._verified_hnds, '[Controller]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, ' '.join([self.build_hnd]),
                     '[controller.build]')
@@ -424,6 +573,10 @@ class Controller:
                         'handler exited with non zero exit status. \n '
                         'Handler output: {0}'.
                         format(cmd_output)), exit_status)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    self.get_handlers(), self._verified_hnds, '[Controller]',
+                    required=False)
             except stress_test.controller_exceptions.CtrlError as e:
                 self._error_handling(e.err_msg, e.err_code)
             except:
@@ -449,8 +602,17 @@ class Controller:
         try:
             try:
                 timeout = time.time() + (float(timeout_ms) / 1000)
+                next_pid_check = time.time() + 1
                 while time.time() < timeout:
-                    time.sleep(1)
+                    time.sleep(float(self.readiness_interval_ms) / 1000)
+                    # The listening process is looked up on the controller
+                    # node once the port accepts connections, or every
+                    # second in case the port is not reachable from here
+                    if not util.netutil.tcp_port_listens(
+                            self.ip, self.of_port) and \
+                            time.time() < next_pid_check:
+                        continue
+                    next_pid_check = time.time() + 1
                     gpid = util.process.getpid_listeningonport(self.of_port,
                                                                self._ssh_conn)
                     logging.info('[Controller] Returned pid listening '
@@ -475,21 +637,39 @@ class Controller:
 
     def wait_until_up(self, timeout_ms):
         """
-        Waits for controller status to become 1 (started).
+        Waits for the controller to be started: until the ready log marker \
+            appears in the controller log if one is configured, otherwise \
+            until the controller status becomes 1 (started). The marker or \
+            the status is checked over ssh every second, and right away when \
+            the RESTCONF port, probed at the readiness interval, starts \
+            accepting connections.
 
         :param timeout_ms: milliseconds to wait (in milliseconds).
         :type timeout_ms: int
-        :raises controller_exceptions.CtrlReadyStateError: If controller fails \
-             to reach a ready state within a certain period of time.
+        :raises controller_exceptions.CtrlReadyStateError: If controller \
+            fails to reach a ready state within a certain period of time.
         """
 
         logging.info('[Controller] Waiting to be started')
         try:
             try:
                 timeout = time.time() + (float(timeout_ms) / 1000)
+                restconf_port = getattr(self, 'restconf_port', None)
+                port_listens = restconf_port is None
+                next_check = time.time() + 1
                 while time.time() < timeout:
-                    time.sleep(1)
-                    if self.check_status() == '1':
+                    time.sleep(float(self.readiness_interval_ms) / 1000)
+                    if not port_listens and util.netutil.tcp_port_listens(
+                            self.ip, restconf_port):
+                        port_listens = True
+                    elif time.time() < next_check:
+                        continue
+                    next_check = time.time() + 1
+                    if self.ready_log_marker is not None:
+                        ready = self._ready_log_contains_marker()
+                    else:
+                        ready = self.check_status() == '1'
+                    if ready:
                         logging.info('[Controller] Started')
                         return
                 raise(stress_test.controller_exceptions.CtrlReadyStateError(
@@ -503,6 +683,85 @@ class Controller:
         except stress_test.controller_exceptions.CtrlError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    def _ready_log_size(self):
+        """
+        Returns the size of the controller log, so that only the log lines \
+            written after a start are searched for the ready log marker.
+
+        :returns: size of the log in bytes, 0 if there is no log yet
+        :rtype: int
+        """
+        if self.ready_log_marker is None:
+            return 0
+        cmd_output = util.netutil.ssh_run_command(
+            self._ssh_conn, 'stat -c %s {0} 2>/dev/null || echo 0'.
+            format(self.ready_log), '[controller.ready_log]')[1]
+        try:
+            return int(cmd_output.strip())
+        except ValueError:
+            return 0
+
+    def _ready_log_contains_marker(self):
+        """
+        Searches the controller log written since the start for the ready \
+            log marker.
+
+        :returns: True if the marker was found
+        :rtype: bool
+        """
+        # The whole log is searched if it was rotated since the start
+        exit_status = util.netutil.ssh_run_command(
+            self._ssh_conn, "n={0}; [ $(stat -c %s {1} 2>/dev/null || echo 0) "
+            "-ge $n ] || n=0; tail -c +$((n + 1)) {1} 2>/dev/null | "
+            "grep -q -F -- '{2}'".format(self._ready_log_offset,
+                                         self.ready_log,
+                                         self.ready_log_marker),
+            '[controller.ready_log]')[0]
+        return exit_status == 0
+
+    def _oper_residual(self):
+        """
+        Polls the operational datastore for the convergence detection of \
+            reset_state(), in the subclasses that implement \
+            get_oper_snapshot()
+
+        :returns: total number of switches, links, hosts and flows, -1 on \
+            failure
+        :rtype: int
+        """
+        try:
+            snapshot = self.get_oper_snapshot(self.init_oper_ssh())
+        except stress_test.controller_exceptions.CtrlError:
+            return -1
+        counts = [snapshot[query] for query in
+                  ['switches', 'links', 'hosts', 'flows']]
+        if -1 in counts:
+            return -1
+        return sum(counts)
+
+    def save_log(self, output_dir):
+        """
+        Save controller log file
+
+        :param output_dir: the directory where the controller logs are stored
+        :type output_dir: str
+        """
+
+        try:
+            logging.info('[controller_save_log] collecting logs from '
+                         'controller node. Logs path:{0}'.
+                         format(self.logs_dir))
+            util.netutil.copy_dir_remote_to_local(
+                self.ip,
+                self.ssh_port,
+                self.ssh_user,
+                self.ssh_pass,
+                os.path.join(self.base_dir, self.logs_dir),
+                os.path.join(output_dir, 'log'))
+        except:
+            logging.error('[controller_save_log] Fail transferring controller'
+                          ' logs directory.')
+
     def __del__(self):
         """
         Method called when object is destroyed. Cleanup activities are
@@ -545,14 +804,15 @@ class ODL(Controller):
         :type ctrl_base_dir: str
         :type test_config: JSON configuration dictionary
         """
-        super(self.__class__, self).__init__(ctrl_base_dir, test_config)
+        super(ODL, self).__init__(ctrl_base_dir, test_config)
 
         # The parameters initialized as None are dimensions of the test.
         # These values are passed outside, from the test in the main for loop.
         # ---------------------------------------------------------------------
         self.stat_period_ms = None
-        self.init_ssh()
-        self.build()
+        # Set by flowmods_config(), part of the configuration applied by
+        # apply_config()
+        self.flowmods_enabled = False
 
         if 'controller_flowmods_conf_handler' in test_config:
             self.flowmods_conf_hnd = \
@@ -563,10 +823,33 @@ class ODL(Controller):
         if 'controller_persistent_handler' in test_config:
             self.persistence_hnd = \
                 ctrl_base_dir + test_config['controller_persistent_handler']
+        self.restconf_direct = False
         if 'controller_restconf_port' in test_config:
             self.restconf_port = test_config['controller_restconf_port']
             self.restconf_user = test_config['controller_restconf_user']
             self.restconf_pass = test_config['controller_restconf_password']
+            # Query the operational datastore directly over RESTCONF, with
+            # the oper_* handlers as a fallback
+            if 'controller_restconf_direct' in test_config:
+                self.restconf_direct = \
+                    test_config['controller_restconf_direct']
+            else:
+                self.restconf_direct = True
+
+        # The configuration generated by the first start of a distribution
+        # is cached on the controller node, keyed by a hash of the
+        # distribution, see generate_xmls(). There is no cache if the
+        # distribution directory is not given.
+        self.distribution_dir = None
+        if 'controller_distribution_dir' in test_config:
+            self.distribution_dir = \
+                ctrl_base_dir + test_config['controller_distribution_dir']
+        self.xml_cache_enabled = self.distribution_dir is not None
+        if self.xml_cache_enabled and 'controller_xml_cache' in test_config:
+            self.xml_cache_enabled = test_config['controller_xml_cache']
+        self.xml_cache_dir = '~/.nstat/xml_cache'
+        if 'controller_xml_cache_dir' in test_config:
+            self.xml_cache_dir = test_config['controller_xml_cache_dir']
 
         self.oper_hosts = (ctrl_base_dir +
                            test_config['controller_oper_hosts_handler'])
@@ -576,130 +859,332 @@ class ODL(Controller):
                            test_config['controller_oper_links_handler'])
         self.oper_flows = (ctrl_base_dir +
                            test_config['controller_oper_flows_handler'])
-        self.disable_persistence()
+        self.init_ssh()
+        self.build()
+        self.apply_config()
+
+    def get_handlers(self):
+        """
+        Returns the handlers of the OpenDaylight controller
+
+        :returns: full paths of all handlers of the controller
+        :rtype: list<str>
+        """
+        handlers = Controller.get_handlers(self) + [
+            self.oper_hosts, self.oper_switches, self.oper_links,
+            self.oper_flows]
+        for hnd_attr in ['flowmods_conf_hnd', 'statistics_hnd',
+                         'persistence_hnd']:
+            if hasattr(self, hnd_attr):
+                handlers.append(getattr(self, hnd_attr))
+        return handlers
+
+    def init_oper_ssh(self):
+        """
+        Returns the ssh client to use for a poll of the operational \
+            datastore. No new ssh connection is opened when the datastore is \
+            queried directly over RESTCONF; the handlers fall back to the \
+            main connection of the controller node if a direct query fails.
+
+        :returns: a new SSH client object to the controller node, or None
+        :rtype: paramiko.SSHClient
+        """
+        if self.restconf_direct:
+            return None
+        return self.init_ssh()
+
+    def _get_oper_direct(self, query):
+        """
+        Queries the operational datastore of the controller directly over \
+            RESTCONF, see util.restconf.get_oper_count().
+
+        :param query: one of 'switches', 'flows', 'links', 'hosts'
+        :returns: the number of the queried elements, or None if direct \
+            queries are disabled or the query failed
+        :rtype: int
+        :type query: str
+        """
+        if not self.restconf_direct:
+            return None
+        try:
+            return util.restconf.get_oper_count(
+                self.ip, self.restconf_port, self.restconf_user,
+                self.restconf_pass, query)
+        except IOError as e:
+            logging.warning('[Controller] Direct RESTCONF query of {0} '
+                            'failed, falling back to the handler: {1}'.
+                            format(query, e))
+            return None
+
+    def _distribution_hash(self):
+        """
+        Computes a content hash of the controller distribution, before its \
+            first start: the names and sizes of its bundles and the contents \
+            of its configuration files.
+
+        :returns: the hash, or None if it could not be computed
+        :rtype: str
+        """
+        exit_status, cmd_output = util.netutil.ssh_run_command(
+            self._ssh_conn,
+            "cd {0} && {{ find system -type f -printf '%P %s\\n' | sort; "
+            "find etc -type f -exec sha1sum {{}} + | sort -k 2; }} | "
+            "sha1sum | cut -c1-40".format(self.distribution_dir),
+            '[controller.distribution_hash]')
+        distribution_hash = cmd_output.strip()
+        if exit_status != 0 or len(distribution_hash) != 40:
+            logging.warning('[Controller] Failed to hash the distribution: '
+                            '{0}'.format(cmd_output))
+            return None
+        return distribution_hash
+
+    def _xml_cache_file(self, distribution_hash):
+        """
+        Returns the cached configuration archive of a distribution
+
+        :param distribution_hash: hash of the distribution
+        :returns: path of the archive on the controller node
+        :rtype: str
+        :type distribution_hash: str
+        """
+        return '{0}/{1}.tar.gz'.format(self.xml_cache_dir, distribution_hash)
+
+    def _restore_xmls(self, distribution_hash):
+        """
+        Restores the cached configuration files of a distribution
+
+        :param distribution_hash: hash of the distribution
+        :returns: True if the configuration was restored, False if there is \
+            no cached configuration
+        :rtype: bool
+        :type distribution_hash: str
+        """
+        cache_file = self._xml_cache_file(distribution_hash)
+        exit_status = util.netutil.ssh_run_command(
+            self._ssh_conn, 'test -s {0} && tar -xzf {0} -C {1}'.
+            format(cache_file, self.distribution_dir),
+            '[controller.restore_xmls]')[0]
+        return exit_status == 0
+
+    def _cache_xmls(self, distribution_hash):
+        """
+        Archives the configuration files generated by the first start of \
+            the controller (ODL_GENERATED_XMLS) into the cache of the \
+            distribution. Failures are logged, the next run generates the \
+            configuration again.
+
+        :param distribution_hash: hash of the distribution
+        :type distribution_hash: str
+        """
+        cache_file = self._xml_cache_file(distribution_hash)
+        exit_status, cmd_output = util.netutil.ssh_run_command(
+            self._ssh_conn,
+            'cd {0} && mkdir -p {1} && tar -czf {2}.tmp {3} && '
+            'mv {2}.tmp {2}; status=$?; rm -f {2}.tmp; exit $status'.
+            format(self.distribution_dir, self.xml_cache_dir, cache_file,
+                   ' '.join(ODL_GENERATED_XMLS)),
+            '[controller.cache_xmls]')
+        if exit_status == 0:
+            logging.info('[Controller] Cached the XML files in {0}'.
+                         format(cache_file))
+        else:
+            logging.warning('[Controller] Failed to cache the XML files: '
+                            '{0}'.format(cmd_output))
+
+    def reset_state(self):
+        """
+        Clears the state of the running controller through RESTCONF: the \
+            configuration datastore inventory (installed flows) is deleted, \
+            then the operational datastore is polled until it holds no \
+            switches, links, hosts or flows. Switch connections are dropped \
+            by the SB emulator teardown at the end of the previous sweep \
+            point; switches still connected keep the state from being clean.
+
+        :returns: True if the state of the controller is clean
+        :rtype: bool
+        """
+        if not hasattr(self, 'restconf_port'):
+            return False
+        try:
+            util.restconf.restconf_delete(
+                self.ip, self.restconf_port, self.restconf_user,
+                self.restconf_pass, util.restconf.CONFIG_INVENTORY_PATH)
+        except IOError as e:
+            logging.warning('[Controller] Failed to clear the config '
+                            'datastore: {0}'.format(e))
+            return False
+        detector = util.convergence.ConvergenceDetector(
+            0, float(self.reset_deadline_ms) / 1000)
+        outcome = detector.run(self._oper_residual)
+        if not outcome['converged']:
+            logging.warning('[Controller] {0} elements left in the '
+                            'operational datastore after reset'.
+                            format(outcome['value']))
+        return outcome['converged']
 
     def generate_xmls(self):
         """
         Starts and then stops the controller to trigger the generation of \
-            controller's XML files.
+            controller's XML files. The generated files are cached on the \
+            controller node, keyed by a content hash of the distribution, \
+            and later runs on the same distribution restore them instead of \
+            starting and stopping the controller. Either way the \
+            configuration files are fresh, so the whole configuration is \
+            applied again by the next apply_config().
 
         :raises controller_exceptions.ODLXMLError: if generation of XML files \
             fails
         """
-        logging.info('[Controller] Generating XML files'
-                     ' (start and stop the Controller)')
         try:
             try:
+                distribution_hash = None
+                if self.xml_cache_enabled:
+                    distribution_hash = self._distribution_hash()
+                if distribution_hash is not None:
+                    if self._restore_xmls(distribution_hash):
+                        self.applied_config = {}
+                        logging.info('[Controller] Restored the XML files of '
+                                     'distribution {0} from the cache'.
+                                     format(distribution_hash))
+                        return
+                logging.info('[Controller] Generating XML files'
+                             ' (start and stop the Controller)')
                 self.start()
                 self.stop()
+                self.applied_config = {}
+                if distribution_hash is not None:
+                    self._cache_xmls(distribution_hash)
             except:
                 raise(stress_test.controller_exceptions.ODLXMLError)
         except stress_test.controller_exceptions.CtrlError as e:
             self._error_handling(e.err_msg, e.err_code)
 
-    def disable_persistence(self):
+    def desired_config(self):
         """
-        Configure controller persistent to false in order not to backup \
-            datastore on the disk.
+        Returns the configuration the controller should run with, as \
+            declared by the dimensions of the test: disabled persistence, \
+            the statistics period and the flow modifications setting. \
+            Settings without a handler in the test configuration are left out.
 
-        :raises controller_exceptions.ODLDisablePersistenceError: if disable \
-            of persistence fails
+        :returns: the value of every setting, by setting name
+        :rtype: dict
+        """
+        config = {}
+        if hasattr(self, 'persistence_hnd'):
+            config['persistence'] = False
+        if hasattr(self, 'statistics_hnd') and self.stat_period_ms is not None:
+            config['statistics_period_ms'] = self.stat_period_ms
+        if self.flowmods_enabled:
+            config['flowmods'] = True
+        return config
+
+    def apply_config(self):
+        """
+        Applies the settings of desired_config() that differ from the last \
+            applied configuration. The handlers of all changed settings run \
+            in a single remote command, which also checks that the handlers \
+            exist and makes them executable. Nothing runs on the controller \
+            node when no setting changed.
+
+        :returns: True if any setting was applied, False otherwise
+        :rtype: bool
+        :raises controller_exceptions.ODLConfigApplyError: if a handler does \
+            not exist or fails
         """
-        logging.info('[Controller] Disabling persistence')
+        desired = self.desired_config()
+        changes = [setting for setting, hnd_attr in ODL_CONFIG_HANDLERS
+                   if setting in desired and
+                   self.applied_config.get(setting) != desired[setting]]
+        if not changes:
+            logging.info('[Controller] Configuration unchanged, nothing to '
+                         'apply')
+            return False
+        logging.info('[Controller] Applying configuration changes: {0}'.
+                     format(dict((setting, desired[setting])
+                                 for setting in changes)))
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.persistence_hnd]):
-                    raise(IOError(
-                        '{0} disable_persistence handler does not exist'.
-                        format('[controller.disable_persistence]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.persistence_hnd)
-                util.netutil.ssh_run_command(self._ssh_conn,
-                                             ' '.join([self.persistence_hnd]),
-                                             '[controller.disable_persistence]'
-                                             )
+                handlers = []
+                commands = []
+                for setting, hnd_attr in ODL_CONFIG_HANDLERS:
+                    if setting not in changes:
+                        continue
+                    handler = getattr(self, hnd_attr)
+                    handlers.append(handler)
+                    if setting == 'statistics_period_ms':
+                        commands.append(' '.join([handler,
+                                                  str(desired[setting])]))
+                    else:
+                        commands.append(handler)
+                unverified = [handler for handler in handlers
+                              if handler not in self._verified_hnds]
+                if unverified:
+                    commands.insert(0, 'for hnd in {0}; do [ -f "$hnd" ] || '
+                                    '{{ echo "$hnd does not exist"; exit 127; '
+                                    '}}; chmod +x "$hnd"; done'.
+                                    format(' '.join(unverified)))
+                exit_status, cmd_output = util.netutil.ssh_run_command(
+                    self._ssh_conn, ' && '.join(commands),
+                    '[controller.apply_config]')
+                if exit_status != 0:
+                    raise(stress_test.controller_exceptions.
+                          ODLConfigApplyError(
+                              'Handlers exited with non zero exit status. '
+                              '\n Handler output: {0}'.format(cmd_output),
+                              exit_status))
+                self._verified_hnds.update(handlers)
+                for setting in changes:
+                    self.applied_config[setting] = desired[setting]
+                logging.info('[Controller] Configuration applied')
+                return True
+            except stress_test.controller_exceptions.CtrlError as e:
+                self._error_handling(e.err_msg, e.err_code)
             except:
-                raise(stress_test.controller_exceptions.
-                      ODLDisablePersistenceError)
+                raise(stress_test.controller_exceptions.ODLConfigApplyError)
         except stress_test.controller_exceptions.CtrlError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    def disable_persistence(self):
+        """
+        Configure controller persistent to false in order not to backup \
+            datastore on the disk. Persistence is part of desired_config(), \
+            so this only applies the configuration if it is not applied yet.
+
+        :raises controller_exceptions.ODLConfigApplyError: if disable of \
+            persistence fails
+        """
+        self.apply_config()
+
     def change_stats(self):
         """
-        Wrapper to the controller statistics handler. Changes the value of \
-            statistics interval in the configuration files of controller.
+        Applies the statistics period of the test (stat_period_ms) in the \
+            configuration files of controller, if it differs from the last \
+            applied one.
 
-        :raises IOError: if the handler does not exist on the remote host
-        :raises controller_exceptions.ODLChangeStats: if change of statistics \
-            interval fails
+        :raises controller_exceptions.ODLConfigApplyError: if change of \
+            statistics interval fails
         """
-        logging.info('[Controller] Changing statistics period')
-        try:
-            try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.statistics_hnd]):
-                    raise(IOError(
-                        '{0} statistics handler does not exist'.
-                        format('[controller.change_stats]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.statistics_hnd)
-                util.netutil.ssh_run_command(
-                    self._ssh_conn, ' '.join([self.statistics_hnd,
-                                              str(self.stat_period_ms)]),
-                    '[controller.statistics_handler]'
-                    ' Changing statistics interval')
-                logging.info(
-                    '[Controller] Changed statistics period to {0} ms'.
-                    format(self.stat_period_ms))
-            except:
-                raise(stress_test.controller_exceptions.ODLChangeStats)
-        except stress_test.controller_exceptions.CtrlError as e:
-            self._error_handling(e.err_msg, e.err_code)
+        self.apply_config()
 
     def flowmods_config(self):
         """
         Configure controller to send flow modifications as a response to ARP \
             ARP Packet_INs.
 
-        :raises controller_exceptions.ODLFlowModConfError: if configuration \
+        :raises controller_exceptions.ODLConfigApplyError: if configuration \
             actions to respond with flow modifications fail.
         """
-        logging.info('[Controller.flowmods_config] Configure flow '
-                     'modifications')
-        try:
-            try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.flowmods_conf_hnd]):
-                    raise(IOError(
-                        '{0} Configure for FlowMods handler does not exist'.
-                        format('[controller.flowmods_config]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.flowmods_conf_hnd)
-                util.netutil.ssh_run_command(
-                    self._ssh_conn, ' '.join([self.flowmods_conf_hnd]),
-                    '[controller.flowmods_config]')[0]
-                logging.info('[Controller.flowmods_config] Controller is '
-                             'configured to send flow mods')
-            except:
-                raise(stress_test.controller_exceptions.ODLFlowModConfError)
-        except stress_test.controller_exceptions.CtrlError as e:
-            self._error_handling(e.err_msg, e.err_code)
+        self.flowmods_enabled = True
+        self.apply_config()
 
+    @util.cmdtimings.measurement
     def get_oper_hosts(self, new_ssh_conn=None):
         """
         Wrapper to the controller oper_hosts handler. Makes a REST call to \
             the NB interface of the controller and returns the number of hosts \
-            of the topology, recorded in operational datastore of the controller
+            of the topology, recorded in operational datastore of the \
+            controller. The datastore is queried directly over RESTCONF when \
+            possible, the handler is used as a fallback.
 
         :param new_ssh_conn: an ssh connection client object
         :returns: number of hosts from controller's operational datastore
@@ -713,16 +1198,14 @@ class ODL(Controller):
                      'registered in ODL operational DS')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.oper_hosts]):
-                    raise(IOError(
-                        '{0} get_oper_hosts handler does not exist'.
-                        format('[controller.get_oper_hosts]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.oper_hosts)
+                ret = self._get_oper_direct('hosts')
+                if ret is not None:
+                    if new_ssh_conn is not None:
+                        new_ssh_conn.close()
+                    return ret
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.oper_hosts], self._verified_hnds, '[Controller]')
                 if new_ssh_conn is not None:
                     used_ssh_conn = new_ssh_conn
                 else:
@@ -745,12 +1228,14 @@ class ODL(Controller):
         except stress_test.controller_exceptions.CtrlError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    @util.cmdtimings.measurement
     def get_oper_switches(self, new_ssh_conn=None):
         """
         Wrapper to the controller oper_switches handler. Makes a REST call \
             to the NB interface of the controller and returns the number of \
             switches of the topology, recorded in operational datastore of the \
-            controller
+            controller. The datastore is queried directly over RESTCONF when \
+            possible, the handler is used as a fallback.
 
         :param new_ssh_conn: an ssh connection client object
         :returns: number of switches from controller's operational datastore
@@ -764,16 +1249,14 @@ class ODL(Controller):
                      ' registered in ODL operational DS')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.oper_switches]):
-                    raise(IOError(
-                        '{0} get_oper_switches handler does not exist'.
-                        format('[controller.get_oper_switches]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.oper_switches)
+                ret = self._get_oper_direct('switches')
+                if ret is not None:
+                    if new_ssh_conn is not None:
+                        new_ssh_conn.close()
+                    return ret
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.oper_switches], self._verified_hnds, '[Controller]')
                 if new_ssh_conn is not None:
                     used_ssh_conn = new_ssh_conn
                 else:
@@ -797,12 +1280,14 @@ class ODL(Controller):
         except stress_test.controller_exceptions.CtrlError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    @util.cmdtimings.measurement
     def get_oper_links(self, new_ssh_conn=None):
         """
         Wrapper to the controller oper_links handler. Makes a REST call \
             to the NB interface of the controller and returns the number of \
             links of the topology, recorded in operational datastore of the \
-            controller
+            controller. The datastore is queried directly over RESTCONF when \
+            possible, the handler is used as a fallback.
 
         :param new_ssh_conn: an ssh connection client object
         :returns: number of links from controller's operational datastore
@@ -816,16 +1301,14 @@ class ODL(Controller):
                      ' ODL operational DS')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.oper_links]):
-                    raise(IOError(
-                        '{0} get_oper_links handler does not exist'.
-                        format('[controller.get_oper_links]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.oper_links)
+                ret = self._get_oper_direct('links')
+                if ret is not None:
+                    if new_ssh_conn is not None:
+                        new_ssh_conn.close()
+                    return ret
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.oper_links], self._verified_hnds, '[Controller]')
                 if new_ssh_conn is not None:
                     used_ssh_conn = new_ssh_conn
                 else:
@@ -848,12 +1331,14 @@ class ODL(Controller):
         except stress_test.controller_exceptions.CtrlError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    @util.cmdtimings.measurement
     def get_oper_flows(self, new_ssh_conn=None):
         """
         Wrapper to the controller oper_flows handler. Makes a REST call \
             to the NB interface of the controller and returns the number of \
             flows of the topology, recorded in operational datastore of the \
-            controller
+            controller. The datastore is queried directly over RESTCONF when \
+            possible, the handler is used as a fallback.
 
         :param new_ssh_conn: an ssh connection client object
         :returns: number of flows from controller's operational datastore
@@ -867,16 +1352,14 @@ class ODL(Controller):
                      'all installed nodes of the topology')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.oper_flows]):
-                    raise(IOError(
-                        '{0} get_oper_flows handler does not exist'.
-                        format('[controller.get_oper_links]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.oper_flows)
+                ret = self._get_oper_direct('flows')
+                if ret is not None:
+                    if new_ssh_conn is not None:
+                        new_ssh_conn.close()
+                    return ret
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.oper_flows], self._verified_hnds, '[Controller]')
                 if new_ssh_conn is not None:
                     used_ssh_conn = new_ssh_conn
                 else:
@@ -899,33 +1382,234 @@ class ODL(Controller):
         except stress_test.controller_exceptions.CtrlError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    @util.cmdtimings.measurement
+    def get_oper_snapshot(self, new_ssh_conn=None):
+        """
+        Takes a consistent snapshot of the topology recorded in operational \
+            datastore of the controller: the number of switches, links, hosts \
+            and flows, taken at the same moment. The datastore is read \
+            directly over RESTCONF when possible (see \
+            util.restconf.get_oper_snapshot()). Otherwise all oper_* handlers \
+            run in a single remote command, i.e. a single round trip.
+
+        :param new_ssh_conn: an ssh connection client object
+        :returns: dictionary with the number of switches, links, hosts and \
+            flows (-1 for values that could not be read), the timestamp of \
+            the snapshot and the time taken to read it ('read_time_secs')
+        :rtype: dict
+        :type new_ssh_conn: paramiko.SSHClient
+        :raises IOError: if a handler does not exist on the remote host
+        :raises controller_exceptions.ODLGetOperSnapshotError: if the \
+            snapshot cannot be taken
+        """
+        logging.info('[Controller] Query topology snapshot of ODL '
+                     'operational DS')
+        try:
+            try:
+                if self.restconf_direct:
+                    try:
+                        snapshot = util.restconf.get_oper_snapshot(
+                            self.ip, self.restconf_port, self.restconf_user,
+                            self.restconf_pass)
+                        if new_ssh_conn is not None:
+                            new_ssh_conn.close()
+                        return snapshot
+                    except IOError as e:
+                        logging.warning('[Controller] Direct RESTCONF '
+                                        'snapshot failed, falling back to the '
+                                        'handlers: {0}'.format(e))
+                queries = ['switches', 'links', 'hosts', 'flows']
+                handlers = [self.oper_switches, self.oper_links,
+                            self.oper_hosts, self.oper_flows]
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    handlers, self._verified_hnds, '[Controller]')
+                separator = 'nstat-oper-snapshot-separator'
+                command = '; echo {0}; '.format(separator).join(
+                    [' '.join([handler, str(self.ip), str(self.restconf_port),
+                               str(self.restconf_user),
+                               str(self.restconf_pass)])
+                     for handler in handlers])
+                if new_ssh_conn is not None:
+                    used_ssh_conn = new_ssh_conn
+                else:
+                    used_ssh_conn = self._ssh_conn
+                t_start = time.time()
+                cmd_output = util.netutil.ssh_run_command(
+                    used_ssh_conn, command,
+                    '[controller.get_oper_snapshot]')[1]
+                t_end = time.time()
+                if new_ssh_conn is not None:
+                    used_ssh_conn.close()
+                snapshot = {'timestamp': (t_start + t_end) / 2,
+                            'read_time_secs': t_end - t_start}
+                outputs = cmd_output.split(separator)
+                for query_id, query in enumerate(queries):
+                    try:
+                        snapshot[query] = int(outputs[query_id])
+                    except:
+                        snapshot[query] = -1
+                return snapshot
+            except:
+                raise(stress_test.controller_exceptions.
+                      ODLGetOperSnapshotError)
+        except stress_test.controller_exceptions.CtrlError as e:
+            self._error_handling(e.err_msg, e.err_code)
+
+
+def _cluster_wide(method):
+    """
+    Makes an ODL method run on all members of an ODLCluster at once. \
+        Calls made by the thread running the method on the primary member \
+        itself, e.g. the start() of generate_xmls(), stay on the primary \
+        member.
+
+    :param method: the ODL method
+    :returns: the cluster-wide method
+    :rtype: function
+    :type method: function
+    """
+    @functools.wraps(method)
+    def cluster_wide_method(self, *args):
+        if getattr(self._member_call, 'active', False):
+            return method(self, *args)
+        return self._run_on_members(method, *args)
+    return cluster_wide_method
+
+
+class ODLCluster(ODL):
+    """
+    A cluster of OpenDaylight controllers. The object itself is the \
+        primary member, the first of controller_cluster_members, so that \
+        single controller functionality (oper DS queries, monitoring, \
+        southbound address) keeps working against it. The other members \
+        are ODL objects with the same configuration, and the lifecycle \
+        handlers run on all members at once.
+    """
+
+    def __init__(self, ctrl_base_dir, test_config):
+        """
+        Creates the members of the cluster concurrently, each one building \
+            the controller on its own node.
+
+        :param ctrl_base_dir: controller base directory
+        :param test_config: JSON input configuration
+        :type ctrl_base_dir: str
+        :type test_config: JSON configuration dictionary
+        :raises controller_exceptions.ODLClusterMemberError: if the creation \
+            of a member fails
+        """
+        # Set only in the thread running a method on the primary member, see
+        # _run_on_primary()
+        self._member_call = threading.local()
+        self.peers = []
+        member_ips = test_config['controller_cluster_members']
+        member_tasks = {}
+        for member_ip in member_ips:
+            member_config = dict(test_config)
+            member_config['controller_node_ip'] = member_ip
+            if member_ip == member_ips[0]:
+                member_tasks[member_ip] = functools.partial(
+                    self._run_on_primary, ODL.__init__, ctrl_base_dir,
+                    member_config)
+            else:
+                member_tasks[member_ip] = functools.partial(
+                    ODL, ctrl_base_dir, member_config)
+        results = util.netutil.fan_out(member_tasks)
+        failed_members = [member_ip for member_ip in member_ips
+                          if results[member_ip][0] != 'ok']
+        if failed_members:
+            raise(stress_test.controller_exceptions.ODLClusterMemberError(
+                'Creation failed on members {0}'.format(failed_members)))
+        self.peers = [results[member_ip][1] for member_ip in member_ips[1:]]
+
+    def get_members(self):
+        """
+        Returns the members of the cluster
+
+        :returns: the member controller objects, the primary one first
+        :rtype: list<Controller>
+        """
+        return [self] + self.peers
+
+    def _run_on_primary(self, method, *args):
+        """
+        Runs an ODL method on the primary member only, along with the \
+            cluster-wide methods it calls
+
+        :param method: the ODL method
+        :param args: the arguments of the method
+        :returns: the return value of the method
+        """
+        self._member_call.active = True
+        try:
+            return method(self, *args)
+        finally:
+            self._member_call.active = False
+
+    def _run_on_members(self, method, *args):
+        """
+        Runs an ODL method on all members concurrently. The dimensions of \
+            the test, which are set on the primary member, are passed to \
+            the other members first.
+
+        :param method: the ODL method
+        :param args: the arguments of the method
+        :returns: the return value of the method on the primary member
+        :raises controller_exceptions.ODLClusterMemberError: if the method \
+            fails on any member
+        """
+        member_tasks = {self.ip: functools.partial(self._run_on_primary,
+                                                   method, *args)}
+        for peer in self.peers:
+            peer.stat_period_ms = self.stat_period_ms
+            peer.flowmods_enabled = self.flowmods_enabled
+            member_tasks[peer.ip] = functools.partial(method, peer, *args)
+        results = util.netutil.fan_out(member_tasks)
+        failed_members = [member_ip for member_ip, result in results.items()
+                          if result[0] != 'ok']
+        if failed_members:
+            raise(stress_test.controller_exceptions.ODLClusterMemberError(
+                '{0} failed on members {1}'.format(method.__name__,
+                                                   failed_members)))
+        return results[self.ip][1]
+
+    getcontroller = _cluster_wide(ODL.getcontroller)
+    build = _cluster_wide(ODL.build)
+    cleanup = _cluster_wide(ODL.cleanup)
+    start = _cluster_wide(ODL.start)
+    stop = _cluster_wide(ODL.stop)
+    generate_xmls = _cluster_wide(ODL.generate_xmls)
+    disable_persistence = _cluster_wide(ODL.disable_persistence)
+    change_stats = _cluster_wide(ODL.change_stats)
+    flowmods_config = _cluster_wide(ODL.flowmods_config)
+    apply_config = _cluster_wide(ODL.apply_config)
+    sweep_point_start = _cluster_wide(ODL.sweep_point_start)
+    sweep_point_stop = _cluster_wide(ODL.sweep_point_stop)
+
     def save_log(self, output_dir):
         """
-        Save controller log file
+        Saves the log files of all members, the ones of the other members \
+            in a member_<ip> subdirectory of output_dir
 
         :param output_dir: the directory where the controller logs are stored
         :type output_dir: str
         """
-
-        try:
-            logging.info('[controller_save_log] collecting logs from '
-                         'controller node. Logs path:{0}'.
-                         format(self.logs_dir))
-            util.netutil.copy_dir_remote_to_local(
-                self.ip,
-                self.ssh_port,
-                self.ssh_user,
-                self.ssh_pass,
-                os.path.join(self.base_dir, self.logs_dir),
-                os.path.join(output_dir, 'log'))
-        except:
-            logging.error('[controller_save_log] Fail transferring controller'
-                          ' logs directory.')
+        member_tasks = {self.ip: functools.partial(ODL.save_log, self,
+                                                   output_dir)}
+        for peer in self.peers:
+            member_tasks[peer.ip] = functools.partial(
+                peer.save_log, os.path.join(output_dir,
+                                            'member_{0}'.format(peer.ip)))
+        util.netutil.fan_out(member_tasks)
 
 
 class ONOS(Controller):
     """
-    All ONOS controller-related functionality is here
+    All ONOS controller-related functionality is here. The topology and \
+        flow stores are queried and the controller is configured through \
+        the ONOS REST API, so apart from the lifecycle handlers (get, build, \
+        start, stop, status, clean) no handlers run on the controller node.
     """
     def __init__(self, ctrl_base_dir, test_config):
         """
@@ -937,14 +1621,363 @@ class ONOS(Controller):
         :type ctrl_base_dir: str
         :type test_config: JSON configuration dictionary
         """
-        super(self.__class__, self).__init__(ctrl_base_dir, test_config)
+        super(ONOS, self).__init__(ctrl_base_dir, test_config)
 
-        self.stat_period_ms = test_config['controller_statistics_period_ms']
+        # The parameters initialized as None are dimensions of the test.
+        # These values are passed outside, from the test in the main for loop.
+        # ---------------------------------------------------------------------
+        self.stat_period_ms = None
+        # Set by flowmods_config(), part of the configuration applied by
+        # apply_config()
+        self.flowmods_enabled = False
 
-        self.oper_hosts = -1
-        self.oper_switches = -1
-        self.oper_links = -1
-        self.oper_flows = -1
+        # The REST API of ONOS, served on the port of its web console
+        self.restconf_port = test_config['controller_restconf_port']
+        self.restconf_user = test_config['controller_restconf_user']
+        self.restconf_pass = test_config['controller_restconf_password']
 
         self.init_ssh()
         self.build()
+
+    def init_oper_ssh(self):
+        """
+        Returns the ssh client to use for a poll of the controller stores. \
+            The stores are queried over the REST API, no ssh connection is \
+            needed.
+
+        :returns: None
+        :rtype: paramiko.SSHClient
+        """
+        return None
+
+    def _rest_post(self, path, body=None):
+        """
+        Makes a POST request to the REST API of the controller
+
+        :param path: path of the resource
+        :param body: the JSON body of the request
+        :type path: str
+        :type body: dict
+        :raises IOError: if the request fails
+        """
+        util.restconf.restconf_post(self.ip, self.restconf_port,
+                                    self.restconf_user, self.restconf_pass,
+                                    path, body)
+
+    def wait_until_up(self, timeout_ms):
+        """
+        Waits for the controller to be started (see \
+            Controller.wait_until_up()) and then for its OpenFlow \
+            application to be active, i.e. for ONOS to accept switches. The \
+            application is polled over the REST API at the readiness interval.
+
+        :param timeout_ms: milliseconds to wait (in milliseconds).
+        :type timeout_ms: int
+        :raises controller_exceptions.CtrlReadyStateError: If controller \
+            fails to reach a ready state within a certain period of time.
+        """
+        timeout = time.time() + (float(timeout_ms) / 1000)
+        Controller.wait_until_up(self, timeout_ms)
+        logging.info('[Controller] Waiting for the ONOS OpenFlow application')
+        try:
+            try:
+                while time.time() < timeout:
+                    try:
+                        application = util.restconf.restconf_get(
+                            self.ip, self.restconf_port, self.restconf_user,
+                            self.restconf_pass,
+                            util.restconf.ONOS_APPLICATION_PATH.format(
+                                ONOS_OPENFLOW_APP))
+                        if application is not None and \
+                                application.get('state') == 'ACTIVE':
+                            logging.info('[Controller] ONOS OpenFlow '
+                                         'application active')
+                            return
+                    except IOError:
+                        pass
+                    time.sleep(float(self.readiness_interval_ms) / 1000)
+                raise(stress_test.controller_exceptions.CtrlReadyStateError(
+                    'ONOS OpenFlow application {0} not active after trying '
+                    'for {1} seconds.'.format(ONOS_OPENFLOW_APP,
+                                              float(timeout_ms) / 1000), 2))
+            except stress_test.controller_exceptions.CtrlError as e:
+                self._error_handling(e.err_msg, e.err_code)
+            except:
+                raise(stress_test.controller_exceptions.CtrlReadyStateError)
+        except stress_test.controller_exceptions.CtrlError as e:
+            self._error_handling(e.err_msg, e.err_code)
+
+    def start(self):
+        """
+        Wrapper to the controller start handler. ONOS is configured at \
+            runtime, so the configuration of the test is applied once the \
+            controller is up. A controller that was already running keeps \
+            the configuration applied to it.
+
+        :returns: True if the controller was started, False if it was \
+            already running
+        :rtype: bool
+        :raises IOError: if the handler does not exist on the remote host
+        :raises controller_exceptions.CtrlStartError: When controller fails \
+            to start.
+        :raises controller_exceptions.ONOSConfigApplyError: if the \
+            configuration cannot be applied
+        """
+        if not Controller.start(self):
+            return False
+        self.applied_config = {}
+        self._started_config = {}
+        self.apply_config()
+        return True
+
+    def generate_xmls(self):
+        """
+        ONOS generates no configuration files on its first start, there is \
+            nothing to generate
+        """
+        logging.info('[Controller] No XML files to generate for ONOS')
+
+    def desired_config(self):
+        """
+        Returns the configuration the controller should run with, as \
+            declared by the dimensions of the test: the statistics period and \
+            the flow modifications setting.
+
+        :returns: the value of every setting, by setting name
+        :rtype: dict
+        """
+        config = {}
+        if self.stat_period_ms is not None:
+            config['statistics_period_ms'] = self.stat_period_ms
+        if self.flowmods_enabled:
+            config['flowmods'] = True
+        return config
+
+    def apply_config(self):
+        """
+        Applies the settings of desired_config() that differ from the last \
+            applied configuration, through the REST API of the running \
+            controller. The statistics period sets the polling period of the \
+            flow and port statistics (in whole seconds, at least 1) and the \
+            flow modifications setting activates the reactive forwarding \
+            application. ONOS applies them at runtime, so the running \
+            controller needs no restart. The settings of a stopped \
+            controller are applied by start().
+
+        :returns: True if any setting was applied, False otherwise
+        :rtype: bool
+        :raises controller_exceptions.ONOSConfigApplyError: if a setting \
+            cannot be applied
+        """
+        desired = self.desired_config()
+        changes = [setting for setting in sorted(desired)
+                   if self.applied_config.get(setting) != desired[setting]]
+        if not changes:
+            logging.info('[Controller] Configuration unchanged, nothing to '
+                         'apply')
+            return False
+        if self.check_status() != '1':
+            logging.info('[Controller] Configuration changes {0} will be '
+                         'applied when the controller starts'.format(changes))
+            return False
+        logging.info('[Controller] Applying configuration changes: {0}'.
+                     format(dict((setting, desired[setting])
+                                 for setting in changes)))
+        try:
+            try:
+                for setting in changes:
+                    if setting == 'statistics_period_ms':
+                        period_secs = max(
+                            1, int(round(float(desired[setting]) / 1000)))
+                        for component, period_property in \
+                                ONOS_STATISTICS_COMPONENTS:
+                            self._rest_post(
+                                util.restconf.ONOS_CONFIGURATION_PATH.format(
+                                    component),
+                                {period_property: str(period_secs)})
+                    elif setting == 'flowmods':
+                        self._rest_post(
+                            util.restconf.ONOS_APPLICATION_PATH.format(
+                                ONOS_FLOWMODS_APP) + '/active')
+                    self.applied_config[setting] = desired[setting]
+                # Applied at runtime, no restart is needed for them
+                self._started_config = dict(self.applied_config)
+                logging.info('[Controller] Configuration applied')
+                return True
+            except:
+                raise(stress_test.controller_exceptions.ONOSConfigApplyError)
+        except stress_test.controller_exceptions.CtrlError as e:
+            self._error_handling(e.err_msg, e.err_code)
+
+    def disable_persistence(self):
+        """
+        ONOS keeps no backup of its stores on the disk, there is no \
+            persistence to disable
+        """
+        logging.info('[Controller] No persistence to disable for ONOS')
+
+    def change_stats(self):
+        """
+        Applies the statistics period of the test (stat_period_ms), if it \
+            differs from the last applied one.
+
+        :raises controller_exceptions.ONOSConfigApplyError: if change of \
+            statistics interval fails
+        """
+        self.apply_config()
+
+    def flowmods_config(self):
+        """
+        Configure controller to send flow modifications as a response to ARP \
+            ARP Packet_INs.
+
+        :raises controller_exceptions.ONOSConfigApplyError: if configuration \
+            actions to respond with flow modifications fail.
+        """
+        self.flowmods_enabled = True
+        self.apply_config()
+
+    def reset_state(self):
+        """
+        Clears the state of the running controller through the REST API: \
+            the devices left by the previous sweep point, disconnected by the \
+            SB emulator teardown, are removed along with their links, hosts \
+            and flows. Then the stores are polled until they hold no \
+            connected devices, links, hosts or flows; devices still \
+            connected keep the state from being clean.
+
+        :returns: True if the state of the controller is clean
+        :rtype: bool
+        """
+        try:
+            devices = util.restconf.restconf_get(
+                self.ip, self.restconf_port, self.restconf_user,
+                self.restconf_pass, util.restconf.ONOS_DEVICES_PATH)
+            for device in (devices or {}).get('devices', []):
+                if not device.get('available'):
+                    util.restconf.restconf_delete(
+                        self.ip, self.restconf_port, self.restconf_user,
+                        self.restconf_pass,
+                        '{0}/{1}'.format(util.restconf.ONOS_DEVICES_PATH,
+                                         device['id']))
+        except IOError as e:
+            logging.warning('[Controller] Failed to remove the devices: {0}'.
+                            format(e))
+            return False
+        detector = util.convergence.ConvergenceDetector(
+            0, float(self.reset_deadline_ms) / 1000)
+        outcome = detector.run(self._oper_residual)
+        if not outcome['converged']:
+            logging.warning('[Controller] {0} elements left in the '
+                            'controller stores after reset'.
+                            format(outcome['value']))
+        return outcome['converged']
+
+    def _get_oper_count(self, query, new_ssh_conn=None):
+        """
+        Queries the stores of the controller over the REST API, see \
+            util.restconf.ONOS_OPER_QUERIES
+
+        :param query: one of 'switches', 'flows', 'links', 'hosts'
+        :param new_ssh_conn: an ssh connection client object, closed since \
+            it is not needed
+        :returns: the number of the queried elements, -1 if the query failed
+        :rtype: int
+        :type query: str
+        :type new_ssh_conn: paramiko.SSHClient
+        """
+        logging.info('[Controller] Query number of {0} registered in ONOS'.
+                     format(query))
+        if new_ssh_conn is not None:
+            new_ssh_conn.close()
+        try:
+            return util.restconf.get_oper_count(
+                self.ip, self.restconf_port, self.restconf_user,
+                self.restconf_pass, query,
+                queries=util.restconf.ONOS_OPER_QUERIES)
+        except IOError as e:
+            logging.warning('[Controller] ONOS REST query of {0} failed: {1}'.
+                            format(query, e))
+            return -1
+
+    @util.cmdtimings.measurement
+    def get_oper_hosts(self, new_ssh_conn=None):
+        """
+        Returns the number of hosts known to the controller
+
+        :param new_ssh_conn: an ssh connection client object
+        :returns: number of hosts, -1 if it could not be read
+        :rtype: int
+        :type new_ssh_conn: paramiko.SSHClient
+        """
+        return self._get_oper_count('hosts', new_ssh_conn)
+
+    @util.cmdtimings.measurement
+    def get_oper_switches(self, new_ssh_conn=None):
+        """
+        Returns the number of switches connected to the controller
+
+        :param new_ssh_conn: an ssh connection client object
+        :returns: number of connected switches, -1 if it could not be read
+        :rtype: int
+        :type new_ssh_conn: paramiko.SSHClient
+        """
+        return self._get_oper_count('switches', new_ssh_conn)
+
+    @util.cmdtimings.measurement
+    def get_oper_links(self, new_ssh_conn=None):
+        """
+        Returns the number of active links discovered by the controller
+
+        :param new_ssh_conn: an ssh connection client object
+        :returns: number of active links, -1 if it could not be read
+        :rtype: int
+        :type new_ssh_conn: paramiko.SSHClient
+        """
+        return self._get_oper_count('links', new_ssh_conn)
+
+    @util.cmdtimings.measurement
+    def get_oper_flows(self, new_ssh_conn=None):
+        """
+        Returns the number of flows installed on the switches, as recorded \
+            in the flow store of the controller
+
+        :param new_ssh_conn: an ssh connection client object
+        :returns: number of installed flows, -1 if it could not be read
+        :rtype: int
+        :type new_ssh_conn: paramiko.SSHClient
+        """
+        return self._get_oper_count('flows', new_ssh_conn)
+
+    @util.cmdtimings.measurement
+    def get_oper_snapshot(self, new_ssh_conn=None):
+        """
+        Takes a consistent snapshot of the topology recorded in the stores \
+            of the controller: the number of switches, links, hosts and \
+            flows, read concurrently over the REST API (see \
+            util.restconf.get_oper_snapshot()).
+
+        :param new_ssh_conn: an ssh connection client object, closed since \
+            it is not needed
+        :returns: dictionary with the number of switches, links, hosts and \
+            flows, the timestamp of the snapshot and the time taken to read \
+            it ('read_time_secs')
+        :rtype: dict
+        :type new_ssh_conn: paramiko.SSHClient
+        :raises controller_exceptions.ONOSGetOperSnapshotError: if the \
+            snapshot cannot be taken
+        """
+        logging.info('[Controller] Query topology snapshot of ONOS stores')
+        if new_ssh_conn is not None:
+            new_ssh_conn.close()
+        try:
+            try:
+                return util.restconf.get_oper_snapshot(
+                    self.ip, self.restconf_port, self.restconf_user,
+                    self.restconf_pass,
+                    queries=util.restconf.ONOS_OPER_QUERIES)
+            except IOError as e:
+                raise(stress_test.controller_exceptions.
+                      ONOSGetOperSnapshotError(str(e)))
+        except stress_test.controller_exceptions.CtrlError as e:
+            self._error_handling(e.err_msg, e.err_code)
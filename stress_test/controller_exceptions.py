@@ -339,3 +339,98 @@ class ODLGetOperLinksError(CtrlError):
         CtrlError.__init__(self, 'ODL fail to get topology links from '
                            'operational datastore. {0}'.
                            format(additional_error_info), err_code)
+
+
+class ODLGetOperSnapshotError(CtrlError):
+    """
+    Contains the exception handling concerning the combined topology snapshot
+    of Opendaylight Controller datastore
+    """
+    def __init__(self, additional_error_info='', err_code=1):
+        """
+        ODL fail to get topology snapshot from operational datastore error.
+
+        :param additional_error_info: the general error message.
+        :param err_code: the specific error code.
+        :type str
+        :type int
+        """
+        CtrlError.__init__(self, 'ODL fail to get topology snapshot from '
+                           'operational datastore. {0}'.
+                           format(additional_error_info), err_code)
+
+
+class ODLClusterMemberError(CtrlError):
+    """
+    Contains the exception handling concerning the members of a clustered
+    Opendaylight Controller
+    """
+    def __init__(self, additional_error_info='', err_code=1):
+        """
+        ODL cluster member failure error.
+
+        :param additional_error_info: the general error message.
+        :param err_code: the specific error code.
+        :type str
+        :type int
+        """
+        CtrlError.__init__(self, 'ODL cluster operation failed on some '
+                           'members. {0}'.format(additional_error_info),
+                           err_code)
+
+
+class ODLConfigApplyError(CtrlError):
+    """
+    Contains the exception handling concerning the application of the
+    Opendaylight Controller configuration
+    """
+    def __init__(self, additional_error_info='', err_code=1):
+        """
+        ODL fail to apply configuration error.
+
+        :param additional_error_info: the general error message.
+        :param err_code: the specific error code.
+        :type str
+        :type int
+        """
+        CtrlError.__init__(self, 'ODL Fail to apply the controller '
+                           'configuration. {0}'.format(additional_error_info),
+                           err_code)
+
+
+class ONOSConfigApplyError(CtrlError):
+    """
+    Contains the exception handling concerning the application of the
+    ONOS Controller configuration
+    """
+    def __init__(self, additional_error_info='', err_code=1):
+        """
+        ONOS fail to apply configuration error.
+
+        :param additional_error_info: the general error message.
+        :param err_code: the specific error code.
+        :type str
+        :type int
+        """
+        CtrlError.__init__(self, 'ONOS Fail to apply the controller '
+                           'configuration. {0}'.format(additional_error_info),
+                           err_code)
+
+
+class ONOSGetOperSnapshotError(CtrlError):
+    """
+    Contains the exception handling concerning the topology snapshot of
+    the ONOS Controller stores
+    """
+    def __init__(self, additional_error_info='', err_code=1):
+        """
+        ONOS topology snapshot error.
+
+        :param additional_error_info: the general error message.
+        :param err_code: the specific error code.
+        :type str
+        :type int
+        """
+        CtrlError.__init__(self, 'ONOS Fail to take a topology snapshot of '
+                           'the controller stores. {0}'.
+                           format(additional_error_info), err_code)
@@ -0,0 +1,114 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+""" GC sampler Class- All JVM GC sampling related functionality is here"""
+
+import logging
+import util.jvmstats
+import util.netutil
+
+
+class GcSampler:
+    """
+    Samples the garbage collection counters of the controller JVM with \
+        jstat, in the background on the controller node
+    """
+    def __init__(self, controller, test_config):
+        """
+        Creates a GC sampler object. Options from JSON input file
+
+        :param controller: object of the Controller class
+        :param test_config: JSON input configuration
+        :type controller: object
+        :type test_config: JSON configuration dictionary
+        """
+        self.period_ms = test_config['gc_sampler_period_ms']
+        if 'gc_sampler_jstat' in test_config:
+            self.jstat = test_config['gc_sampler_jstat']
+        else:
+            self.jstat = 'jstat'
+        self.ip = controller.ip
+        self.ssh_port = controller.ssh_port
+        self.ssh_user = controller.ssh_user
+        self.ssh_pass = controller.ssh_pass
+
+        self.remote_output_file = '/tmp/nstat_gc_sampler.out'
+        self._ssh_conn = controller.init_ssh()
+
+    def start(self, pid):
+        """
+        Starts sampling the GC counters of the given JVM in the background. \
+            Every output line of jstat is prefixed with the wall clock time, \
+            so that the samples can be matched to the samples of the test.
+
+        :param pid: the process ID of the JVM
+        :type pid: int
+        :returns: True if the sampling was started, False otherwise
+        :rtype: bool
+        """
+        logging.info('[GcSampler] Starting GC sampling of process {0} every '
+                     '{1} ms'.format(pid, self.period_ms))
+        try:
+            exit_status, cmd_output = util.netutil.ssh_run_command(
+                self._ssh_conn,
+                'nohup setsid sh -c \'{0} -gc {1} {2} | while read line; do '
+                'echo "$(date +%s.%N) $line"; done\' > {3} 2>&1 < /dev/null '
+                '& echo $! > {3}.pid'.
+                format(self.jstat, pid, self.period_ms,
+                       self.remote_output_file),
+                '[GcSampler.start]')
+            return exit_status == 0
+        except:
+            logging.error('[GcSampler] Fail to start the GC sampling.')
+            return False
+
+    def stop(self):
+        """
+        Stops the GC sampling on the controller node
+        """
+        logging.info('[GcSampler] Stopping')
+        try:
+            util.netutil.ssh_run_command(
+                self._ssh_conn,
+                'kill -- -$(cat {0}.pid) > /dev/null 2>&1'.
+                format(self.remote_output_file),
+                '[GcSampler.stop]')
+        except:
+            logging.error('[GcSampler] Fail to stop the GC sampling.')
+
+    def fetch(self):
+        """
+        Fetches the sampled output in bulk, with a single sftp read
+
+        :returns: the samples as compact arrays, see \
+            util.jvmstats.parse_gc_samples(). Empty arrays if the output \
+            cannot be fetched.
+        :rtype: dict
+        """
+        def read_output_file(sftp):
+            with sftp.open(self.remote_output_file, 'rb') as output_file:
+                return output_file.read()
+        try:
+            data = util.netutil.ssh_pool_run(self.ip, self.ssh_port,
+                                             self.ssh_user, self.ssh_pass,
+                                             read_output_file,
+                                             'read_gc_samples')
+        except:
+            logging.error('[GcSampler] Fail to fetch the samples.')
+            data = b''
+        return util.jvmstats.parse_gc_samples(
+            data.decode('utf-8', 'replace'))
+
+    def __del__(self):
+        """
+        Method called when object is destroyed. Closes the ssh connection \
+            to the controller node.
+        """
+        try:
+            self._ssh_conn.close()
+        except Exception as e:
+            logging.info('Fail closing ssh connection of the GC sampler '
+                         'during cleanup. Exception message: {0}'.format(e))
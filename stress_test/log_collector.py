@@ -0,0 +1,207 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Log collector Class- All incremental log collection functionality is here
+"""
+
+import logging
+import os
+import threading
+import util.logchunks
+import util.netutil
+
+
+class LogCollector:
+    """
+    Collects the controller log incrementally while the test runs. The new \
+        part of the log is compressed on the controller node and appended to \
+        the output directory as a chunk tagged with the current sweep point \
+        and sample id, see util.logchunks. All transfers run in a background \
+        thread, the monitors only mark the samples with mark_sample().
+    """
+    def __init__(self, controller, monitor, test_config, output_dir):
+        """
+        Creates a log collector object. Options from JSON input file
+
+        :param controller: object of the Controller class
+        :param monitor: object of the Monitor class, holding the id of the \
+            next sample
+        :param test_config: JSON input configuration
+        :param output_dir: directory to store the collected log
+        :type controller: object
+        :type monitor: object
+        :type test_config: JSON configuration dictionary
+        :type output_dir: str
+        """
+        self.period_ms = test_config['log_collector_period_ms']
+        if 'log_collector_file' in test_config:
+            self.remote_log = os.path.join(controller.logs_dir,
+                                           test_config['log_collector_file'])
+        else:
+            self.remote_log = os.path.join(controller.logs_dir, 'karaf.log')
+        # Uncompressed size of a chunk at most, so that the log written
+        # before the collector started is collected in bounded chunks
+        self.max_chunk_bytes = 64 * 2 ** 20
+        if 'log_collector_max_chunk_bytes' in test_config:
+            self.max_chunk_bytes = \
+                test_config['log_collector_max_chunk_bytes']
+        self.controller = controller
+        self.monitor = monitor
+        self.ip = controller.ip
+        self.ssh_port = controller.ssh_port
+        self.ssh_user = controller.ssh_user
+        self.ssh_pass = controller.ssh_pass
+
+        self.output_dir = output_dir
+        self.log_path = os.path.join(output_dir, 'controller_log.gz')
+        self.index_path = os.path.join(output_dir, 'controller_log.index')
+        self.remote_chunk_file = '/tmp/nstat_log_collector.gz'
+        self.offset = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        # Set by mark_sample() to collect before the next period ends
+        self._wake_event = threading.Event()
+        # Tags of the latest sample boundary marked since the last collection
+        self._marked_tags = None
+        self._thread = None
+        self._ssh_conn = controller.init_ssh()
+
+    def tags(self):
+        """
+        Returns the tags of the log collected now: the current sweep point \
+            of the controller and the id of the next sample, i.e. the sample \
+            the log leads up to
+
+        :returns: dictionary with 'sweep_point_id' and 'global_sample_id'
+        :rtype: dict
+        """
+        return {'sweep_point_id': self.controller.sweep_point_id,
+                'global_sample_id': self.monitor.global_sample_id}
+
+    def mark_sample(self):
+        """
+        Marks a sample boundary: the background thread collects the log \
+            without waiting for the end of the period, and tags it with the \
+            tags() of the moment of the mark.
+        """
+        self._marked_tags = self.tags()
+        self._wake_event.set()
+
+    def _compress_chunk(self):
+        """
+        Compresses the log written since the last collected chunk into the \
+            remote chunk file. If the log is shorter than the collected part, \
+            it was rotated and it is collected again from its start.
+
+        :returns: offset and size of the compressed part of the log, None if \
+            the log cannot be read
+        :rtype: tuple<int>
+        """
+        exit_status, cmd_output = util.netutil.ssh_run_command(
+            self._ssh_conn,
+            'f={0}; o={1}; s=$(stat -c %s "$f" 2>/dev/null) || exit 3; '
+            '[ "$s" -lt "$o" ] && o=0; n=$((s-o)); '
+            '[ "$n" -gt {2} ] && n={2}; echo "$o $n"; '
+            'tail -c +$((o+1)) "$f" | head -c "$n" | gzip -c > {3}'.
+            format(self.remote_log, self.offset, self.max_chunk_bytes,
+                   self.remote_chunk_file),
+            '[LogCollector]', print_flag=False)
+        if exit_status != 0:
+            return None
+        (log_from, size) = cmd_output.split()[-2:]
+        return (int(log_from), int(size))
+
+    def collect(self):
+        """
+        Collects the log written since the last collected chunk, in chunks \
+            of at most max_chunk_bytes, tagged with the tags of the latest \
+            marked sample boundary, or else with tags()
+
+        :returns: the index records of the collected chunks
+        :rtype: list<dict>
+        """
+        def read_chunk_file(sftp):
+            with sftp.open(self.remote_chunk_file, 'rb') as chunk_file:
+                return chunk_file.read()
+        records = []
+        with self._lock:
+            (tags, self._marked_tags) = (self._marked_tags or self.tags(),
+                                         None)
+            try:
+                if not os.path.isdir(self.output_dir):
+                    os.makedirs(self.output_dir)
+                while True:
+                    chunk = self._compress_chunk()
+                    if chunk is None:
+                        break
+                    (log_from, size) = chunk
+                    if log_from < self.offset:
+                        logging.warning('[LogCollector] {0} was rotated, the '
+                                        'collected log misses its end'.
+                                        format(self.remote_log))
+                    if size == 0:
+                        self.offset = log_from
+                        break
+                    gz_data = util.netutil.ssh_pool_run(
+                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                        read_chunk_file, 'read_log_chunk')
+                    records.append(util.logchunks.append_chunk(
+                        self.log_path, self.index_path, gz_data, tags,
+                        log_from, log_from + size))
+                    self.offset = log_from + size
+                    if size < self.max_chunk_bytes:
+                        break
+            except:
+                logging.error('[LogCollector] Fail to collect the controller '
+                              'log.')
+        return records
+
+    def _collect_periodically(self):
+        """
+        Collects the log every period_ms and at every marked sample \
+            boundary, until stop() is called
+        """
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.period_ms / 1000.0)
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            self.collect()
+
+    def start(self):
+        """
+        Starts collecting the log in the background
+        """
+        logging.info('[LogCollector] Collecting {0} every {1} ms'.
+                     format(self.remote_log, self.period_ms))
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._collect_periodically,
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background collection and collects the rest of the log
+        """
+        logging.info('[LogCollector] Stopping')
+        if self._thread is not None:
+            self._stop_event.set()
+            self._wake_event.set()
+            self._thread.join()
+            self._thread = None
+        self.collect()
+
+    def __del__(self):
+        """
+        Method called when object is destroyed. Closes the ssh connection \
+            to the controller node.
+        """
+        try:
+            self._ssh_conn.close()
+        except Exception as e:
+            logging.info('Fail closing ssh connection of the log collector '
+                         'during cleanup. Exception message: {0}'.format(e))
@@ -10,11 +10,16 @@ import gevent
 import gevent.queue
 import json
 import logging
-import re
 import queue
-import subprocess
 import time
+import util.cmdtimings
+import util.convergence
+import util.jvmstats
+import util.mtcbench
+import util.netutil
+import util.restconf
 import util.sysstats
+import util.workerstats
 
 
 class Monitor:
@@ -31,59 +36,222 @@ class Monitor:
         self.global_sample_id = 0
         self.repeat_id = 0
         self.test_repeats = 0
+        # Sampling agent of the controller process, set from outside when
+        # high-frequency sampling is enabled in the test configuration
+        self.proc_sampler = None
+        # GC sampler of the controller JVM, set from outside when GC
+        # sampling is enabled in the test configuration
+        self.gc_sampler = None
+        # Incremental collector of the controller log, set from outside when
+        # log collection is enabled in the test configuration
+        self.log_collector = None
 
     def system_results(self):
         """
-        Collect runtime statistics
+        Collect runtime statistics, taken in a single snapshot on the \
+            controller node, together with the measurement overhead and the \
+            controller startup of the sample.
 
         :returns: experiment statistics in dictionary
         :rtype: dict
         """
 
+        collection_start = time.time()
+        snapshot = util.sysstats.sys_proc_snapshot(self.controller.pid,
+                                                   self.controller._ssh_conn)
         system_statistics = {}
-        system_statistics['total_memory_bytes'] = \
-            util.sysstats.sys_total_memory_bytes(self.controller._ssh_conn)
-        system_statistics['controller_cwd'] = \
-            util.sysstats.proc_cwd(self.controller.pid,
-                                   self.controller._ssh_conn)
-        system_statistics['controller_java_xopts'] = \
-            util.sysstats.get_java_options(self.controller.pid,
-                                           self.controller._ssh_conn)
-        system_statistics['timestamp'] = \
-            int(subprocess.check_output('date +%s',
-                                        shell=True,
-                                        universal_newlines=True).strip())
-        system_statistics['date'] = \
-            subprocess.check_output('date',
-                                    shell=True,
-                                    universal_newlines=True).strip()
-        system_statistics['used_memory_bytes'] = \
-            util.sysstats.sys_used_memory_bytes(self.controller._ssh_conn)
-        system_statistics['free_memory_bytes'] = \
-            util.sysstats.sys_free_memory_bytes(self.controller._ssh_conn)
-        system_statistics['controller_cpu_system_time'] = \
-            util.sysstats.proc_cpu_system_time(self.controller.pid,
-                                               self.controller._ssh_conn)
-        system_statistics['controller_cpu_user_time'] = \
-            util.sysstats.proc_cpu_user_time(self.controller.pid,
-                                             self.controller._ssh_conn)
-        system_statistics['controller_vm_size'] = \
-            util.sysstats.proc_vm_size(self.controller.pid,
-                                       self.controller._ssh_conn)
-        system_statistics['controller_num_fds'] = \
-            util.sysstats.proc_num_fds(self.controller.pid,
-                                       self.controller._ssh_conn)
-        system_statistics['controller_num_threads'] = \
-            util.sysstats.proc_num_threads(self.controller.pid,
-                                           self.controller._ssh_conn)
-        system_statistics['one_minute_load'] = \
-            util.sysstats.sys_load_average(self.controller._ssh_conn)[0]
-        system_statistics['five_minute_load'] = \
-            util.sysstats.sys_load_average(self.controller._ssh_conn)[1]
-        system_statistics['fifteen_minute_load'] = \
-            util.sysstats.sys_load_average(self.controller._ssh_conn)[2]
+        for key, value in snapshot.items():
+            if key.startswith('proc_'):
+                key = key.replace('proc_', 'controller_', 1)
+            system_statistics[key] = value
+        if len(self.controller.get_members()) > 1:
+            system_statistics.update(self.cluster_results(system_statistics))
+        system_statistics['system_stats_collection_time_ms'] = \
+            (time.time() - collection_start) * 1000
+        command_timings = util.cmdtimings.drain()
+        system_statistics['measurement_overhead_ms'] = \
+            command_timings['overhead_ms']
+        system_statistics['command_timings'] = command_timings
+        # Timeline of the latest controller startup, or duration of the
+        # state reset if the controller was kept running (warm mode)
+        system_statistics.update(self.controller.startup_timeline)
+        system_statistics['controller_restart_mode'] = \
+            self.controller.restart_mode
+        system_statistics['controller_reset_secs'] = \
+            self.controller.reset_time_secs
+        if self.log_collector is not None:
+            self.log_collector.mark_sample()
         return system_statistics
 
+    def cluster_results(self, primary_statistics):
+        """
+        Collects the statistics of every member of a controller cluster, \
+            concurrently: system and controller process statistics, the raft \
+            state of the local operational datastore shards and the topology \
+            snapshot of the operational datastore as seen by the member. The \
+            process statistics are also summed over the members.
+
+        :param primary_statistics: system statistics of the primary member, \
+            as collected by system_results()
+        :returns: the cluster size ('controller_cluster_size'), the \
+            statistics of each member ('controller_cluster_members', in \
+            member order) and the sums over the members ('cluster_*' keys)
+        :rtype: dict
+        :type primary_statistics: dict
+        """
+        members = self.controller.get_members()
+
+        @util.cmdtimings.measurement
+        def member_statistics(member):
+            if member is self.controller:
+                statistics = dict(primary_statistics)
+            else:
+                statistics = {}
+                snapshot = util.sysstats.sys_proc_snapshot(member.pid,
+                                                           member._ssh_conn)
+                for key, value in snapshot.items():
+                    if key.startswith('proc_'):
+                        key = key.replace('proc_', 'controller_', 1)
+                    statistics[key] = value
+            statistics['controller_node_ip'] = member.ip
+            statistics['shard_roles'] = {}
+            if hasattr(member, 'restconf_port'):
+                try:
+                    statistics['shard_roles'] = \
+                        util.restconf.get_shard_roles(
+                            member.ip, member.restconf_port,
+                            member.restconf_user, member.restconf_pass)
+                except IOError as e:
+                    logging.warning('[Monitor] Fail to read the shards of '
+                                    'member {0}: {1}'.format(member.ip, e))
+            statistics['shard_leaders'] = sorted(
+                shard for shard, role in statistics['shard_roles'].items()
+                if role == 'Leader')
+            oper_snapshot = member.get_oper_snapshot(member.init_oper_ssh())
+            for query in ['switches', 'links', 'hosts', 'flows']:
+                statistics['oper_' + query] = oper_snapshot[query]
+            return statistics
+
+        member_tasks = {}
+        for member_id, member in enumerate(members):
+            member_tasks[member_id] = \
+                (lambda member=member: member_statistics(member))
+        member_results = util.netutil.fan_out(member_tasks)
+        cluster_members = []
+        for member_id, member in enumerate(members):
+            status, statistics = member_results[member_id]
+            if status != 'ok':
+                logging.error('[Monitor] Fail to collect the statistics of '
+                              'member {0}'.format(member.ip))
+                statistics = {'controller_node_ip': member.ip}
+            cluster_members.append(statistics)
+        results = {'controller_cluster_size': len(members),
+                   'controller_cluster_members': cluster_members}
+        for key in ['controller_cpu_user_time', 'controller_cpu_system_time',
+                    'controller_vm_size', 'controller_num_threads',
+                    'used_memory_bytes']:
+            results['cluster_' + key] = sum(
+                statistics.get(key, 0) for statistics in cluster_members
+                if statistics.get(key, -1) != -1)
+        return results
+
+    @util.cmdtimings.measurement
+    def oper_switches_probe(self):
+        """
+        Polls the number of switches in the operational datastore of the \
+            controller, for the convergence detection of the discovery \
+            monitors
+
+        :returns: number of switches, -1 on failure
+        :rtype: int
+        """
+        return self.controller.get_oper_switches(
+            self.controller.init_oper_ssh())
+
+    @util.cmdtimings.measurement
+    def oper_flows_probe(self):
+        """
+        Polls the number of flows in the operational datastore of the \
+            controller, for the convergence detection of the flow monitors
+
+        :returns: number of flows, -1 on failure
+        :rtype: int
+        """
+        return self.controller.get_oper_flows(
+            self.controller.init_oper_ssh())
+
+    def proc_sampler_start(self):
+        """
+        Starts the high-frequency sampling of the controller process, if a \
+            sampling agent is set
+        """
+        if self.proc_sampler is not None:
+            self.proc_sampler.start(self.controller.pid)
+
+    def proc_sampler_attach(self, samples):
+        """
+        Stops the high-frequency sampling of the controller process, \
+            fetches the samples in bulk and attaches them to the samples of \
+            the iteration as compact arrays. Each sample gets the process \
+            samples taken after the previous sample of the iteration, the \
+            last one also gets the process samples taken after it.
+
+        :param samples: the samples of the iteration
+        :type samples: list<dict>
+        """
+        if self.proc_sampler is None or not samples:
+            return
+        self.proc_sampler.stop()
+        series = self.proc_sampler.fetch()
+        t_from = None
+        for sample_id, sample in enumerate(samples):
+            t_to = sample['timestamp']
+            if sample_id == len(samples) - 1:
+                t_to = None
+            sample['controller_proc_samples'] = \
+                util.sysstats.slice_proc_samples(series, t_from, t_to)
+            sample['controller_proc_samples']['rate_hz'] = \
+                self.proc_sampler.rate_hz
+            t_from = t_to
+
+    def gc_sampler_start(self):
+        """
+        Starts the GC sampling of the controller JVM, if a GC sampler is set
+        """
+        if self.gc_sampler is not None:
+            self.gc_sampler.start(self.controller.pid)
+
+    def gc_sampler_attach(self, samples):
+        """
+        Stops the GC sampling of the controller JVM, fetches the GC samples \
+            in bulk and attaches them to the samples of the iteration, as \
+            compact arrays and as a summary of the GC activity (see \
+            util.jvmstats.summarize_gc_samples()). Each sample gets the GC \
+            samples taken after the previous sample of the iteration, the \
+            last one also gets the GC samples taken after it.
+
+        :param samples: the samples of the iteration
+        :type samples: list<dict>
+        """
+        if self.gc_sampler is None or not samples:
+            return
+        self.gc_sampler.stop()
+        series = self.gc_sampler.fetch()
+        t_from = None
+        for sample_id, sample in enumerate(samples):
+            t_to = sample['timestamp']
+            if sample_id == len(samples) - 1:
+                t_to = None
+            gc_samples = util.jvmstats.slice_gc_samples(series, t_from, t_to)
+            summary = util.jvmstats.summarize_gc_samples(
+                gc_samples, util.jvmstats.slice_gc_samples(series, None,
+                                                           t_from))
+            for key, value in summary.items():
+                sample['controller_' + key] = value
+            gc_samples['period_ms'] = self.gc_sampler.period_ms
+            sample['controller_gc_samples'] = gc_samples
+            t_from = t_to
+
 
 class Oftraf:
     """
@@ -170,6 +338,9 @@ class Mtcbench(Monitor):
         self.term_success = '__successful_termination__'
         self.term_fail = '__failed_termination__'
         self.data_queue = gevent.queue.Queue()
+        # Time given to the runs on the generator nodes to be set up, so
+        # that they all start together
+        self.generators_start_delay_secs = 2
 
     def monitor_results_active(self):
         """
@@ -190,6 +361,7 @@ class Mtcbench(Monitor):
             self.emulator.simulated_hosts
         results['mtcbench_switches'] = \
             self.emulator.get_overall_topo_size()
+        results['mtcbench_nodes'] = len(self.emulator.get_generators())
         results['mtcbench_threads'] = \
             self.emulator.threads
         results['mtcbench_switches_per_thread'] = \
@@ -227,6 +399,7 @@ class Mtcbench(Monitor):
         results['mtcbench_simulated_hosts'] = \
             self.emulator.simulated_hosts
         results['mtcbench_switches'] = self.emulator.get_overall_topo_size()
+        results['mtcbench_nodes'] = len(self.emulator.get_generators())
         results['mtcbench_threads'] = self.emulator.threads
         results['mtcbench_switches_per_thread'] = \
             self.emulator.switches_per_thread
@@ -260,65 +433,48 @@ class Mtcbench(Monitor):
         logging.info('[monitor_thread_idle] Monitor thread started')
         t_start = boot_start_time
         logging.info('[monitor_thread_idle] Starting discovery')
-        previous_discovered_switches = 0
-        discovered_switches = 0
         time.sleep(sleep_before_discovery)
-        t_discovery_start = time.time()
         error_code = 0
-        max_discovered_switches = 0
-
-        while True:
-            if (time.time() - t_discovery_start) > discovery_deadline:
-                error_code = 201
-                logging.info(
-                    '[monitor_thread_idle] Deadline of {0} seconds passed, '
-                    'discovered {1} switches.'.format(discovery_deadline,
-                                                      discovered_switches))
-                discovery_time = time.time() - t_start - discovery_deadline
-                results = self.monitor_results_idle()
-                results['bootup_time_secs'] = discovery_time
-                results['discovered_switches'] = discovered_switches
-                results['max_discovered_switches'] = max_discovered_switches
-                results['discovered_switches_error_code'] = error_code
-                results['successful_bootup_time'] = -1
-                self.result_queue.put([results])
-
-                return 0
-            else:
-                new_ssh = self.controller.init_ssh()
-                discovered_switches = \
-                    self.controller.get_oper_switches(new_ssh)
-                if discovered_switches == -1:
-                    discovered_switches = previous_discovered_switches
-                if discovered_switches > max_discovered_switches:
-                    max_discovered_switches = discovered_switches
-
-                if discovered_switches != previous_discovered_switches:
-                    t_discovery_start = time.time()
-                    previous_discovered_switches = discovered_switches
-
-                if discovered_switches == expected_switches:
-                    delta_t = time.time() - t_start
-                    logging.info(
-                        '[monitor_thread_idle] {0} switches found in '
-                        '{1} seconds'.
-                        format(discovered_switches, delta_t))
-                    results = self.monitor_results_idle()
-                    results['bootup_time_secs'] = delta_t
-                    results['discovered_switches'] = discovered_switches
-                    results['max_discovered_switches'] = \
-                        max_discovered_switches
-                    results['discovered_switches_error_code'] = error_code
-                    results['successful_bootup_time'] = delta_t
-                    self.result_queue.put([results])
-
-                    return 0
-            gevent.sleep(1)
+        detector = util.convergence.ConvergenceDetector(
+            expected_switches, discovery_deadline, sleep=gevent.sleep)
+        outcome = detector.run(self.oper_switches_probe, t_start)
+        results = self.monitor_results_idle()
+        if outcome['converged']:
+            delta_t = outcome['time'] - t_start
+            logging.info('[monitor_thread_idle] {0} switches found in '
+                         '{1} (+/- {2}) seconds'.
+                         format(outcome['value'], delta_t,
+                                outcome['error_secs']))
+            results['bootup_time_secs'] = delta_t
+            results['bootup_time_error_secs'] = outcome['error_secs']
+            results['successful_bootup_time'] = delta_t
+        else:
+            error_code = 201
+            logging.info(
+                '[monitor_thread_idle] Deadline of {0} seconds passed, '
+                'discovered {1} switches.'.format(discovery_deadline,
+                                                  outcome['value']))
+            results['bootup_time_secs'] = \
+                time.time() - t_start - discovery_deadline
+            results['bootup_time_error_secs'] = -1
+            results['successful_bootup_time'] = -1
+        results['discovered_switches'] = outcome['value']
+        results['max_discovered_switches'] = outcome['max_value']
+        results['discovered_switches_error_code'] = error_code
+        results['discovery_probes'] = outcome['probes']
+        self.result_queue.put([results])
+        return 0
 
-    def monitor_thread_active(self):
+    def monitor_thread_active(self, nodes):
         """
         This monitor function is used from south bound active mtcbench \
-            tests to put into gevent queue the results during test running
+            tests to put into gevent queue the results during test running. \
+            The repeats of the generator nodes are aligned by their index \
+            and summed into one sample per repeat, keeping the throughput of \
+            every node.
+
+        :param nodes: the IPs of the generator nodes
+        :type nodes: list<str>
         """
 
         internal_repeat_id = 0
@@ -326,50 +482,83 @@ class Mtcbench(Monitor):
 
         # will hold samples taken in the lifetime of this thread
         test_samples = []
+        aligner = util.mtcbench.RepeatAligner(nodes)
+        summaries = {}
+        running_nodes = set(nodes)
 
         while True:
             try:
-                # read messages from queue while TERM_SUCCESS has not been sent
-                line = self.data_queue.get(block=True)
+                # read (node, line) messages from queue until TERM_SUCCESS
+                # has been sent by every node
+                (node, line) = self.data_queue.get(block=True)
                 if line == self.term_success:
+                    running_nodes.discard(node)
+                    if running_nodes:
+                        continue
                     logging.info('[monitor_thread_active] successful '
                                  'termination string returned. Returning '
                                  'samples and exiting.')
+                    if aligner.unaligned() > 0:
+                        logging.warning('[monitor_thread_active] {0} '
+                                        'repeats of the generator nodes '
+                                        'were not aligned'.
+                                        format(aligner.unaligned()))
+                    if len(summaries) == len(nodes):
+                        summary = util.mtcbench.combine_summaries(summaries)
+                        for sample in test_samples:
+                            for key, value in summary.items():
+                                sample['mtcbench_' + key] = value
+                    self.result_queue.put(test_samples)
+                    return
+                if line == self.term_fail:
+                    logging.info('[monitor_thread] returned failed '
+                                 'termination '
+                                 'string returning gathered samples '
+                                 'and exiting.')
+                    results = self.monitor_results_active()
+                    results['throughput_responses_sec'] = -1
+                    results['internal_repeat_id'] = internal_repeat_id
+                    test_samples.append(results)
                     self.result_queue.put(test_samples)
                     return
-                else:
-                    # look for lines containing a substring like e.g.
-                    # 'total = 1.2345 per ms'
-                    match = re.search(r'total = (.+) per ms', line)
-                    if match is not None or line == self.term_fail:
-                        results = self.monitor_results_active()
-                        if line == self.term_fail:
-                            logging.info('[monitor_thread] returned failed '
-                                         'termination '
-                                         'string returning gathered samples '
-                                         'and exiting.')
-                            results['throughput_responses_sec'] = -1
-                            results['internal_repeat_id'] = internal_repeat_id
-                            test_samples.append(results)
-                            self.result_queue.put(test_samples)
-                            return
-                        if match is not None:
-                            # extract the numeric portion from the above regex
-                            results['throughput_responses_sec'] = \
-                                float(match.group(1)) * 1000.0
-                        results['internal_repeat_id'] = internal_repeat_id
-                        test_samples.append(results)
-                        internal_repeat_id += 1
+                # the summary line of the run follows the last repeat
+                summary = util.mtcbench.parse_summary_line(line)
+                if summary is not None:
+                    summaries[node] = summary
+                    continue
+                # look for lines containing a substring like e.g.
+                # 'flows/sec:  120  118   total = 1.2345 per ms'
+                repeat = util.mtcbench.parse_repeat_line(line)
+                if repeat is None:
+                    continue
+                for combined in aligner.add(node, repeat, time.time()):
+                    results = self.monitor_results_active()
+                    results['throughput_responses_sec'] = \
+                        combined['throughput_responses_sec']
+                    results['mtcbench_node_throughput_responses_sec'] = \
+                        combined['node_throughput_responses_sec']
+                    results['mtcbench_alignment_skew_secs'] = \
+                        combined['alignment_skew_secs']
+                    results['mtcbench_switch_responses'] = \
+                        combined['switch_responses']
+                    switch_summary = \
+                        util.mtcbench.summarize_switch_throughput(
+                            combined['switch_throughput_responses_sec'])
+                    for key, value in switch_summary.items():
+                        results['mtcbench_' + key] = value
+                    results['internal_repeat_id'] = internal_repeat_id
+                    test_samples.append(results)
+                    internal_repeat_id += 1
             except queue.Empty as exept:
                 logging.error('[monitor_thread_active] {0}'.format(str(exept)))
                 self.result_queue.put(test_samples)
                 return
-            gevent.sleep(0.5)
 
     def monitor_run(self, boot_start_time=None):
         """
         This monitor function is used from both south bound active and idle
-        mtcbench tests to get the results from gevent queue
+        mtcbench tests to get the results from gevent queue. MTCbench runs \
+        on all generator nodes of the emulator, started together.
 
         :param boot_start_time: The time we begin starting topology switches
         :returns: Returns a dictionary, including all the results
@@ -381,54 +570,92 @@ class Mtcbench(Monitor):
         # Consumer - producer threads (mtcbench_thread is the producer,
         # monitor_thread is the consumer)
         threads = []
+        self.proc_sampler_start()
+        self.gc_sampler_start()
+        generators = self.emulator.get_generators()
+        start_time = None
+        if len(generators) > 1:
+            start_time = time.time() + self.generators_start_delay_secs
         if boot_start_time is None:
             logging.info('[MTCbench.monitor_run] active test monitor is '
                          'running')
-            monitor_thread = gevent.spawn(self.monitor_thread_active)
+            self.data_queue = gevent.queue.Queue()
+            monitor_thread = gevent.spawn(
+                self.monitor_thread_active,
+                [generator.ip for generator in generators])
             threads.append(monitor_thread)
-            mtcbench_thread = gevent.spawn(self.mtcbench_thread,
-                                           True, self.data_queue)
-            threads.append(mtcbench_thread)
+            for generator in generators:
+                threads.append(gevent.spawn(
+                    self.mtcbench_thread, True, self.data_queue, generator,
+                    start_time))
         else:
             logging.info('[MTCbench.monitor_run] idle test monitor is running')
-            self.mtcbench_thread(False, None)
+            for generator in generators:
+                self.mtcbench_thread(False, None, generator, start_time)
             monitor_thread = \
                 gevent.spawn(self.monitor_thread_idle, boot_start_time)
             threads.append(monitor_thread)
         gevent.joinall(threads)
         samples = self.result_queue.get()
         gevent.killall(threads)
+        self.proc_sampler_attach(samples)
+        self.gc_sampler_attach(samples)
         return samples
 
-    def mtcbench_thread(self, block_flag=True, data_queue=None):
+    def mtcbench_thread(self, block_flag=True, data_queue=None,
+                        generator=None, start_time=None):
         """
         Function used to execute MTCBench thread
 
         :param block_flag: It is used as a flag. When it is True the emulator \
             run will wait for the completition of MTcbench thread running
         :param data_queue: If not None the results are written into the \
-            data_queue line by line. In case of None the results are written \
-            into standard output
+            data_queue line by line, as (generator node IP, line) tuples. In \
+            case of None the results are written into standard output
+        :param generator: the MTCBench object of the generator node, the \
+            emulator itself if None
+        :param start_time: if given, the time MTCbench starts at on the \
+            generator node
         :returns: Returns a dictionary, including all the results
         :rtype: dict
         :type block_flag: boolean
         :type data_queue: queue
+        :type generator: object
+        :type start_time: float
         """
         logging.info('[MTCbench.mtcbench_thread] MTCbench thread started')
+        if generator is None:
+            generator = self.emulator
+        lines_queue = None
+        forwarder = None
+        if data_queue is not None:
+            # the lines of every node are tagged with the node, so that the
+            # consumer can tell the nodes apart
+            lines_queue = gevent.queue.Queue()
+
+            def forward_lines():
+                while True:
+                    data_queue.put((generator.ip, lines_queue.get()))
+            forwarder = gevent.spawn(forward_lines)
         try:
-            self.emulator.run(self.controller.ip, self.controller.of_port,
-                              '[MTCbench.mtcbench_thread]', data_queue,
-                              False, block_flag, False)
+            generator.run(self.controller.ip, self.controller.of_port,
+                          '[MTCbench.mtcbench_thread]', lines_queue,
+                          False, block_flag, False, start_time)
             # mtcbench ended, enqueue termination message
-            if data_queue is not None:
-                data_queue.put_nowait(self.term_success)
+            if lines_queue is not None:
+                lines_queue.put_nowait(self.term_success)
             logging.info('[MTCbench.mtcbench_thread] MTCbench thread ended '
                          'successfully')
         except:
-            if data_queue is not None:
-                data_queue.put_nowait(self.term_fail)
+            if lines_queue is not None:
+                lines_queue.put_nowait(self.term_fail)
             logging.error('[MTCbench.mtcbench_thread] Exception: '
                           'MTCbench_thread exited with error.')
+        if forwarder is not None:
+            # let the forwarder pass on the remaining lines
+            while not lines_queue.empty():
+                gevent.sleep(0)
+            forwarder.kill()
         return 0
 
 
@@ -453,6 +680,22 @@ class Multinet(Monitor):
         self.emulator = emulator
         self.result_queue = gevent.queue.Queue()
 
+    @util.cmdtimings.measurement
+    def worker_switches_probe(self):
+        """
+        Polls the number of switches of every Multinet worker
+
+        :returns: number of switches of every worker keyed by the worker, \
+            None on failure
+        :rtype: dict
+        """
+        try:
+            return self.emulator.get_worker_counts('get_switches')
+        except IOError as e:
+            logging.error('[Multinet] Fail to get the switches of the '
+                          'workers: {0}'.format(e))
+            return None
+
     def monitor_run(self, reference_results=None, sample_id=None,
                     boot_start_time=None):
         """
@@ -472,6 +715,8 @@ class Multinet(Monitor):
         """
         logging.info('[Multinet.monitor_run] creating and starting'
                      ' monitoring of Multinet worker events.')
+        self.proc_sampler_start()
+        self.gc_sampler_start()
         if boot_start_time is None and sample_id is None:
             logging.info('[Multinet.monitor_run] Active test monitor is '
                          'running')
@@ -493,6 +738,12 @@ class Multinet(Monitor):
         gevent.joinall([monitor_thread])
         total_results = self.result_queue.get()
         gevent.killall([monitor_thread])
+        if isinstance(total_results, dict):
+            self.proc_sampler_attach([total_results["current_sample"]])
+            self.gc_sampler_attach([total_results["current_sample"]])
+        else:
+            self.proc_sampler_attach(total_results)
+            self.gc_sampler_attach(total_results)
 
         if boot_start_time is None and sample_id is None:
             return total_results
@@ -517,81 +768,72 @@ class Multinet(Monitor):
         logging.info('[monitor_thread_idle] Monitor thread started')
         t_start = boot_start_time
         logging.info('[monitor_thread_idle] Starting discovery')
-        previous_discovered_switches = 0
-        discovered_switches = 0
         time.sleep(sleep_before_discovery)
-        t_discovery_start = time.time()
         error_code = 0
-        max_discovered_switches = 0
+        detector = util.convergence.ConvergenceDetector(
+            expected_switches, discovery_deadline, sleep=gevent.sleep)
+        # The boot of every worker is timed from the Multinet side, to find
+        # the workers that boot their switches late
+        worker_boot = gevent.spawn(
+            util.workerstats.poll_worker_convergence,
+            self.worker_switches_probe, self.emulator.topo_size,
+            discovery_deadline, t_start, sleep=gevent.sleep)
+        outcome = detector.run(self.oper_switches_probe, t_start)
+        worker_boot.join()
+        worker_outcome = worker_boot.value
 
-        while True:
-            results = self.system_results()
-            results['global_sample_id'] = self.global_sample_id
-            self.global_sample_id += 1
-            results['multinet_workers'] = len(self.emulator.workers_ips)
-            results['multinet_worker_topo_size'] = self.emulator.topo_size
-            results['multinet_topology_type'] = self.emulator.topo_type
-            results['multinet_hosts_per_switch'] = \
-                self.emulator.topo_hosts_per_switch
-            results['multinet_group_size'] = self.emulator.topo_group_size
-            results['multinet_group_delay_ms'] = \
-                self.emulator.topo_group_delay_ms
-            results['controller_statistics_period_ms'] = \
-                self.controller.stat_period_ms
-            results['controller_node_ip'] = self.controller.ip
-            results['controller_port'] = str(self.controller.of_port)
-
-            if (time.time() - t_discovery_start) > discovery_deadline:
-                error_code = 201
-                logging.info(
-                    '[monitor_thread_idle] Deadline of {0} seconds passed, '
-                    'discovered {1} switches.'.format(discovery_deadline,
-                                                      discovered_switches))
-                discovery_time = time.time() - t_start - discovery_deadline
-                results['multinet_size'] = \
-                    self.emulator.topo_size * len(self.emulator.workers_ips)
-                results['bootup_time_secs'] = discovery_time
-                results['discovered_switches'] = discovered_switches
-                results['max_discovered_switches'] = max_discovered_switches
-                results['discovered_switches_error_code'] = error_code
-                results['successful_bootup_time'] = -1
-                self.result_queue.put([results])
-
-                return 0
-            else:
-                new_ssh = self.controller.init_ssh()
-                discovered_switches = \
-                    self.controller.get_oper_switches(new_ssh)
-                logging.info('Discovered switches: ='
-                             .format(discovered_switches))
-
-                if discovered_switches == -1:
-                    discovered_switches = previous_discovered_switches
-                if discovered_switches > max_discovered_switches:
-                    max_discovered_switches = discovered_switches
-
-                if discovered_switches != previous_discovered_switches:
-                    t_discovery_start = time.time()
-                    previous_discovered_switches = discovered_switches
-
-                if discovered_switches == expected_switches:
-                    delta_t = time.time() - t_start
-                    logging.info(
-                        '[monitor_thread_idle] {0} switches found in '
-                        '{1} seconds'.
-                        format(discovered_switches, delta_t))
-                    results['multinet_size'] = \
-                        self.emulator.topo_size * len(self.emulator.workers_ips)
-                    results['bootup_time_secs'] = delta_t
-                    results['discovered_switches'] = discovered_switches
-                    results['max_discovered_switches'] = \
-                        max_discovered_switches
-                    results['discovered_switches_error_code'] = error_code
-                    results['successful_bootup_time'] = delta_t
-                    self.result_queue.put([results])
-
-                    return 0
-            gevent.sleep(1)
+        results = self.system_results()
+        results['global_sample_id'] = self.global_sample_id
+        self.global_sample_id += 1
+        results['multinet_workers'] = len(self.emulator.workers_ips)
+        results['multinet_worker_topo_size'] = self.emulator.topo_size
+        results['multinet_worker_switches'] = worker_outcome['worker_values']
+        results['multinet_worker_bootup_time_secs'] = \
+            worker_outcome['worker_times']
+        results['multinet_worker_bootup_time_error_secs'] = \
+            worker_outcome['worker_error_secs']
+        results['multinet_straggler_workers'] = \
+            util.workerstats.find_stragglers(worker_outcome['worker_times'])
+        if results['multinet_straggler_workers']:
+            logging.info('[monitor_thread_idle] Straggler workers: {0}'.
+                         format(results['multinet_straggler_workers']))
+        results['multinet_topology_type'] = self.emulator.topo_type
+        results['multinet_hosts_per_switch'] = \
+            self.emulator.topo_hosts_per_switch
+        results['multinet_group_size'] = self.emulator.topo_group_size
+        results['multinet_group_delay_ms'] = \
+            self.emulator.topo_group_delay_ms
+        results['controller_statistics_period_ms'] = \
+            self.controller.stat_period_ms
+        results['controller_node_ip'] = self.controller.ip
+        results['controller_port'] = str(self.controller.of_port)
+        results['multinet_size'] = \
+            self.emulator.topo_size * len(self.emulator.workers_ips)
+        if outcome['converged']:
+            delta_t = outcome['time'] - t_start
+            logging.info('[monitor_thread_idle] {0} switches found in '
+                         '{1} (+/- {2}) seconds'.
+                         format(outcome['value'], delta_t,
+                                outcome['error_secs']))
+            results['bootup_time_secs'] = delta_t
+            results['bootup_time_error_secs'] = outcome['error_secs']
+            results['successful_bootup_time'] = delta_t
+        else:
+            error_code = 201
+            logging.info(
+                '[monitor_thread_idle] Deadline of {0} seconds passed, '
+                'discovered {1} switches.'.format(discovery_deadline,
+                                                  outcome['value']))
+            results['bootup_time_secs'] = \
+                time.time() - t_start - discovery_deadline
+            results['bootup_time_error_secs'] = -1
+            results['successful_bootup_time'] = -1
+        results['discovered_switches'] = outcome['value']
+        results['max_discovered_switches'] = outcome['max_value']
+        results['discovered_switches_error_code'] = error_code
+        results['discovery_probes'] = outcome['probes']
+        self.result_queue.put([results])
+        return 0
 
     def monitor_thread_idle_stability(self, reference_results, sample_id):
         """
@@ -613,6 +855,8 @@ class Multinet(Monitor):
         results['multinet_size'] = \
             self.emulator.topo_size * len(self.emulator.workers_ips)
         results['multinet_worker_topo_size'] = self.emulator.topo_size
+        results['multinet_worker_switches'] = \
+            self.worker_switches_probe() or {}
         results['multinet_topology_type'] = self.emulator.topo_type
         results['multinet_hosts_per_switch'] = \
             self.emulator.topo_hosts_per_switch
@@ -669,6 +913,8 @@ class Multinet(Monitor):
         results['multinet_size'] = \
             self.emulator.topo_size * len(self.emulator.workers_ips)
         results['multinet_worker_topo_size'] = self.emulator.topo_size
+        results['multinet_worker_switches'] = \
+            self.worker_switches_probe() or {}
         results['multinet_topology_type'] = self.emulator.topo_type
         results['multinet_hosts_per_switch'] = \
             self.emulator.topo_hosts_per_switch
@@ -736,45 +982,36 @@ class NBgen(Monitor):
         :type t_start: float
         :type expected_flows: int
         """
-        t_discovery_start = time.time()
-        previous_discovered_flows = 0
-
-        while True:
-            if (time.time() - t_discovery_start) > \
-                    self.nbgen.flows_ds_discovery_deadline:
-                logging.info('[NB_emulator] [Poll_flows thread] Deadline of '
-                             '{0} seconds passed'
-                             .format(self.nbgen.flows_ds_discovery_deadline))
-                self.nbgen.e2e_installation_time = -1.0
-                self.nbgen_queue.put({'end_to_end_flows_operation_time': -1.0},
-                                     block=True)
-                logging.info('[NB_emulator] [Poll_flows thread] End to End '
-                             'installation time monitor FAILED')
-
-                return
-            else:
-                new_ssh = self.controller.init_ssh()
-                oper_ds_found_flows = self.controller.get_oper_flows(new_ssh)
-                logging.debug('[NB_emulator] [Poll_flows thread] Found {0}'
-                              ' flows at inventory'.
-                              format(oper_ds_found_flows))
-                if (oper_ds_found_flows - previous_discovered_flows) != 0:
-                    t_discovery_start = time.time()
-                    previous_discovered_flows = oper_ds_found_flows
-                if oper_ds_found_flows == expected_flows:
-                    time_interval = time.time() - t_start
-                    logging.debug('[NB_emulator] [Poll_flows thread] '
-                                  'Flow-Master {0} flows found in {1} seconds'
-                                  .format(expected_flows, time_interval))
-                    self.nbgen.e2e_installation_time = time_interval
-                    self.nbgen_queue.put(
-                        {'end_to_end_flows_operation_time': time_interval},
-                        block=True)
-                    logging.info('[NB_emulator] [Poll_flows thread] '
-                                 'End to End installation time is: {0}'
-                                 .format(self.nbgen.e2e_installation_time))
-                    return
-            gevent.sleep(1)
+        detector = util.convergence.ConvergenceDetector(
+            expected_flows, self.nbgen.flows_ds_discovery_deadline,
+            sleep=gevent.sleep)
+        outcome = detector.run(self.oper_flows_probe, t_start)
+        if not outcome['converged']:
+            logging.info('[NB_emulator] [Poll_flows thread] Deadline of '
+                         '{0} seconds passed'
+                         .format(self.nbgen.flows_ds_discovery_deadline))
+            self.nbgen.e2e_installation_time = -1.0
+            self.nbgen_queue.put(
+                {'end_to_end_flows_operation_time': -1.0,
+                 'end_to_end_flows_operation_error': -1.0},
+                block=True)
+            logging.info('[NB_emulator] [Poll_flows thread] End to End '
+                         'installation time monitor FAILED')
+            return
+        time_interval = outcome['time'] - t_start
+        logging.debug('[NB_emulator] [Poll_flows thread] '
+                      'Flow-Master {0} flows found in {1} (+/- {2}) seconds, '
+                      '{3} queries'
+                      .format(expected_flows, time_interval,
+                              outcome['error_secs'], outcome['probes']))
+        self.nbgen.e2e_installation_time = time_interval
+        self.nbgen_queue.put(
+            {'end_to_end_flows_operation_time': time_interval,
+             'end_to_end_flows_operation_error': outcome['error_secs']},
+            block=True)
+        logging.info('[NB_emulator] [Poll_flows thread] '
+                     'End to End installation time is: {0}'
+                     .format(self.nbgen.e2e_installation_time))
 
     def __poll_flows_ds_confirm(self, expected_flows):
         """
@@ -789,45 +1026,29 @@ class NBgen(Monitor):
         :type expected_flows: int
         """
         t_start = time.time()
-        t_discovery_start = time.time()
-        previous_discovered_flows = 0
-
-        while True:
-            if (time.time() - t_discovery_start) > \
-                    self.nbgen.flows_ds_discovery_deadline:
-                logging.info('[NB_emulator] [Poll_flows_confirm thread] '
-                             ' Deadline of {0} seconds passed'
-                             .format(self.flows_ds_discovery_deadline))
-                self.nbgen.confirm_time = -1.0
-                self.nbgen_queue.put({'confirm_time': -1.0}, block=True)
-                logging.info('[NB_emulator] [Poll_flows_confirm thread] '
-                             'Confirmation time monitoring FAILED')
-
-                return
-            else:
-                new_ssh = self.controller.init_ssh()
-                oper_ds_found_flows = self.controller.get_oper_flows(new_ssh)
-                logging.debug('[NB_emulator] [Poll_flows_confirm thread] '
-                              'Found {0} flows at inventory'
-                              .format(oper_ds_found_flows))
-                if (oper_ds_found_flows - previous_discovered_flows) != 0:
-                    t_discovery_start = time.time()
-                    previous_discovered_flows = oper_ds_found_flows
-                if oper_ds_found_flows == expected_flows:
-                    time_interval = time.time() - t_start
-                    logging.debug('[NB_emulator] [Poll_flows_confirm thread] '
-                                  'Flow-Master {0} flows found in {1} seconds'
-                                  .format(expected_flows,
-                                          time_interval))
-                    self.nbgen.confirm_time = time_interval
-                    self.nbgen_queue.put({'confirm_time': time_interval},
-                                         block=True)
-                    logging.info('[NB_emulator] [Poll_flows_confirm thread] '
-                                 'Confirmation time is: {0}'
-                                 .format(self.nbgen.confirm_time))
-
-                    return
-            gevent.sleep(1)
+        detector = util.convergence.ConvergenceDetector(
+            expected_flows, self.nbgen.flows_ds_discovery_deadline,
+            sleep=gevent.sleep)
+        outcome = detector.run(self.oper_flows_probe, t_start)
+        if not outcome['converged']:
+            logging.info('[NB_emulator] [Poll_flows_confirm thread] '
+                         ' Deadline of {0} seconds passed'
+                         .format(self.nbgen.flows_ds_discovery_deadline))
+            self.nbgen.confirm_time = -1.0
+            self.nbgen_queue.put({'confirm_time': -1.0}, block=True)
+            logging.info('[NB_emulator] [Poll_flows_confirm thread] '
+                         'Confirmation time monitoring FAILED')
+            return
+        time_interval = outcome['time'] - t_start
+        logging.debug('[NB_emulator] [Poll_flows_confirm thread] '
+                      'Flow-Master {0} flows found in {1} (+/- {2}) seconds'
+                      .format(expected_flows, time_interval,
+                              outcome['error_secs']))
+        self.nbgen.confirm_time = time_interval
+        self.nbgen_queue.put({'confirm_time': time_interval}, block=True)
+        logging.info('[NB_emulator] [Poll_flows_confirm thread] '
+                     'Confirmation time is: {0}'
+                     .format(self.nbgen.confirm_time))
 
     def __poll_flows_switches(self, t_start, expected_flows):
         """
@@ -845,46 +1066,31 @@ class NBgen(Monitor):
         :type t_start: float
         :type expected_flows: int
         """
-        t_discovery_start = time.time()
-        previous_discovered_flows = 0
-
-        while True:
-            if (time.time() - t_discovery_start) > \
-                    self.nbgen.flows_ds_discovery_deadline:
-                logging.info('[NB_emulator] [Poll_flows_switches thread] '
-                             'Deadline of {0} seconds passed'
-                             .format(self.flows_ds_discovery_deadline))
-                self.nbgen.discover_flows_on_switches_time = -1.0
-                self.nbgen_queue.put({'switch_operation_time': -1.0},
-                                     block=True)
-                logging.info('[NB_emulator] [Poll_flows_switches thread] '
-                             'Discovering flows on switches FAILED')
-
-                return
-            else:
-                new_ssh = self.sbemu.init_ssh()
-                discovered_flows = self.sbemu.get_flows(new_ssh)
-                logging.debug('[NB_emulator] [Poll_flows_switches thread] '
-                              'Found {0} flows at topology switches'
-                              .format(discovered_flows))
-                if (discovered_flows - previous_discovered_flows) != 0:
-                    t_discovery_start = time.time()
-                    previous_discovered_flows = discovered_flows
-                if discovered_flows == expected_flows:
-                    time_interval = time.time() - t_start
-                    logging.debug('[NB_emulator] [Poll_flows_switches thread]'
-                                  ' expected flows = {0} \n '
-                                  'discovered flows = {1}'
-                                  .format(expected_flows, discovered_flows))
-                    self.discover_flows_on_switches_time = time_interval
-                    self.nbgen_queue.put(
-                        {'switch_operation_time': time_interval}, block=True)
-                    logging.info('[NB_emulator] [Poll_flows_switches thread] '
-                                 'Time to discover flows on switches is: {0}'
-                                 .format(self.nbgen.
-                                         discover_flows_on_switches_time))
-                    return
-            gevent.sleep(1)
+        detector = util.convergence.ConvergenceDetector(
+            expected_flows, self.nbgen.flows_ds_discovery_deadline,
+            sleep=gevent.sleep)
+        outcome = detector.run(self.sbemu.get_flows, t_start)
+        if not outcome['converged']:
+            logging.info('[NB_emulator] [Poll_flows_switches thread] '
+                         'Deadline of {0} seconds passed'
+                         .format(self.nbgen.flows_ds_discovery_deadline))
+            self.nbgen.discover_flows_on_switches_time = -1.0
+            self.nbgen_queue.put({'switch_operation_time': -1.0},
+                                 block=True)
+            logging.info('[NB_emulator] [Poll_flows_switches thread] '
+                         'Discovering flows on switches FAILED')
+            return
+        time_interval = outcome['time'] - t_start
+        logging.debug('[NB_emulator] [Poll_flows_switches thread]'
+                      ' expected flows = {0} \n '
+                      'discovered flows = {1}'
+                      .format(expected_flows, outcome['value']))
+        self.nbgen.discover_flows_on_switches_time = time_interval
+        self.nbgen_queue.put(
+            {'switch_operation_time': time_interval}, block=True)
+        logging.info('[NB_emulator] [Poll_flows_switches thread] '
+                     'Time to discover flows on switches is: {0}'
+                     .format(self.nbgen.discover_flows_on_switches_time))
 
     def __controller_time(self, t_start):
         """
@@ -938,7 +1144,8 @@ class NBgen(Monitor):
 
         time_start = time.time()
         controller_time = self.__controller_time(t_start)
-        discovered_flows = self.sbemu.get_flows()
+        worker_flows = self.sbemu.get_flows(per_worker=True)
+        discovered_flows = sum(worker_flows.values())
         flow_measurement_latency_interval = time.time() - time_start
         logging.info('[NB_emulator] Flows measurement latency '
                      'interval: {0} sec. | Discovered flows: {1}'
@@ -959,6 +1166,7 @@ class NBgen(Monitor):
             results = self.monitor_results_del(controller_time,
                                                results_thread,
                                                total_failed_flows)
+        results['multinet_worker_flows'] = worker_flows
         return results
 
     def monitor_results_add(self, add_controller_time,
@@ -1015,6 +1223,8 @@ class NBgen(Monitor):
 
         results['end_to_end_installation_time'] = \
             results_thread['end_to_end_flows_operation_time']
+        results['end_to_end_installation_error'] = \
+            results_thread['end_to_end_flows_operation_error']
         if results_thread['end_to_end_flows_operation_time'] != -1:
             results['end_to_end_installation_rate'] = \
                 float(self.nbgen.total_flows) / \
@@ -1076,6 +1286,8 @@ class NBgen(Monitor):
 
         results['end_to_end_remove_time'] = \
             results_thread['end_to_end_flows_operation_time']
+        results['end_to_end_remove_error'] = \
+            results_thread['end_to_end_flows_operation_error']
         results['end_to_end_remove_rate'] = \
             float(self.nbgen.total_flows) / \
             results_thread['end_to_end_flows_operation_time']
@@ -56,6 +56,7 @@ class NBgen:
         self.get_oper_ds_flows_hnd = (
             self.base_dir + test_config['nb_emulator_get_oper_ds_handler'])
         self._ssh_conn = None
+        self._verified_hnds = set()
         self.flow_delete_flag = test_config['flow_delete_flag']
         self.flows_per_request = test_config['flows_per_request']
         self.log_level = log_level
@@ -126,9 +127,20 @@ class NBgen:
         except stress_test.nbemu_exceptions.NBGenError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    def get_handlers(self):
+        """
+        Returns the handlers of the NB-Generator
+
+        :returns: full paths of all handlers of the NB-Generator
+        :rtype: list<str>
+        """
+        return [self.build_hnd, self.clean_hnd, self.run_hnd]
+
     def build(self):
         """
-        Wrapper to the NB-Generator build handler
+        Wrapper to the NB-Generator build handler. After a successful build \
+            the handlers of the NB-Generator are all checked at once, see \
+            get_handlers().
 
         :raises IOError: if the handler does not exist on the remote host
         :raises nb_emulator_exceptions.NBGenBuildError: if build process fails
@@ -136,16 +148,10 @@ class NBgen:
         logging.info('[NB_emulator] Building')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.build_hnd]):
-                    raise(IOError(
-                        '{0} build handler does not exist'.
-                        format('[nb_emulator.build]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.build_hnd)
+                self._verified_hnds.clear()
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.build_hnd], self._verified_hnds, '[NB_emulator]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, ' '.join([self.build_hnd]),
                     '[NB_emulator.build_handler]')
@@ -156,6 +162,10 @@ class NBgen:
                         '[NB_emulator] Failure during running. Build handler '
                         'exited with no zero exit status. \n '
                         'Handler output: {0}'.format(cmd_output), exit_status))
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    self.get_handlers(), self._verified_hnds, '[NB_emulator]',
+                    required=False)
             except stress_test.nbemu_exceptions.NBGenError as e:
                 self._error_handling(e.err_msg, e.err_code)
             except:
@@ -175,19 +185,13 @@ class NBgen:
         logging.info('[NB_emulator] Cleaning')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.clean_hnd]):
-                    raise(IOError(
-                        '{0} clean handler does not exist'.
-                        format('[nb_emulator.clean]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.clean_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.clean_hnd], self._verified_hnds, '[NB_emulator]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, self.clean_hnd,
                     '[NB_emulator.clean_handler]')
+                self._verified_hnds.clear()
                 if exit_status == 0:
                     logging.info("[NB_emulator] Successful clean")
                 else:
@@ -217,16 +221,9 @@ class NBgen:
         logging.info("[NB_emulator] Run handler")
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.run_hnd]):
-                    raise(IOError(
-                        '{0} run handler does not exist'.
-                        format('[nb_emulator.run]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.run_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.run_hnd], self._verified_hnds, '[NB_emulator]')
                 exit_status, cmd_output = \
                     util.netutil.ssh_run_command(
                         self._ssh_conn,
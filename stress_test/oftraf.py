@@ -44,6 +44,7 @@ class Oftraf:
 
         self.of_port = controller.of_port
         self._ssh_conn = controller.init_ssh()
+        self._verified_hnds = set()
         self.traceback_enabled = False
 
     def _error_handling(self, error_message, error_num=1):
@@ -86,9 +87,22 @@ class Oftraf:
             [monitors_base_dir, 'monitors', 'oftraf', ''])
         return str(oftraf_path)
 
+    def get_handlers(self):
+        """
+        Returns the handlers of the oftraf monitor
+
+        :returns: full paths of all handlers of the oftraf monitor
+        :rtype: list<str>
+        """
+        oftraf_path = self.get_oftraf_path()
+        return [oftraf_path + hnd for hnd in
+                ['build.sh', 'clean.sh', 'start.sh', 'stop.sh']]
+
     def build(self):
         """
-        Wrapper to the oftraf monitor build handler
+        Wrapper to the oftraf monitor build handler. After a successful build \
+            the handlers of oftraf are all checked at once, see \
+            get_handlers().
 
         :raises IOError: if the handler does not exist on the remote host
         :raises oftraf_exceptions.OftrafBuildError: if build process fails
@@ -98,18 +112,10 @@ class Oftraf:
             try:
                 oftraf_path = str(self.get_oftraf_path())
                 build_hnd = os.path.join(str(oftraf_path), 'build.sh')
-                if not util.netutil.isfile(self.ip,
-                                           self.ssh_port,
-                                           self.ssh_user,
-                                           self.ssh_pass,
-                                           [build_hnd]):
-                    raise(IOError(
-                        '{0} build handler does not exist'.
-                        format('[oftraf.build]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        build_hnd)
+                self._verified_hnds.clear()
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [build_hnd], self._verified_hnds, '[oftraf]')
                 exit_status, cmd_output = \
                     util.netutil.ssh_run_command(self._ssh_conn,
                                                  ' '.join([build_hnd]),
@@ -121,6 +127,10 @@ class Oftraf:
                         'Build process exited with non zero exit code. '
                         'Command-line output: {0} \n Exit status code: {1}'.
                         format(cmd_output, exit_status), 2))
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    self.get_handlers(), self._verified_hnds, '[oftraf]',
+                    required=False)
             except stress_test.oftraf_exceptions.OftrafError as e:
                 self._error_handling(e.err_msg, e.err_code)
             except:
@@ -140,20 +150,14 @@ class Oftraf:
             try:
                 oftraf_path = self.get_oftraf_path()
                 clean_hnd = oftraf_path + 'clean.sh'
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [clean_hnd]):
-                    raise(IOError(
-                        '{0} clean handler does not exist'.
-                        format('[oftraf.build]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        clean_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [clean_hnd], self._verified_hnds, '[oftraf]')
                 exit_status, cmd_output = \
                     util.netutil.ssh_run_command(self._ssh_conn,
                                                  ' '.join([clean_hnd]),
                                                  '[oftraf.clean_handler]')
+                self._verified_hnds.clear()
                 if exit_status == 0:
                     logging.info("[Oftraf] Successful cleaning")
                 else:
@@ -182,16 +186,9 @@ class Oftraf:
             try:
                 oftraf_path = self.get_oftraf_path()
                 start_hnd = oftraf_path + 'start.sh'
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [start_hnd]):
-                    raise(IOError(
-                        '{0} start handler does not exist'.
-                        format('[oftraf.build]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        start_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [start_hnd], self._verified_hnds, '[oftraf]')
                 exit_status, cmd_output = \
                     util.netutil.ssh_run_command(
                         self._ssh_conn, ' '.join([start_hnd,
@@ -226,16 +223,9 @@ class Oftraf:
             try:
                 oftraf_path = self.get_oftraf_path()
                 stop_hnd = oftraf_path + 'stop.sh'
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [stop_hnd]):
-                    raise(IOError(
-                        '{0} stop handler does not exist'.
-                        format('[oftraf.build]')))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        stop_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [stop_hnd], self._verified_hnds, '[oftraf]')
                 exit_status, cmd_output = \
                     util.netutil.ssh_run_command(
                         self._ssh_conn,
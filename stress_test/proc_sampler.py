@@ -0,0 +1,132 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+""" Process sampler Class- All sampling agent related functionality is here"""
+
+import logging
+import os
+import util.netutil
+import util.sysstats
+
+
+class ProcSampler:
+    """
+    Deploys and drives the high-frequency sampling agent on the controller \
+        node
+    """
+    def __init__(self, controller, test_config):
+        """
+        Creates a process sampler object. Options from JSON input file
+
+        :param controller: object of the Controller class
+        :param test_config: JSON input configuration
+        :type controller: object
+        :type test_config: JSON configuration dictionary
+        """
+        self.rate_hz = test_config['proc_sampler_rate_hz']
+        if 'proc_sampler_capacity' in test_config:
+            self.capacity = test_config['proc_sampler_capacity']
+        else:
+            self.capacity = 65536
+        self.ip = controller.ip
+        self.ssh_port = controller.ssh_port
+        self.ssh_user = controller.ssh_user
+        self.ssh_pass = controller.ssh_pass
+
+        self.remote_agent = '/tmp/nstat_proc_sampler.py'
+        self.remote_ring_file = '/tmp/nstat_proc_sampler.ring'
+        self._ssh_conn = controller.init_ssh()
+
+    def get_agent_path(self):
+        """
+        Returns the local path of the sampling agent, using as base the \
+            project path
+
+        :returns: sampling agent path
+        :rtype: str
+        """
+        stress_test_base_dir = os.path.abspath(os.path.join(
+            os.path.realpath(__file__), os.pardir))
+        monitors_base_dir = os.path.abspath(os.path.join(stress_test_base_dir,
+                                                         os.pardir))
+        return os.path.sep.join(
+            [monitors_base_dir, 'monitors', 'proc_sampler', 'proc_sampler.py'])
+
+    def start(self, pid):
+        """
+        Deploys the sampling agent on the controller node and starts \
+            sampling the given process in the background
+
+        :param pid: the process ID of the sampled process
+        :type pid: int
+        :returns: True if the agent was started, False otherwise
+        :rtype: bool
+        """
+        logging.info('[ProcSampler] Starting sampling of process {0} at {1} '
+                     'Hz'.format(pid, self.rate_hz))
+        try:
+            util.netutil.ssh_copy_file_to_target(
+                self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                self.get_agent_path(), self.remote_agent)
+            exit_status, cmd_output = util.netutil.ssh_run_command(
+                self._ssh_conn,
+                'nohup python3 {0} --pid {1} --rate-hz {2} --capacity {3} '
+                '--output {4} > /dev/null 2>&1 &'.
+                format(self.remote_agent, pid, self.rate_hz, self.capacity,
+                       self.remote_ring_file),
+                '[ProcSampler.start]')
+            return exit_status == 0
+        except:
+            logging.error('[ProcSampler] Fail to start the sampling agent.')
+            return False
+
+    def stop(self):
+        """
+        Stops the sampling agent on the controller node
+        """
+        logging.info('[ProcSampler] Stopping')
+        try:
+            util.netutil.ssh_run_command(
+                self._ssh_conn,
+                'kill $(cat {0}.pid) > /dev/null 2>&1'.
+                format(self.remote_ring_file),
+                '[ProcSampler.stop]')
+        except:
+            logging.error('[ProcSampler] Fail to stop the sampling agent.')
+
+    def fetch(self):
+        """
+        Fetches the ring-buffer file of the sampling agent in bulk, with a \
+            single sftp read
+
+        :returns: the samples as compact arrays, see \
+            util.sysstats.parse_proc_samples(). Empty arrays if the file \
+            cannot be fetched.
+        :rtype: dict
+        """
+        def read_ring_file(sftp):
+            with sftp.open(self.remote_ring_file, 'rb') as ring_file:
+                return ring_file.read()
+        try:
+            data = util.netutil.ssh_pool_run(self.ip, self.ssh_port,
+                                             self.ssh_user, self.ssh_pass,
+                                             read_ring_file,
+                                             'read_proc_samples')
+        except:
+            logging.error('[ProcSampler] Fail to fetch the samples.')
+            data = b''
+        return util.sysstats.parse_proc_samples(data)
+
+    def __del__(self):
+        """
+        Method called when object is destroyed. Closes the ssh connection \
+            to the controller node.
+        """
+        try:
+            self._ssh_conn.close()
+        except Exception as e:
+            logging.info('Fail closing ssh connection of the sampling agent '
+                         'during cleanup. Exception message: {0}'.format(e))
@@ -82,8 +82,22 @@ class TestReport:
                  ('mtcbench_internal_repeats', 'Generator Internal repeats'),
                  ('internal_repeat_id', 'Internal repeat ID'),
                  ('throughput_responses_sec', 'Throughput (responses/sec)'),
+                 ('mtcbench_switch_throughput_min',
+                  'Min switch throughput (responses/sec)'),
+                 ('mtcbench_switch_throughput_max',
+                  'Max switch throughput (responses/sec)'),
+                 ('mtcbench_switch_throughput_avg',
+                  'Avg switch throughput (responses/sec)'),
+                 ('mtcbench_switch_throughput_stdev',
+                  'Stdev of switch throughput (responses/sec)'),
+                 ('mtcbench_fairness_index', 'Switch fairness index'),
+                 ('mtcbench_node_throughput_responses_sec',
+                  'Throughput per generator node (responses/sec)'),
+                 ('mtcbench_alignment_skew_secs',
+                  'Alignment skew of generator nodes (seconds)'),
                  ('mtcbench_simulated_hosts', 'Generator simulated hosts'),
                  ('mtcbench_switches', 'Generated simulated switches'),
+                 ('mtcbench_nodes', 'Generator nodes'),
                  ('mtcbench_threads', 'Generator threads'),
                  ('mtcbench_switches_per_thread',
                   'Switches per generator thread'),
@@ -106,6 +120,38 @@ class TestReport:
                  ('controller_cpu_user_time', 'Controller CPU user time'),
                  ('controller_num_threads', 'Controller threads'),
                  ('controller_num_fds', 'Controller num of fds'),
+                 ('system_stats_collection_time_ms',
+                  'System stats collection time (ms)'),
+                 ('measurement_overhead_ms',
+                  'Measurement overhead (ms)'),
+                 ('controller_spawn_secs',
+                  'Controller start handler time (seconds)'),
+                 ('controller_listen_secs',
+                  'Controller time to listen (seconds)'),
+                 ('controller_ready_secs',
+                  'Controller startup time (seconds)'),
+                 ('controller_restart_mode',
+                  'Controller restart mode (cold/warm)'),
+                 ('controller_reset_secs',
+                  'Controller state reset time (seconds)'),
+                 ('controller_gc_count', 'Controller GC collections'),
+                 ('controller_gc_time_ms', 'Controller GC time (ms)'),
+                 ('controller_gc_max_pause_ms',
+                  'Controller GC max pause (ms)'),
+                 ('controller_heap_used_max_bytes',
+                  'Controller max heap used (bytes)'),
+                 ('controller_old_used_max_bytes',
+                  'Controller max old generation used (bytes)'),
+                 ('controller_cluster_size',
+                  'Controller cluster members'),
+                 ('cluster_controller_cpu_user_time',
+                  'Cluster CPU user time (sum of members)'),
+                 ('cluster_controller_cpu_system_time',
+                  'Cluster CPU system time (sum of members)'),
+                 ('cluster_controller_vm_size',
+                  'Cluster VM size (sum of members)'),
+                 ('cluster_used_memory_bytes',
+                  'Cluster used memory (sum of members, bytes)'),
                  ('controller_statistics_period_ms',
                   'Controller statistics period (ms)')],
                 results_json_file)])
@@ -176,8 +222,22 @@ class TestReport:
                  'Generator Internal repeats'),
                  ('internal_repeat_id', 'Internal repeat ID'),
                  ('throughput_responses_sec', 'Throughput (responses/sec)'),
+                 ('mtcbench_switch_throughput_min',
+                  'Min switch throughput (responses/sec)'),
+                 ('mtcbench_switch_throughput_max',
+                  'Max switch throughput (responses/sec)'),
+                 ('mtcbench_switch_throughput_avg',
+                  'Avg switch throughput (responses/sec)'),
+                 ('mtcbench_switch_throughput_stdev',
+                  'Stdev of switch throughput (responses/sec)'),
+                 ('mtcbench_fairness_index', 'Switch fairness index'),
+                 ('mtcbench_node_throughput_responses_sec',
+                  'Throughput per generator node (responses/sec)'),
+                 ('mtcbench_alignment_skew_secs',
+                  'Alignment skew of generator nodes (seconds)'),
                  ('mtcbench_simulated_hosts', 'Generator simulated hosts'),
                  ('mtcbench_switches', 'Generated simulated switches'),
+                 ('mtcbench_nodes', 'Generator nodes'),
                  ('mtcbench_threads', 'Generator threads'),
                  ('mtcbench_switches_per_thread',
                   'Switches per generator thread'),
@@ -201,6 +261,38 @@ class TestReport:
                  ('controller_cpu_user_time', 'Controller CPU user time'),
                  ('controller_num_threads', 'Controller threads'),
                  ('controller_num_fds', 'Controller num of fds'),
+                 ('system_stats_collection_time_ms',
+                  'System stats collection time (ms)'),
+                 ('measurement_overhead_ms',
+                  'Measurement overhead (ms)'),
+                 ('controller_spawn_secs',
+                  'Controller start handler time (seconds)'),
+                 ('controller_listen_secs',
+                  'Controller time to listen (seconds)'),
+                 ('controller_ready_secs',
+                  'Controller startup time (seconds)'),
+                 ('controller_restart_mode',
+                  'Controller restart mode (cold/warm)'),
+                 ('controller_reset_secs',
+                  'Controller state reset time (seconds)'),
+                 ('controller_gc_count', 'Controller GC collections'),
+                 ('controller_gc_time_ms', 'Controller GC time (ms)'),
+                 ('controller_gc_max_pause_ms',
+                  'Controller GC max pause (ms)'),
+                 ('controller_heap_used_max_bytes',
+                  'Controller max heap used (bytes)'),
+                 ('controller_old_used_max_bytes',
+                  'Controller max old generation used (bytes)'),
+                 ('controller_cluster_size',
+                  'Controller cluster members'),
+                 ('cluster_controller_cpu_user_time',
+                  'Cluster CPU user time (sum of members)'),
+                 ('cluster_controller_cpu_system_time',
+                  'Cluster CPU system time (sum of members)'),
+                 ('cluster_controller_vm_size',
+                  'Cluster VM size (sum of members)'),
+                 ('cluster_used_memory_bytes',
+                  'Cluster used memory (sum of members, bytes)'),
                  ('controller_statistics_period_ms',
                   'Controller statistics period (ms)')], results_json_file)])
         return report_spec_obj
@@ -270,6 +362,7 @@ class TestReport:
                   'Successful bootup time (seconds)'),
                  ('bootup_time_secs',
                   'Time to discover switches (seconds)'),
+                 ('discovery_probes', 'Discovery queries'),
                  ('max_discovered_switches',
                   'Max discovered switches'),
                  ('discovered_switches',
@@ -278,6 +371,7 @@ class TestReport:
                   'Generator simulated hosts'),
                  ('mtcbench_switches',
                   'Generated simulated switches'),
+                 ('mtcbench_nodes', 'Generator nodes'),
                  ('mtcbench_threads', 'Generator threads'),
                  ('mtcbench_switches_per_thread',
                   'Switches per cbench thread'),
@@ -308,6 +402,40 @@ class TestReport:
                   'Controller threads'),
                  ('controller_num_fds',
                   'Controller num of fds'),
+                 ('system_stats_collection_time_ms',
+                  'System stats collection time (ms)'),
+                 ('measurement_overhead_ms',
+                  'Measurement overhead (ms)'),
+                 ('bootup_time_error_secs',
+                  'Time to discover switches error bound (seconds)'),
+                 ('controller_spawn_secs',
+                  'Controller start handler time (seconds)'),
+                 ('controller_listen_secs',
+                  'Controller time to listen (seconds)'),
+                 ('controller_ready_secs',
+                  'Controller startup time (seconds)'),
+                 ('controller_restart_mode',
+                  'Controller restart mode (cold/warm)'),
+                 ('controller_reset_secs',
+                  'Controller state reset time (seconds)'),
+                 ('controller_gc_count', 'Controller GC collections'),
+                 ('controller_gc_time_ms', 'Controller GC time (ms)'),
+                 ('controller_gc_max_pause_ms',
+                  'Controller GC max pause (ms)'),
+                 ('controller_heap_used_max_bytes',
+                  'Controller max heap used (bytes)'),
+                 ('controller_old_used_max_bytes',
+                  'Controller max old generation used (bytes)'),
+                 ('controller_cluster_size',
+                  'Controller cluster members'),
+                 ('cluster_controller_cpu_user_time',
+                  'Cluster CPU user time (sum of members)'),
+                 ('cluster_controller_cpu_system_time',
+                  'Cluster CPU system time (sum of members)'),
+                 ('cluster_controller_vm_size',
+                  'Cluster VM size (sum of members)'),
+                 ('cluster_used_memory_bytes',
+                  'Cluster used memory (sum of members, bytes)'),
                  ('controller_statistics_period_ms',
                   'Controller statistics period (ms)')],
                 results_json_file)])
@@ -385,6 +513,8 @@ class TestReport:
                  ('multinet_size', 'Multinet Size'),
                  ('multinet_worker_topo_size',
                   'Topology size per Multinet worker'),
+                 ('multinet_worker_switches',
+                  'Switches per Multinet worker'),
                  ('multinet_workers', 'number of Multinet workers'),
                  ('multinet_topology_type', 'Multinet topology Type'),
                  ('multinet_hosts_per_switch', 'Multinet hosts per Switch'),
@@ -402,6 +532,38 @@ class TestReport:
                  ('controller_cpu_user_time', 'Controller CPU user time'),
                  ('controller_num_threads', 'Controller threads'),
                  ('controller_num_fds', 'Controller num of fds'),
+                 ('system_stats_collection_time_ms',
+                  'System stats collection time (ms)'),
+                 ('measurement_overhead_ms',
+                  'Measurement overhead (ms)'),
+                 ('controller_spawn_secs',
+                  'Controller start handler time (seconds)'),
+                 ('controller_listen_secs',
+                  'Controller time to listen (seconds)'),
+                 ('controller_ready_secs',
+                  'Controller startup time (seconds)'),
+                 ('controller_restart_mode',
+                  'Controller restart mode (cold/warm)'),
+                 ('controller_reset_secs',
+                  'Controller state reset time (seconds)'),
+                 ('controller_gc_count', 'Controller GC collections'),
+                 ('controller_gc_time_ms', 'Controller GC time (ms)'),
+                 ('controller_gc_max_pause_ms',
+                  'Controller GC max pause (ms)'),
+                 ('controller_heap_used_max_bytes',
+                  'Controller max heap used (bytes)'),
+                 ('controller_old_used_max_bytes',
+                  'Controller max old generation used (bytes)'),
+                 ('controller_cluster_size',
+                  'Controller cluster members'),
+                 ('cluster_controller_cpu_user_time',
+                  'Cluster CPU user time (sum of members)'),
+                 ('cluster_controller_cpu_system_time',
+                  'Cluster CPU system time (sum of members)'),
+                 ('cluster_controller_vm_size',
+                  'Cluster VM size (sum of members)'),
+                 ('cluster_used_memory_bytes',
+                  'Cluster used memory (sum of members, bytes)'),
                  ('controller_statistics_period_ms',
                   'Controller Statistics Period (ms)')], results_json_file)])
         return report_spec_obj
@@ -468,11 +630,18 @@ class TestReport:
                  ('successful_bootup_time',
                   'Successful bootup time (seconds)'),
                  ('bootup_time_secs', 'Time to discover switches (seconds)'),
+                 ('discovery_probes', 'Discovery queries'),
                  ('max_discovered_switches', 'Max discovered switches'),
                  ('discovered_switches', 'Discovered switches'),
                  ('multinet_size', 'Multinet Size'),
                  ('multinet_worker_topo_size',
                   'Topology size per Multinet worker'),
+                 ('multinet_worker_switches',
+                  'Switches per Multinet worker'),
+                 ('multinet_worker_bootup_time_secs',
+                  'Bootup time per Multinet worker (seconds)'),
+                 ('multinet_straggler_workers',
+                  'Multinet workers deviating from the median bootup time'),
                  ('multinet_workers', 'number of Multinet workers'),
                  ('multinet_topology_type', 'Multinet topology Type'),
                  ('multinet_hosts_per_switch', 'Multinet hosts per Switch'),
@@ -490,6 +659,42 @@ class TestReport:
                  ('controller_cpu_user_time', 'Controller CPU user time'),
                  ('controller_num_threads', 'Controller threads'),
                  ('controller_num_fds', 'Controller num of fds'),
+                 ('system_stats_collection_time_ms',
+                  'System stats collection time (ms)'),
+                 ('measurement_overhead_ms',
+                  'Measurement overhead (ms)'),
+                 ('bootup_time_error_secs',
+                  'Time to discover switches error bound (seconds)'),
+                 ('multinet_worker_bootup_time_error_secs',
+                  'Bootup time per Multinet worker error bound (seconds)'),
+                 ('controller_spawn_secs',
+                  'Controller start handler time (seconds)'),
+                 ('controller_listen_secs',
+                  'Controller time to listen (seconds)'),
+                 ('controller_ready_secs',
+                  'Controller startup time (seconds)'),
+                 ('controller_restart_mode',
+                  'Controller restart mode (cold/warm)'),
+                 ('controller_reset_secs',
+                  'Controller state reset time (seconds)'),
+                 ('controller_gc_count', 'Controller GC collections'),
+                 ('controller_gc_time_ms', 'Controller GC time (ms)'),
+                 ('controller_gc_max_pause_ms',
+                  'Controller GC max pause (ms)'),
+                 ('controller_heap_used_max_bytes',
+                  'Controller max heap used (bytes)'),
+                 ('controller_old_used_max_bytes',
+                  'Controller max old generation used (bytes)'),
+                 ('controller_cluster_size',
+                  'Controller cluster members'),
+                 ('cluster_controller_cpu_user_time',
+                  'Cluster CPU user time (sum of members)'),
+                 ('cluster_controller_cpu_system_time',
+                  'Cluster CPU system time (sum of members)'),
+                 ('cluster_controller_vm_size',
+                  'Cluster VM size (sum of members)'),
+                 ('cluster_used_memory_bytes',
+                  'Cluster used memory (sum of members, bytes)'),
                  ('controller_statistics_period_ms',
                   'Controller Statistics Period (ms)')], results_json_file)])
         return report_spec_obj
@@ -571,6 +776,8 @@ class TestReport:
                  ('multinet_size', 'Multinet Size'),
                  ('multinet_worker_topo_size',
                   'Topology size per Multinet worker'),
+                 ('multinet_worker_switches',
+                  'Switches per Multinet worker'),
                  ('multinet_workers', 'Number of Multinet workers'),
                  ('multinet_topology_type', 'Multinet topology Type'),
                  ('multinet_hosts_per_switch', 'Multinet hosts per Switch'),
@@ -588,6 +795,38 @@ class TestReport:
                  ('controller_cpu_user_time', 'Controller CPU user time'),
                  ('controller_num_threads', 'Controller threads'),
                  ('controller_num_fds', 'Controller num of fds'),
+                 ('system_stats_collection_time_ms',
+                  'System stats collection time (ms)'),
+                 ('measurement_overhead_ms',
+                  'Measurement overhead (ms)'),
+                 ('controller_spawn_secs',
+                  'Controller start handler time (seconds)'),
+                 ('controller_listen_secs',
+                  'Controller time to listen (seconds)'),
+                 ('controller_ready_secs',
+                  'Controller startup time (seconds)'),
+                 ('controller_restart_mode',
+                  'Controller restart mode (cold/warm)'),
+                 ('controller_reset_secs',
+                  'Controller state reset time (seconds)'),
+                 ('controller_gc_count', 'Controller GC collections'),
+                 ('controller_gc_time_ms', 'Controller GC time (ms)'),
+                 ('controller_gc_max_pause_ms',
+                  'Controller GC max pause (ms)'),
+                 ('controller_heap_used_max_bytes',
+                  'Controller max heap used (bytes)'),
+                 ('controller_old_used_max_bytes',
+                  'Controller max old generation used (bytes)'),
+                 ('controller_cluster_size',
+                  'Controller cluster members'),
+                 ('cluster_controller_cpu_user_time',
+                  'Cluster CPU user time (sum of members)'),
+                 ('cluster_controller_cpu_system_time',
+                  'Cluster CPU system time (sum of members)'),
+                 ('cluster_controller_vm_size',
+                  'Cluster VM size (sum of members)'),
+                 ('cluster_used_memory_bytes',
+                  'Cluster used memory (sum of members, bytes)'),
                  ('controller_statistics_period_ms',
                   'Controller Statistics Period (ms)')], results_json_file)])
         return report_spec_obj
@@ -679,6 +918,8 @@ class TestReport:
                  ('multinet_size', 'Multinet Size'),
                  ('multinet_worker_topo_size',
                   'Topology size per Multinet worker'),
+                 ('multinet_worker_flows',
+                  'Flows per Multinet worker'),
                  ('multinet_workers', 'Number of Multinet workers'),
                  ('multinet_topology_type', 'Multinet topology Type'),
                  ('multinet_hosts_per_switch', 'Multinet hosts per Switch'),
@@ -698,6 +939,42 @@ class TestReport:
                  ('controller_cpu_user_time', 'Controller CPU user time'),
                  ('controller_num_threads', 'Controller num of threads'),
                  ('controller_num_fds', 'Controller num of fds'),
+                 ('system_stats_collection_time_ms',
+                  'System stats collection time (ms)'),
+                 ('measurement_overhead_ms',
+                  'Measurement overhead (ms)'),
+                 ('end_to_end_installation_error',
+                  'End-to-end installation time error bound [s]'),
+                 ('end_to_end_remove_error',
+                  'Delete flows time error bound [s]'),
+                 ('controller_spawn_secs',
+                  'Controller start handler time (seconds)'),
+                 ('controller_listen_secs',
+                  'Controller time to listen (seconds)'),
+                 ('controller_ready_secs',
+                  'Controller startup time (seconds)'),
+                 ('controller_restart_mode',
+                  'Controller restart mode (cold/warm)'),
+                 ('controller_reset_secs',
+                  'Controller state reset time (seconds)'),
+                 ('controller_gc_count', 'Controller GC collections'),
+                 ('controller_gc_time_ms', 'Controller GC time (ms)'),
+                 ('controller_gc_max_pause_ms',
+                  'Controller GC max pause (ms)'),
+                 ('controller_heap_used_max_bytes',
+                  'Controller max heap used (bytes)'),
+                 ('controller_old_used_max_bytes',
+                  'Controller max old generation used (bytes)'),
+                 ('controller_cluster_size',
+                  'Controller cluster members'),
+                 ('cluster_controller_cpu_user_time',
+                  'Cluster CPU user time (sum of members)'),
+                 ('cluster_controller_cpu_system_time',
+                  'Cluster CPU system time (sum of members)'),
+                 ('cluster_controller_vm_size',
+                  'Cluster VM size (sum of members)'),
+                 ('cluster_used_memory_bytes',
+                  'Cluster used memory (sum of members, bytes)'),
                  ('controller_statistics_period_ms',
                   'Controller statistics period (ms)')], results_json_file)])
         return report_spec_obj
@@ -8,13 +8,17 @@
 SB-Emulator Class- All SB-Emulator-related functionality is here"""
 
 
+import functools
 import json
 import logging
 import os
-import re
 import stress_test.sbemu_exceptions
 import sys
+import threading
+import time
 import traceback
+import util.cmdtimings
+import util.multinet_rest
 import util.netutil
 import util.file_ops
 
@@ -45,6 +49,7 @@ class SBEmu:
         self.clean_hnd = (self.base_dir +
                           test_config['sb_emulator_clean_handler'])
         self._ssh_conn = None
+        self._verified_hnds = set()
         util.file_ops.check_filelist([self.build_hnd,
                                       self.clean_hnd])
 
@@ -65,6 +70,9 @@ class SBEmu:
         """
         name = test_config['sb_emulator_name']
         if (name == 'MTCBENCH'):
+            if len(test_config.get('mtcbench_generator_node_ip_list',
+                                   [])) > 1:
+                return MTCBenchGroup(sb_emu_base_dir, test_config)
             return MTCBench(sb_emu_base_dir, test_config)
         elif (name == 'MULTINET'):
             return Multinet(sb_emu_base_dir, test_config)
@@ -123,9 +131,20 @@ class SBEmu:
         except stress_test.sbemu_exceptions.SBEmuError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    def get_handlers(self):
+        """
+        Returns the handlers of the SB-Emulator
+
+        :returns: full paths of all handlers of the SB-Emulator
+        :rtype: list<str>
+        """
+        return [self.build_hnd, self.clean_hnd]
+
     def build(self):
         """
-        Wrapper to the SB-Emulator build handler
+        Wrapper to the SB-Emulator build handler. After a successful build \
+            the handlers of the SB-Emulator are all checked at once, see \
+            get_handlers().
 
         :raises IOError: if the handler does not exist on the remote host
         :raises emulator_exceptions.SBEmuBuildError: build fails
@@ -133,25 +152,23 @@ class SBEmu:
         logging.info('[SB-Emulator] Building')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.build_hnd]):
-                    raise(IOError(
-                        '{0} build handler does not exist'.
-                        format('[SB-Emulator.build_handler]')))
+                self._verified_hnds.clear()
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.build_hnd], self._verified_hnds, '[SB-Emulator]')
+                exit_status, cmd_output = util.netutil.ssh_run_command(
+                    self._ssh_conn, ' '.join([self.build_hnd]),
+                    '[SB-Emulator.build_handler]')
+                if exit_status == 0:
+                    logging.info("[SB-Emulator] Successful building")
                 else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.build_hnd)
-                    exit_status, cmd_output = util.netutil.ssh_run_command(
-                        self._ssh_conn, ' '.join([self.build_hnd]),
-                        '[SB-Emulator.build_handler]')
-                    if exit_status == 0:
-                        logging.info("[SB-Emulator] Successful building")
-                    else:
-                        raise(stress_test.sbemu_exceptions.SBEmuBuildError(
-                            '[SB-Emulator] Failure during building: {0}'.
-                            format(cmd_output), exit_status))
+                    raise(stress_test.sbemu_exceptions.SBEmuBuildError(
+                        '[SB-Emulator] Failure during building: {0}'.
+                        format(cmd_output), exit_status))
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    self.get_handlers(), self._verified_hnds, '[SB-Emulator]',
+                    required=False)
             except stress_test.sbemu_exceptions.SBEmuError as e:
                 self._error_handling(e.err_msg, e.err_code)
             except:
@@ -169,26 +186,20 @@ class SBEmu:
         logging.info('[SB-Emulator] Cleaning')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.clean_hnd]):
-                    raise(IOError(
-                        '{0} clean handler does not exist'.
-                        format('[SB-Emulator.clean_handler]')))
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.clean_hnd], self._verified_hnds, '[SB-Emulator]')
+                exit_status, cmd_output = util.netutil.ssh_run_command(
+                    self._ssh_conn, self.clean_hnd,
+                    '[SB-Emulator.clean_handler]')
+                self._verified_hnds.clear()
+                if exit_status == 0:
+                    logging.info("[SB-Emulator] Successful clean")
                 else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.clean_hnd)
-                    exit_status, cmd_output = util.netutil.ssh_run_command(
-                        self._ssh_conn, self.clean_hnd,
-                        '[SB-Emulator.clean_handler]')
-                    if exit_status == 0:
-                        logging.info("[SB-Emulator] Successful clean")
-                    else:
-                        raise(stress_test.sbemu_exceptions.
-                              SBEmuCleanupError(
-                                  '[SB-Emulator] Failure during cleaning: {0}'.
-                                  format(cmd_output), exit_status))
+                    raise(stress_test.sbemu_exceptions.
+                          SBEmuCleanupError(
+                              '[SB-Emulator] Failure during cleaning: {0}'.
+                              format(cmd_output), exit_status))
             except stress_test.sbemu_exceptions.SBEmuError as e:
                 self._error_handling(e.err_msg, e.err_code)
             except:
@@ -228,7 +239,7 @@ class MTCBench(SBEmu):
         :type sb_emu_base_dir: str
         :type test_config: JSON configuration dictionary
         """
-        super(self.__class__, self).__init__(sb_emu_base_dir, test_config)
+        super(MTCBench, self).__init__(sb_emu_base_dir, test_config)
 
         self.run_hnd = self.base_dir + test_config['mtcbench_run_handler']
 
@@ -246,6 +257,15 @@ class MTCBench(SBEmu):
         self.ms_per_test = test_config['mtcbench_ms_per_test']
         self.internal_repeats = test_config['mtcbench_internal_repeats']
 
+    def get_handlers(self):
+        """
+        Returns the handlers of the MTCBench SB-Emulator
+
+        :returns: full paths of all handlers of the SB-Emulator
+        :rtype: list<str>
+        """
+        return SBEmu.get_handlers(self) + [self.run_hnd]
+
     def get_topo_bootup_ms(self):
         """
         Calculates and returns the total topology bootup time in ms.
@@ -266,9 +286,18 @@ class MTCBench(SBEmu):
         overall_topo_size = self.threads * self.switches_per_thread
         return overall_topo_size
 
+    def get_generators(self):
+        """
+        Returns the MTCBench instances generating the load
+
+        :returns: the MTCBench objects, one per generator node
+        :rtype: list<MTCBench>
+        """
+        return [self]
+
     def run(self, ctrl_ip, ctrl_sb_port, prefix='[MTCBench.run_handler]',
             lines_queue=None, print_flag=True, block_flag=True,
-            getpty_flag=False):
+            getpty_flag=False, start_time=None):
         """
         Wrapper to the MTCBench SB-Emulator run handler
 
@@ -286,6 +315,10 @@ class MTCBench(SBEmu):
             or saved in a queue.
         :param getpty_flag: defines if the run handler will run in a separate \
             pty terminal
+        :param start_time: if given, the time (of the nstat node) the \
+            handler starts at, so that the runs of several generator nodes \
+            start together. The remaining delay is computed when the command \
+            is sent, so the clocks of the nodes need not be synchronized.
         :type ctrl_ip: str
         :type ctrl_sb_port: int
         :type prefix: str
@@ -293,6 +326,7 @@ class MTCBench(SBEmu):
         :type print_flag: bool
         :type block_flag: bool
         :type getpty_flag: bool
+        :type start_time: float
         :raises IOError: if the exit status of the handler is not 0
         :raises emulator_exceptions.MTCbenchRunError: in case of run MTCbench \
             error
@@ -300,17 +334,15 @@ class MTCBench(SBEmu):
         logging.info('{0} Starting'.format(prefix))
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.run_hnd]):
-                    raise(IOError(
-                        '{0} run handler does not exist'.format(prefix)))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.run_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.run_hnd], self._verified_hnds, '[SB-Emulator]')
+                delay_cmd = ''
+                if start_time is not None:
+                    delay_cmd = 'sleep {0:.3f}; '.format(
+                        max(0, start_time - time.time()))
                 exit_status, cmd_output = util.netutil.ssh_run_command(
-                    self._ssh_conn, ' '.join(
+                    self._ssh_conn, delay_cmd + ' '.join(
                         [self.run_hnd, ctrl_ip, str(ctrl_sb_port),
                          str(self.threads), str(self.switches_per_thread),
                          str(self.threads * self.switches_per_thread),
@@ -335,6 +367,121 @@ class MTCBench(SBEmu):
             self._error_handling(e.err_msg, e.err_code)
 
 
+def _group_wide(method):
+    """
+    Makes an MTCBench method run on all generator nodes of an \
+        MTCBenchGroup at once. Calls made by the thread running the method \
+        on the primary node itself stay on the primary node.
+
+    :param method: the MTCBench method
+    :returns: the group-wide method
+    :rtype: function
+    :type method: function
+    """
+    @functools.wraps(method)
+    def group_wide_method(self, *args):
+        if getattr(self._member_call, 'active', False):
+            return method(self, *args)
+        return self._run_on_generators(method, *args)
+    return group_wide_method
+
+
+class MTCBenchGroup(MTCBench):
+    """
+    MTCBench running on several generator nodes at once against the same \
+        controller, so that the load is not limited by a single generator \
+        node. The object itself is the generator on the first node of \
+        mtcbench_generator_node_ip_list. The other nodes are MTCBench \
+        objects with the same configuration, each one emulating the same \
+        topology, and the build and clean handlers run on all nodes at once.
+    """
+
+    def __init__(self, sb_emu_base_dir, test_config):
+        """
+        Creates the generators of the group
+
+        :param sb_emu_base_dir: emulator base directory
+        :param test_config: JSON input configuration
+        :type sb_emu_base_dir: str
+        :type test_config: JSON configuration dictionary
+        :raises emulator_exceptions.MTCbenchGroupError: if a generator node \
+            is given more than once
+        """
+        # Set only in the thread running a group-wide method on the primary
+        # generator, see _run_on_generators()
+        self._member_call = threading.local()
+        self.peers = []
+        node_ips = test_config['mtcbench_generator_node_ip_list']
+        if len(set(node_ips)) != len(node_ips):
+            raise(stress_test.sbemu_exceptions.MTCbenchGroupError(
+                'Duplicate generator nodes in {0}'.format(node_ips)))
+        node_config = dict(test_config)
+        node_config['sb_emulator_node_ip'] = node_ips[0]
+        MTCBench.__init__(self, sb_emu_base_dir, node_config)
+        for node_ip in node_ips[1:]:
+            node_config = dict(test_config)
+            node_config['sb_emulator_node_ip'] = node_ip
+            self.peers.append(MTCBench(sb_emu_base_dir, node_config))
+
+    def get_generators(self):
+        """
+        Returns the generators of the group, with the dimensions of the \
+            test, which are set on the primary generator, passed to the \
+            other ones
+
+        :returns: the MTCBench objects, the primary one first
+        :rtype: list<MTCBench>
+        """
+        for peer in self.peers:
+            peer.threads = self.threads
+            peer.switches_per_thread = self.switches_per_thread
+            peer.thread_creation_delay_ms = self.thread_creation_delay_ms
+            peer.delay_before_traffic_ms = self.delay_before_traffic_ms
+            peer.simulated_hosts = self.simulated_hosts
+        return [self] + self.peers
+
+    def get_overall_topo_size(self):
+        """
+        Calculates and returns the total topology size of all generators.
+
+        :returns: the total switch number
+        :rtype: int
+        """
+        return MTCBench.get_overall_topo_size(self) * (len(self.peers) + 1)
+
+    def _run_on_generators(self, method, *args):
+        """
+        Runs an MTCBench method on all generators concurrently
+
+        :param method: the MTCBench method
+        :param args: the arguments of the method
+        :returns: the return value of the method on the primary generator
+        :raises emulator_exceptions.MTCbenchGroupError: if the method fails \
+            on any generator
+        """
+        def run_on_primary():
+            self._member_call.active = True
+            try:
+                return method(self, *args)
+            finally:
+                self._member_call.active = False
+        node_tasks = {self.ip: run_on_primary}
+        for peer in self.peers:
+            node_tasks[peer.ip] = functools.partial(method, peer, *args)
+        results = util.netutil.fan_out(node_tasks)
+        failed_nodes = [node_ip for node_ip, result in results.items()
+                        if result[0] != 'ok']
+        if failed_nodes:
+            raise(stress_test.sbemu_exceptions.MTCbenchGroupError(
+                '{0} failed on nodes {1}'.format(method.__name__,
+                                                 failed_nodes)))
+        return results[self.ip][1]
+
+    init_ssh = _group_wide(MTCBench.init_ssh)
+    build = _group_wide(MTCBench.build)
+    clean = _group_wide(MTCBench.clean)
+
+
 class Multinet(SBEmu):
     """
     All South-bound Multinet related functionality is here
@@ -349,23 +496,21 @@ class Multinet(SBEmu):
         :type sb_emu_base_dir: str
         :type test_config: JSON configuration dictionary
         """
-        super(self.__class__, self).__init__(sb_emu_base_dir, test_config)
+        super(Multinet, self).__init__(sb_emu_base_dir, test_config)
         self.deploy_hnd = (self.base_dir +
                            test_config['topology_rest_server_boot'])
         self.cleanup_hnd = (self.base_dir +
                             test_config['topology_rest_server_stop'])
+        # Switches and flows are queried straight from the REST API of the
+        # master, see get_worker_counts()
         self.master_rest_port = test_config['topology_rest_server_port']
 
-        self.get_switches_hnd = (sb_emu_base_dir +
-                                 test_config['topology_get_switches_handler'])
-
         if 'topology_traffic_gen_handler' in test_config:
             self.traffic_gen_hnd = \
                 self.base_dir + test_config['topology_traffic_gen_handler']
 
-        if 'topology_get_flows_handler' in test_config:
-            self.get_flows_hnd = (self.base_dir +
-                                  test_config['topology_get_flows_handler'])
+        # Multinet versions with a get_flows handler serve get_flows
+        self.get_flows_supported = 'topology_get_flows_handler' in test_config
 
         # The parameters initialized as None are dimensions of the test.
         # These values are passed outside, from the test in the main for loop.
@@ -405,6 +550,20 @@ class Multinet(SBEmu):
                                                                "config.json")
         self.venv_hnd = self.base_dir + "bin/venv_handler_master.sh"
 
+    def get_handlers(self):
+        """
+        Returns the handlers of the Multinet SB-Emulator
+
+        :returns: full paths of all handlers of the SB-Emulator
+        :rtype: list<str>
+        """
+        handlers = SBEmu.get_handlers(self) + [
+            self.deploy_hnd, self.cleanup_hnd, self.init_topos_hnd,
+            self.start_topos_hnd, self.stop_topos_hnd]
+        if hasattr(self, 'traffic_gen_hnd'):
+            handlers.append(self.traffic_gen_hnd)
+        return handlers
+
     def get_topo_bootup_ms(self):
         """
         Calculates and returns the total topology bootup time in ms.
@@ -433,9 +592,11 @@ class Multinet(SBEmu):
 
         :param cntrl_of_port: this is the southbound port of the controller,
         where it listens for openflow protocol messages
-        :param cntrl_ip: IP address of controller node
+        :param cntrl_ip: IP address of controller node, or the list of the
+        IP addresses of the members of a controller cluster. The switches of
+        the workers are spread over the members round-robin.
         :type cntrl_of_port: int
-        :type cntrl_ip: str
+        :type cntrl_ip: str or list<str>
         :raises emulator_exceptions.MultinetConfGenerateError: if json
         configuration file generation of multinet fails
         """
@@ -452,7 +613,15 @@ class Multinet(SBEmu):
                 config_data['deploy']['username'] = self.ssh_user
                 config_data['deploy']['password'] = self.ssh_pass
                 config_data['topo'] = {}
-                config_data['topo']['controller_ip_address'] = cntrl_ip
+                if isinstance(cntrl_ip, list):
+                    cntrl_ips = cntrl_ip
+                else:
+                    cntrl_ips = [cntrl_ip]
+                config_data['topo']['controller_ip_address'] = cntrl_ips[0]
+                if len(cntrl_ips) > 1:
+                    config_data['topo']['worker_controller_ip_list'] = \
+                        [cntrl_ips[i % len(cntrl_ips)]
+                         for i in range(len(self.workers_ips))]
                 config_data['topo']['controller_of_port'] = cntrl_of_port
                 config_data['topo']['switch_type'] = self.topo_switch_type
                 config_data['topo']['topo_type'] = self.topo_type
@@ -481,54 +650,29 @@ class Multinet(SBEmu):
         except stress_test.sbemu_exceptions.SBEmuError as e:
             self._error_handling(e.err_msg, e.err_code)
 
-    def __parse_output(self, multinet_handler_name, multinet_output):
+    def get_worker_counts(self, opcode):
         """
-        Gets the console output of a multinet handler and extracts the
-        aggregated result from all workers, as a numeric value.
-        (Helper function)
+        Queries a count from all workers, straight from the REST API of the \
+            Multinet master
 
-        :param multinet_handler_name: The name of multinet handler from which
-        we get the results.
-        :param multinet_output: The console output of multinet handler
-        :returns: The aggregated result from all workers
-        (aggregation function is sum)
-        :rtype: int
-        :type multinet_handler_name: string
-        :type multinet_output: string
-        :raises emulator_exceptions.MultinetOutputParsingError: If the result
-        of the parsed multinet output is None
+        :param opcode: 'get_switches' or 'get_flows'
+        :returns: the count of every worker, keyed by the worker
+        :rtype: dict
+        :type opcode: str
+        :raises IOError: if the request to the Multinet master fails
         """
-        try:
-            try:
-                regex_result = re.search(
-                    r'INFO:root:\[{0}\]\[response data\].*'.
-                    format(multinet_handler_name), multinet_output)
-                if regex_result is None:
-                    raise(stress_test.sbemu_exceptions.MultinetOutputParsingError(
-                        'Failed to get results from {0} multinet handler.'.
-                        format(multinet_handler_name), 2))
-                else:
-                    json_result = regex_result.group(0).replace(
-                        'INFO:root:[{0}][response data] '
-                        .format(multinet_handler_name), '')
-                multinet_result = \
-                    sum([list(json.loads(v).values())[0] for v in json.loads(json_result)])
-                return multinet_result
-            except stress_test.sbemu_exceptions.SBEmuError as e:
-                self._error_handling(e.err_msg, e.err_code)
-            except:
-                raise(
-                    stress_test.sbemu_exceptions.MultinetOutputParsingError)
-        except stress_test.sbemu_exceptions.SBEmuError as e:
-            self._error_handling(e.err_msg, e.err_code)
+        return util.multinet_rest.get_worker_counts(
+            self.ip, self.master_rest_port, opcode)
 
     def deploy(self, cntrl_ip, cntrl_of_port):
         """
         Wrapper to the Multinet SB-Emulator deploy handler
 
-        :param cntrl_ip: The IP of the Controller.
+        :param cntrl_ip: The IP of the Controller, or the IPs of the members \
+            of a controller cluster. Each worker connects its switches to \
+            one member, round-robin.
         :param cntrl_of_port: The openflow interface port of the Controller
-        :type cntrl_ip: str
+        :type cntrl_ip: str or list<str>
         :type cntrl_of_port: int
         :raises IOError: if the handler does not exist on the remote host
         :raises emulator_exceptions.MultinetDeployError: in case of Multinet \
@@ -543,15 +687,9 @@ class Multinet(SBEmu):
                     self.__multinet_config_file_local_path,
                     self.__multinet_config_file_remote_path)
 
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.deploy_hnd]):
-                    raise(IOError(
-                        '[Multinet] Deploy handler does not exist'))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.deploy_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.deploy_hnd], self._verified_hnds, '[SB-Emulator]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, ' '.join(
                         [self.venv_hnd, self.base_dir, self.deploy_hnd,
@@ -570,49 +708,33 @@ class Multinet(SBEmu):
         except stress_test.sbemu_exceptions.SBEmuError as e:
             self._error_handling(e.err_msg, e.err_code)
 
-    def get_switches(self, new_ssh_conn=None):
+    @util.cmdtimings.measurement
+    def get_switches(self, per_worker=False):
         """
-        Wrapper to the Multinet SB-Emulator get_switches handler
+        Returns the number of switches of all workers, queried from the REST \
+            API of the Multinet master
 
-        :param new_ssh_conn: an SSH client connection object
-        :returns: The per worker number of switches in json string
-        :rtype: strcleanup_hnd
-        :type new_ssh_conn: paramiko.SFTPClient
-        :raises IOError: if the handler does not exist on the remote host
-        :raises emulator_exceptions.MultinetGetSwitchesError: if handler \
-            fails to run successfully and return a valid result
+        :param per_worker: return the number of switches of every worker \
+            instead of the total
+        :returns: The total number of switches of the workers, or the number \
+            of switches of every worker keyed by the worker
+        :rtype: int or dict
+        :type per_worker: bool
+        :raises emulator_exceptions.MultinetGetSwitchesError: if the Multinet \
+            master fails to return a valid result
         """
         logging.info('[Multinet] get_switches')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.get_switches_hnd]):
-                    raise(IOError(
-                        '[Multinet] Get_switches handler does not exist'))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.get_switches_hnd)
-                if new_ssh_conn is not None:
-                    used_ssh_conn = new_ssh_conn
-                else:
-                    used_ssh_conn = self._ssh_conn
-                exit_status, cmd_output = util.netutil.ssh_run_command(
-                    used_ssh_conn, ' '.join(
-                        [self.venv_hnd, self.base_dir, self.get_switches_hnd,
-                         self.__multinet_config_file_remote_path]),
-                    '[Multinet.get_switches_hnd]')
-                if new_ssh_conn is not None:
-                    used_ssh_conn.close()
-                if exit_status == 0:
-                    logging.info("[Multinet] Successful got switches")
-                    return self.__parse_output('get_switches_topology_handler',
-                                               cmd_output)
-                else:
-                    raise(stress_test.sbemu_exceptions.MultinetGetSwitchesError(
-                        '[Multinet] Failure during getting switches: {0}'.
-                        format(cmd_output), exit_status))
+                worker_switches = self.get_worker_counts('get_switches')
+                logging.info("[Multinet] Successful got switches")
+                if per_worker:
+                    return worker_switches
+                return sum(worker_switches.values())
+            except IOError as e:
+                raise(stress_test.sbemu_exceptions.MultinetGetSwitchesError(
+                    '[Multinet] Failure during getting switches: {0}'.
+                    format(e), 2))
             except stress_test.sbemu_exceptions.SBEmuError as e:
                 self._error_handling(e.err_msg, e.err_code)
             except:
@@ -620,50 +742,33 @@ class Multinet(SBEmu):
         except stress_test.sbemu_exceptions.SBEmuError as e:
             self._error_handling(e.err_msg, e.err_code)
 
-    def get_flows(self, new_ssh_conn=None):
+    @util.cmdtimings.measurement
+    def get_flows(self, per_worker=False):
         """
-        Wrapper to the Multinet SB-Emulator get_flows handler
+        Returns the number of flows installed on the switches of all \
+            workers, queried from the REST API of the Multinet master
 
-        :param new_ssh_conn: an SSH client connection object
-        :returns: The per worker total number of flows in json string
-        :rtype: str
-        :type new_ssh_conn: paramiko.SFTPClient
-        :raises IOError: if the handler does not exist on the remote host
-        :raises emulator_exceptions.MultinetGetFlowsError: if handler fails to
-            run successfully
+        :param per_worker: return the number of flows of every worker \
+            instead of the total
+        :returns: The total number of flows of the workers, or the number \
+            of flows of every worker keyed by the worker
+        :rtype: int or dict
+        :type per_worker: bool
+        :raises emulator_exceptions.MultinetGetFlowsError: if the Multinet \
+            master fails to return a valid result
         """
         logging.info('[Multinet] get_flows')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.get_flows_hnd]):
-                    raise(IOError(
-                        '[Multinet] Get_flows handler does not exist'))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.get_flows_hnd)
-                if new_ssh_conn is not None:
-                    used_ssh_conn = new_ssh_conn
-                else:
-                    used_ssh_conn = self._ssh_conn
-                exit_status, cmd_output = util.netutil.ssh_run_command(
-                    self._ssh_conn, ' '.join(
-                        [self.venv_hnd, self.base_dir,
-                         self.get_flows_hnd,
-                         self.__multinet_config_file_remote_path]),
-                    '[Multinet. get_flows_hnd]')
-                if new_ssh_conn is not None:
-                    used_ssh_conn.close()
-                if exit_status == 0:
-                    logging.info("[Multinet] Successful got flows")
-                    return self.__parse_output('get_flows_topology_handler',
-                                               cmd_output)
-                else:
-                    raise(stress_test.sbemu_exceptions.MultinetGetFlowsError(
-                        '[Multinet] Failure during getting flows: {0}'.
-                        format(cmd_output), exit_status))
+                worker_flows = self.get_worker_counts('get_flows')
+                logging.info("[Multinet] Successful got flows")
+                if per_worker:
+                    return worker_flows
+                return sum(worker_flows.values())
+            except IOError as e:
+                raise(stress_test.sbemu_exceptions.MultinetGetFlowsError(
+                    '[Multinet] Failure during getting flows: {0}'.
+                    format(e), 2))
             except stress_test.sbemu_exceptions.SBEmuError as e:
                 self._error_handling(e.err_msg, e.err_code)
             except:
@@ -671,6 +776,54 @@ class Multinet(SBEmu):
         except stress_test.sbemu_exceptions.SBEmuError as e:
             self._error_handling(e.err_msg, e.err_code)
 
+    def get_topology_snapshot(self):
+        """
+        Takes a consistent snapshot of the Multinet topology: the number of \
+            switches and flows of all workers, queried concurrently from the \
+            REST API of the Multinet master.
+
+        :returns: dictionary with the number of switches and flows (flows \
+            only if the get_flows handler is configured, i.e. the Multinet \
+            version supports it), their breakdown per worker \
+            ('worker_switches', 'worker_flows'), the timestamp of the \
+            snapshot and the time taken to read it ('read_time_secs')
+        :rtype: dict
+        :raises emulator_exceptions.MultinetGetTopologySnapshotError: if the \
+            Multinet master fails to return a valid result
+        """
+        logging.info('[Multinet] get_topology_snapshot')
+        try:
+            try:
+                queries = {'switches': 'get_switches'}
+                if self.get_flows_supported:
+                    queries['flows'] = 'get_flows'
+                t_start = time.time()
+                results = util.netutil.fan_out(
+                    dict((key, functools.partial(self.get_worker_counts,
+                                                 opcode))
+                         for key, opcode in queries.items()),
+                    max_concurrency=len(queries))
+                t_end = time.time()
+                snapshot = {'timestamp': (t_start + t_end) / 2,
+                            'read_time_secs': t_end - t_start}
+                for key, (status, value) in results.items():
+                    if status != 'ok':
+                        raise(stress_test.sbemu_exceptions.
+                              MultinetGetTopologySnapshotError(
+                                  '[Multinet] Failure during getting '
+                                  'topology snapshot: {0}'.format(value), 2))
+                    snapshot[key] = sum(value.values())
+                    snapshot['worker_' + key] = value
+                logging.info("[Multinet] Successful got topology snapshot")
+                return snapshot
+            except stress_test.sbemu_exceptions.SBEmuError as e:
+                self._error_handling(e.err_msg, e.err_code)
+            except:
+                raise(stress_test.sbemu_exceptions.
+                      MultinetGetTopologySnapshotError)
+        except stress_test.sbemu_exceptions.SBEmuError as e:
+            self._error_handling(e.err_msg, e.err_code)
+
     def init_topos(self):
         """
         Wrapper to the Multinet SB-Emulator init_topos handler
@@ -682,15 +835,10 @@ class Multinet(SBEmu):
         logging.info('[Multinet] init_topos')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.init_topos_hnd]):
-                    raise(IOError(
-                        '[Multinet] Init_topos handler does not exist'))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.init_topos_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.init_topos_hnd], self._verified_hnds,
+                    '[SB-Emulator]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, ' '.join(
                         [self.venv_hnd, self.base_dir, self.init_topos_hnd,
@@ -721,15 +869,10 @@ class Multinet(SBEmu):
         logging.info('[Multinet] start_topos')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.start_topos_hnd]):
-                    raise(IOError(
-                        '[Multinet] Start_topos handler does not exist'))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.start_topos_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.start_topos_hnd], self._verified_hnds,
+                    '[SB-Emulator]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, ' '.join(
                         [self.venv_hnd, self.base_dir, self.start_topos_hnd,
@@ -760,15 +903,10 @@ class Multinet(SBEmu):
         logging.info('[Multinet] stop_topos')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.stop_topos_hnd]):
-                    raise(IOError(
-                        '[Multinet] Stop_topos handler does not exist'))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.stop_topos_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.stop_topos_hnd], self._verified_hnds,
+                    '[SB-Emulator]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, ' '.join(
                         [self.venv_hnd, self.base_dir, self.stop_topos_hnd,
@@ -798,15 +936,9 @@ class Multinet(SBEmu):
         logging.info('[Multinet] cleanup')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.cleanup_hnd]):
-                    raise(IOError(
-                        '[Multinet] Cleanup handler does not exist'))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.cleanup_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.cleanup_hnd], self._verified_hnds, '[SB-Emulator]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, ' '.join(
                         [self.venv_hnd, self.base_dir, self.cleanup_hnd,
@@ -837,15 +969,10 @@ class Multinet(SBEmu):
         logging.info('[Multinet] traffic gen')
         try:
             try:
-                if not util.netutil.isfile(self.ip, self.ssh_port,
-                                           self.ssh_user, self.ssh_pass,
-                                           [self.traffic_gen_hnd]):
-                    raise(IOError('[Multinet] Traffic_generator handler '
-                                  'does not exist'))
-                else:
-                    util.netutil.make_remote_file_executable(
-                        self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
-                        self.traffic_gen_hnd)
+                util.netutil.verify_handlers(
+                    self.ip, self.ssh_port, self.ssh_user, self.ssh_pass,
+                    [self.traffic_gen_hnd], self._verified_hnds,
+                    '[SB-Emulator]')
                 exit_status, cmd_output = util.netutil.ssh_run_command(
                     self._ssh_conn, ' '.join(
                         [self.venv_hnd, self.base_dir, self.traffic_gen_hnd,
@@ -877,4 +1004,4 @@ class Multinet(SBEmu):
         except Exception as e:
             logging.info('Fail cleaning Multinet during '
                          'cleanup. Exception message: {0}'.format(e))
-        super(self.__class__, self).__del__()
+        super(Multinet, self).__del__()
@@ -103,6 +103,25 @@ class MTCbenchRunError(SBEmuError):
                             format(additional_error_info), err_code)
 
 
+class MTCbenchGroupError(SBEmuError):
+    """
+    Contains the exception handling concerning the South-Bound MTCbench
+    generator group functionality.
+    """
+    def __init__(self, additional_error_info='', err_code=1):
+        """
+        MTCbench fail on a node of a generator group error.
+
+        :param additional_error_info: the general error message.
+        :param err_code: the specific error code.
+        :type str
+        :type int
+        """
+        SBEmuError.__init__(self, 'Error occurred on MTCbench generator '
+                            'nodes. {0}'.format(additional_error_info),
+                            err_code)
+
+
 class MultinetConfGenerateError(SBEmuError):
     """
     Contains the exception handling concerning the South-Bound Emulator
@@ -231,6 +250,24 @@ class MultinetGetFlowsError(SBEmuError):
                             err_code)
 
 
+class MultinetGetTopologySnapshotError(SBEmuError):
+    """
+    Contains the exception handling concerning the combined switches and
+    flows snapshot of the South-Bound Emulator topology
+    """
+    def __init__(self, additional_error_info='', err_code=1):
+        """
+        Fail to get the switches and flows snapshot of multinet topology.
+
+        :param additional_error_info: the general error message.
+        :param err_code: the specific error code.
+        :type str
+        :type int
+        """
+        SBEmuError.__init__(self, 'Fail to get multinet topology snapshot.'
+                            ' {0}'.format(additional_error_info), err_code)
+
+
 class MultinetTraffigGenError(SBEmuError):
     """
     Contains the exception handling concerning the South-Bound Multinet
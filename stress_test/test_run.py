@@ -13,12 +13,17 @@ import logging
 import stress_test.controller
 import stress_test.controller_exceptions
 import stress_test.sbemu
+import stress_test.sbemu_exceptions
 import stress_test.monitor
 import stress_test.nbemu
 import stress_test.oftraf
+import stress_test.gc_sampler
+import stress_test.log_collector
+import stress_test.proc_sampler
 import sys
 import time
 import util.file_ops
+import util.netutil
 
 
 class TestRun:
@@ -38,30 +43,35 @@ class TestRun:
         :type json_conf:
         :type test_type: str
         """
-        # CONTROLLER preparation
-        # ----------------------------------------------------------------------
-        self.ctrl = stress_test.controller.Controller.new(args.ctrl_base_dir,
-                                                          json_conf)
-        self.ctrl.getcontroller()
-        self.ctrl.generate_xmls()
-
-        # SB EMULATOR preparation
+        # CONTROLLER, SB EMULATOR and NB EMULATOR preparation
         # ----------------------------------------------------------------------
+        # The preparation steps of each component run on its own node and do
+        # not depend on each other, so they run concurrently.
         self.sb_emu = stress_test.sbemu.SBEmu.new(args.sb_emu_base_dir,
                                                   json_conf)
-        self.sb_emu.init_ssh()
-        self.sb_emu.build()
-
-        # NB EMULATOR preparation
+        preparation_tasks = {
+            'controller': lambda: self._prepare_controller(args, json_conf),
+            'sb_emulator': self._prepare_sb_emu}
+        if 'nb_emulator_name' in json_conf:
+            # The controller object is created by the concurrent controller
+            # preparation, it is passed to the NB-Generator afterwards.
+            self.nb_emu = stress_test.nbemu.NBgen(args.nb_emu_base_dir,
+                                                  json_conf, None,
+                                                  self.sb_emu)
+            preparation_tasks['nb_emulator'] = self._prepare_nb_emu
+        preparation_results = util.netutil.fan_out(preparation_tasks)
+        for component in ['controller', 'sb_emulator', 'nb_emulator']:
+            if component in preparation_results:
+                status, value = preparation_results[component]
+                if status != 'ok':
+                    logging.error('[TestRun] Preparation of {0} failed.'.
+                                  format(component))
+                    raise(value)
+
+        # NB EMULATOR monitor preparation
         # ----------------------------------------------------------------------
         if 'nb_emulator_name' in json_conf:
-                self.nb_emu = stress_test.nbemu.NBgen(
-                    args.nb_emu_base_dir,
-                    json_conf,
-                    self.ctrl,
-                    self.sb_emu)
-                self.nb_emu.init_ssh()
-                self.nb_emu.build()
+                self.nb_emu.controller = self.ctrl
 
                 # MONITOR objects for NB-EMULATOR
                 # --------------------------------------------------------------
@@ -86,11 +96,75 @@ class TestRun:
         else:
             pass
 
+        # High-frequency SAMPLING of the controller process
+        # ---------------------------------------------------------------------
+        if 'proc_sampler_rate_hz' in json_conf and hasattr(self, 'mon'):
+            self.mon.proc_sampler = stress_test.proc_sampler.ProcSampler(
+                self.ctrl, json_conf)
+
+        # GC SAMPLING of the controller JVM
+        # ---------------------------------------------------------------------
+        if 'gc_sampler_period_ms' in json_conf and hasattr(self, 'mon'):
+            self.mon.gc_sampler = stress_test.gc_sampler.GcSampler(
+                self.ctrl, json_conf)
+
+        # Incremental COLLECTION of the controller log
+        # ---------------------------------------------------------------------
+        self.log_collector = None
+        if 'log_collector_period_ms' in json_conf and hasattr(self, 'mon'):
+            self.log_collector = stress_test.log_collector.LogCollector(
+                self.ctrl, self.mon, json_conf, args.output_dir)
+            self.mon.log_collector = self.log_collector
+            self.log_collector.start()
+
         self.total_samples = []
         self.test_type = test_type
         self.json_conf = json_conf
         self.args = args
 
+    def _prepare_controller(self, args, json_conf):
+        """
+        Creates the controller object, gets the controller and generates its \
+            XML files
+
+        :param args: command line arguments
+        :param json_conf: JSON configuration dictionary
+        :type args: argparse.Namespace
+        :type json_conf: dict
+        """
+        self.ctrl = stress_test.controller.Controller.new(args.ctrl_base_dir,
+                                                          json_conf)
+        self.ctrl.getcontroller()
+        self.ctrl.generate_xmls()
+
+    def save_controller_log(self, output_dir):
+        """
+        Saves the controller logs. If the controller log is collected \
+            incrementally, its collection is completed instead of copying the \
+            logs directory.
+
+        :param output_dir: directory to store output files
+        :type output_dir: str
+        """
+        if self.log_collector is not None:
+            self.log_collector.stop()
+        else:
+            self.ctrl.save_log(output_dir)
+
+    def _prepare_sb_emu(self):
+        """
+        Connects to the SB-Emulator node and builds the SB-Emulator
+        """
+        self.sb_emu.init_ssh()
+        self.sb_emu.build()
+
+    def _prepare_nb_emu(self):
+        """
+        Connects to the NB-Generator node and builds the NB-Generator
+        """
+        self.nb_emu.init_ssh()
+        self.nb_emu.build()
+
     def sb_active_stability_mtcbench_run(self,
                                          json_conf,
                                          json_output,
@@ -129,20 +203,20 @@ class TestRun:
                 self.mon.global_sample_id = global_sample_id
                 self.mon.repeat_id = repeat_id
                 self.mon.test_repeats = json_conf['test_repeats']
-                logging.info('[{0}] Changing controller statistics period to'
-                             ' {1} ms'.format(self.test_type,
-                                              self.ctrl.stat_period_ms))
-                self.ctrl.change_stats()
+                logging.info('[{0}] Applying controller configuration, '
+                             'statistics period {1} ms'.
+                             format(self.test_type, self.ctrl.stat_period_ms))
+                self.ctrl.apply_config()
                 logging.info('[{0}] Starting controller'.
                              format(self.test_type))
-                self.ctrl.start()
+                self.ctrl.sweep_point_start()
                 logging.info('[{0}] Starting MTCbench active switches '
                              'topology and monitor thread'.
                              format(self.test_type))
                 self.total_samples += self.mon.monitor_run()
                 logging.info('[{0}] Stopping controller'.
                              format(self.test_type))
-                self.ctrl.stop()
+                self.ctrl.sweep_point_stop()
                 global_sample_id = \
                     self.total_samples[-1]['global_sample_id'] + 1
             logging.info('[Testing] All done!')
@@ -152,7 +226,7 @@ class TestRun:
             try:
                 logging.info('[{0}] Save controller logs'.
                              format(self.test_type))
-                self.ctrl.save_log(output_dir)
+                self.save_controller_log(output_dir)
             except:
                 logging.error('[{0}] Fail to save controller logs'.
                               format(self.test_type))
@@ -210,20 +284,20 @@ class TestRun:
                 self.mon.global_sample_id = global_sample_id
                 self.mon.repeat_id = repeat_id
                 self.mon.test_repeats = json_conf['test_repeats']
-                logging.info('[{0}] Changing controller statistics period to'
-                             ' {1} ms'.format(self.test_type,
-                                              self.ctrl.stat_period_ms))
-                self.ctrl.change_stats()
+                logging.info('[{0}] Applying controller configuration, '
+                             'statistics period {1} ms'.
+                             format(self.test_type, self.ctrl.stat_period_ms))
+                self.ctrl.apply_config()
                 logging.info('[{0}] Starting controller'.
                              format(self.test_type))
-                self.ctrl.start()
+                self.ctrl.sweep_point_start()
                 logging.info('[{0}] Starting MTCbench active switches '
                              'topology and monitor thread'.
                              format(self.test_type))
                 self.total_samples += self.mon.monitor_run()
                 logging.info('[{0}] Stopping controller'.
                              format(self.test_type))
-                self.ctrl.stop()
+                self.ctrl.sweep_point_stop()
                 global_sample_id = \
                     self.total_samples[-1]['global_sample_id'] + 1
             logging.info('[Testing] All done!')
@@ -233,7 +307,7 @@ class TestRun:
             try:
                 logging.info('[{0}] Save controller logs'.
                              format(self.test_type))
-                self.ctrl.save_log(output_dir)
+                self.save_controller_log(output_dir)
             except:
                 logging.error('[{0}] Fail to save controller logs'.
                               format(self.test_type))
@@ -282,19 +356,19 @@ class TestRun:
                      json_conf['mtcbench_simulated_hosts'],
                      json_conf['controller_statistics_period_ms']):
                 self.mon.global_sample_id = global_sample_id
-                logging.info('{0} Changing controller statistics period '
-                             'to {1} ms'.
+                logging.info('{0} Applying controller configuration, '
+                             'statistics period {1} ms'.
                              format(self.test_type, self.ctrl.stat_period_ms))
-                self.ctrl.change_stats()
+                self.ctrl.apply_config()
                 logging.info('{0} Starting controller'.format(self.test_type))
-                self.ctrl.start()
+                self.ctrl.sweep_point_start()
                 logging.info('{0} Starting MTCbench idle switches topology and'
                              ' monitor thread'.format(self.test_type))
                 topo_start_timestamp = time.time()
                 self.total_samples += self.mon.monitor_run(
                     topo_start_timestamp)
                 logging.info('{0} Stopping controller'.format(self.test_type))
-                self.ctrl.stop()
+                self.ctrl.sweep_point_stop()
                 global_sample_id = \
                     self.total_samples[-1]['global_sample_id'] + 1
             logging.info('[Testing] All done!')
@@ -304,7 +378,7 @@ class TestRun:
             try:
                 logging.info('[{0}] Save controller logs'.
                              format(self.test_type))
-                self.ctrl.save_log(output_dir)
+                self.save_controller_log(output_dir)
             except:
                 logging.error('[{0}] Fail to save controller logs'.
                               format(self.test_type))
@@ -365,9 +439,10 @@ class TestRun:
                     json_conf['controller_statistics_period_ms']):
                 self.mon.global_sample_id = global_sample_id
                 self.ctrl.check_status()
-                self.ctrl.start()
+                self.ctrl.sweep_point_start()
                 self.of.start()
-                self.sb_emu.deploy(self.ctrl.ip, self.ctrl.of_port)
+                self.sb_emu.deploy(self.ctrl.get_member_ips(),
+                                   self.ctrl.of_port)
                 logging.info('[sb_active_scalability_multinet] '
                              'Generate multinet config file')
                 self.sb_emu.init_topos()
@@ -388,7 +463,7 @@ class TestRun:
                 self.total_samples += self.mon.monitor_run()
 
                 self.of.stop()
-                self.ctrl.stop()
+                self.ctrl.sweep_point_stop()
                 self.sb_emu.stop_topos()
                 self.sb_emu.cleanup()
                 global_sample_id += 1
@@ -422,7 +497,7 @@ class TestRun:
             try:
                 logging.info('[{0}] Save controller logs'.
                              format(self.test_type))
-                self.ctrl.save_log(output_dir)
+                self.save_controller_log(output_dir)
             except:
                 logging.error('[{0}] Fail to save controller logs'.
                               format(self.test_type))
@@ -475,9 +550,10 @@ class TestRun:
                                                   'period_ms']):
                 self.mon.global_sample_id = global_sample_id
                 self.ctrl.check_status()
-                self.ctrl.change_stats()
-                self.ctrl.start()
-                self.sb_emu.deploy(self.ctrl.ip, self.ctrl.of_port)
+                self.ctrl.apply_config()
+                self.ctrl.sweep_point_start()
+                self.sb_emu.deploy(self.ctrl.get_member_ips(),
+                                   self.ctrl.of_port)
                 logging.info("{0} Starting Multinet idle switches topology".
                              format(self.test_type))
                 self.sb_emu.init_topos()
@@ -491,7 +567,7 @@ class TestRun:
                 self.total_samples += \
                     self.mon.monitor_run(boot_start_time=topo_start_timestamp)
 
-                self.ctrl.stop()
+                self.ctrl.sweep_point_stop()
                 self.sb_emu.stop_topos()
                 self.sb_emu.cleanup()
 
@@ -521,7 +597,7 @@ class TestRun:
             try:
                 logging.info('[{0}] Save controller logs'.
                              format(self.test_type))
-                self.ctrl.save_log(output_dir)
+                self.save_controller_log(output_dir)
             except:
                 logging.error('[{0}] Fail to save controller logs'.
                               format(self.test_type))
@@ -574,9 +650,10 @@ class TestRun:
             self.ctrl.stat_period_ms = json_conf['controller_statistics_'
                                                  'period_ms']
             self.ctrl.check_status()
-            self.ctrl.change_stats()
+            self.ctrl.apply_config()
             self.ctrl.start()
-            self.sb_emu.deploy(self.ctrl.ip, self.ctrl.of_port)
+            self.sb_emu.deploy(self.ctrl.get_member_ips(),
+                               self.ctrl.of_port)
             self.sb_emu.init_topos()
             self.sb_emu.start_topos()
 
@@ -643,7 +720,7 @@ class TestRun:
             try:
                 logging.info('[{0}] Save controller logs'.
                              format(self.test_type))
-                self.ctrl.save_log(output_dir)
+                self.save_controller_log(output_dir)
             except:
                 logging.error('[{0}] Fail to save controller logs'.
                               format(self.test_type))
@@ -707,8 +784,9 @@ class TestRun:
                 self.mon.global_sample_id = global_sample_id
 
                 self.ctrl.check_status()
-                self.ctrl.start()
-                self.sb_emu.deploy(self.ctrl.ip, self.ctrl.of_port)
+                self.ctrl.sweep_point_start()
+                self.sb_emu.deploy(self.ctrl.get_member_ips(),
+                                   self.ctrl.of_port)
                 logging.info('[sb_active_scalability_multinet] '
                              'Generate multinet config file')
                 self.sb_emu.init_topos()
@@ -719,13 +797,21 @@ class TestRun:
                     raise(stress_test.controller_exceptions.CtrlError(
                         'Controller process crashed during multinet topology '
                         'start.'))
+                # One consistent snapshot per side, for both the initial
+                # flows check and the topology confirmation
+                topo_snapshot = self.sb_emu.get_topology_snapshot()
+                oper_ds_snapshot = self.ctrl.get_oper_snapshot()
+                if 'flows' not in topo_snapshot:
+                    raise(stress_test.sbemu_exceptions.MultinetGetFlowsError(
+                        'The get_flows handler of Multinet is required to '
+                        'count the installed flows.'))
                 logging.info("The whole number of switches are: {0}"
-                             .format(self.sb_emu.get_switches()))
+                             .format(topo_snapshot['switches']))
                 logging.info("The whole number of flows are: {0}"
-                             .format(self.sb_emu.get_flows()))
+                             .format(topo_snapshot['flows']))
 
-                initial_topo_flows = self.sb_emu.get_flows()
-                initial_oper_ds_flows = self.ctrl.get_oper_flows()
+                initial_topo_flows = topo_snapshot['flows']
+                initial_oper_ds_flows = oper_ds_snapshot['flows']
                 logging.info("initial_operational_ds_flows: {0}".
                              format(initial_oper_ds_flows))
                 if (initial_oper_ds_flows != 0 or initial_topo_flows != 0):
@@ -734,10 +820,10 @@ class TestRun:
 
                 tries = 0
                 num_tries = 3
-                while tries < num_tries:
+                while True:
                     expected_switches = self.sb_emu.get_overall_topo_size()
-                    discovered_switches = self.sb_emu.get_switches()
-                    ds_switches = self.ctrl.get_oper_switches()
+                    discovered_switches = topo_snapshot['switches']
+                    ds_switches = oper_ds_snapshot['switches']
                     if discovered_switches == expected_switches and \
                         ds_switches == expected_switches and \
                             expected_switches != 0:
@@ -749,7 +835,8 @@ class TestRun:
                                      'within the distributed topologies'.
                                      format(discovered_switches))
                         break
-                    elif tries == num_tries:
+                    tries += 1
+                    if tries == num_tries:
                         raise Exception('Topology did not fully '
                                         'initialize. Expected {0} '
                                         'switches, but found {1} at the '
@@ -758,9 +845,9 @@ class TestRun:
                                         format(expected_switches,
                                                discovered_switches,
                                                ds_switches))
-                    else:
-                        continue
-                    tries += 1
+                    time.sleep(10)
+                    topo_snapshot = self.sb_emu.get_topology_snapshot()
+                    oper_ds_snapshot = self.ctrl.get_oper_snapshot()
 
                 failed_flows_add = 0
                 failed_flows_del = 0
@@ -820,7 +907,7 @@ class TestRun:
                             expected_flows,
                             self.nb_emu.flow_delete_flag)
 
-                self.ctrl.stop()
+                self.ctrl.sweep_point_stop()
                 self.sb_emu.stop_topos()
                 self.sb_emu.cleanup()
                 results = util.file_ops.merge_dict_and_avg(result_metrics_add,
@@ -857,7 +944,7 @@ class TestRun:
             try:
                 logging.info('[{0}] Save controller logs'.
                              format(self.test_type))
-                self.ctrl.save_log(output_dir)
+                self.save_controller_log(output_dir)
             except:
                 logging.error('[{0}] Fail to save controller logs'.
                               format(self.test_type))
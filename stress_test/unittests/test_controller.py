@@ -0,0 +1,228 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for stress_test/controller.py."""
+
+import gc
+import json
+import logging
+import os
+import stress_test.controller
+import stress_test.controller_exceptions
+import sys
+import threading
+import unittest
+import unittest.mock
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+NSTAT_BASE_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), os.pardir, os.pardir))
+ODL_BASE_DIR = os.path.join(NSTAT_BASE_DIR, 'controllers', 'odl_boron_pb',
+                            '')
+ODL_CONF = os.path.join(NSTAT_BASE_DIR, 'stress_test', 'sample_test_confs',
+                        'boron', 'boron_sb_idle_scalability_multinet.json')
+MEMBER_IPS = ['10.0.1.11', '10.0.1.21', '10.0.1.31']
+ONOS_BASE_DIR = os.path.join(NSTAT_BASE_DIR, 'controllers', 'onos_pb', '')
+ONOS_CONF = os.path.join(NSTAT_BASE_DIR, 'stress_test', 'sample_test_confs',
+                         'onos', 'onos_sb_idle_scalability_multinet.json')
+
+
+def odl_cluster_config(member_ips):
+    """
+    Returns the sample ODL configuration, with a list of cluster members
+
+    :param member_ips: the cluster members
+    :returns: the test configuration
+    :rtype: dict
+    :type member_ips: list<str>
+    """
+    with open(ODL_CONF) as conf_file:
+        test_config = json.load(conf_file)
+    test_config['controller_cluster_members'] = member_ips
+    return test_config
+
+
+class ODLClusterTest(unittest.TestCase):
+    """Unittests for the ODL cluster of stress_test/controller.py. The
+    methods running on the controller nodes are replaced by recorders.
+    """
+
+    def setUp(self):
+        """Creates a cluster of three members
+        """
+        self.calls = []
+        self.failing_members = []
+        odl = stress_test.controller.ODL
+        odl_cluster = stress_test.controller.ODLCluster
+        self.patches = [
+            unittest.mock.patch.object(odl, 'init_ssh',
+                                       self.recorder('init_ssh')),
+            unittest.mock.patch.object(odl, 'build', self.recorder('build')),
+            unittest.mock.patch.object(odl, 'apply_config',
+                                       self.recorder('apply_config')),
+            unittest.mock.patch.object(
+                odl_cluster, 'build',
+                stress_test.controller._cluster_wide(self.recorder('build'))),
+            unittest.mock.patch.object(
+                odl_cluster, 'apply_config',
+                stress_test.controller._cluster_wide(
+                    self.recorder('apply_config')))]
+        # Keeps the destruction of the members off the nodes
+        for name in ['stop', 'cleanup']:
+            self.patches += [
+                unittest.mock.patch.object(odl, name, lambda self: None),
+                unittest.mock.patch.object(odl_cluster, name,
+                                           lambda self: None)]
+        for patch in self.patches:
+            patch.start()
+        self.cluster = stress_test.controller.Controller.new(
+            ODL_BASE_DIR, odl_cluster_config(MEMBER_IPS))
+
+    def tearDown(self):
+        """Destroys the cluster
+        """
+        del self.cluster
+        gc.collect()
+        for patch in self.patches:
+            patch.stop()
+
+    def recorder(self, name):
+        """
+        Returns a method that records its calls, and fails on the members \
+            of self.failing_members
+
+        :param name: the name of the recorded method
+        :returns: the recording method
+        :rtype: function
+        :type name: str
+        """
+        def recording_method(controller, *args):
+            if controller.ip in self.failing_members:
+                raise IOError('{0} failed'.format(name))
+            self.calls.append((name, controller.ip))
+        return recording_method
+
+    def test_new(self):
+        """Controller.new() creates a cluster whose members were built and
+        configured once, each one on its own node
+        """
+        self.assertIsInstance(self.cluster,
+                              stress_test.controller.ODLCluster)
+        self.assertEqual([member.ip for member in
+                          self.cluster.get_members()], MEMBER_IPS)
+        for name in ['init_ssh', 'build', 'apply_config']:
+            self.assertEqual(sorted(ip for call, ip in self.calls
+                                    if call == name), MEMBER_IPS)
+
+    def test_member_failure(self):
+        """The creation of a cluster fails if a member fails to build
+        """
+        self.failing_members = [MEMBER_IPS[2]]
+        with self.assertRaises(
+                stress_test.controller_exceptions.ODLClusterMemberError):
+            stress_test.controller.ODLCluster(ODL_BASE_DIR,
+                                              odl_cluster_config(MEMBER_IPS))
+
+    def test_cluster_wide_calls(self):
+        """Cluster-wide methods pass the dimensions of the test to all
+        members. Calls from the thread running a method on the primary
+        member stay on it, calls from other threads run on all members.
+        """
+        self.calls = []
+        self.cluster.stat_period_ms = 5000
+        self.cluster.apply_config()
+        self.assertEqual(sorted(ip for call, ip in self.calls), MEMBER_IPS)
+        self.assertEqual([member.stat_period_ms for member in
+                          self.cluster.get_members()], [5000] * 3)
+
+        self.calls = []
+        record = stress_test.controller._cluster_wide(self.recorder('probe'))
+        primary_running = threading.Event()
+        other_call_done = threading.Event()
+
+        def hold_primary(controller):
+            if controller is self.cluster:
+                record(controller)
+                primary_running.set()
+                other_call_done.wait(5)
+
+        thread = threading.Thread(
+            target=stress_test.controller._cluster_wide(hold_primary),
+            args=(self.cluster,))
+        thread.start()
+        self.assertTrue(primary_running.wait(5))
+        record(self.cluster)
+        other_call_done.set()
+        thread.join()
+        self.assertEqual(sorted(ip for call, ip in self.calls),
+                         sorted(MEMBER_IPS + [MEMBER_IPS[0]]))
+
+
+class ONOSTest(unittest.TestCase):
+    """Unittests for the ONOS controller of stress_test/controller.py. The
+    methods running on the controller node are replaced by stubs.
+    """
+
+    def setUp(self):
+        """Creates an ONOS controller
+        """
+        self.applied = []
+        self.started = True
+        controller = stress_test.controller.Controller
+        onos = stress_test.controller.ONOS
+        self.patches = [
+            unittest.mock.patch.object(controller, 'init_ssh',
+                                       lambda ctrl: None),
+            unittest.mock.patch.object(controller, 'build',
+                                       lambda ctrl: None),
+            unittest.mock.patch.object(controller, 'start',
+                                       lambda ctrl: self.started),
+            unittest.mock.patch.object(
+                onos, 'apply_config',
+                lambda ctrl: self.applied.append(dict(ctrl.applied_config))),
+            unittest.mock.patch.object(controller, 'stop', lambda ctrl: None),
+            unittest.mock.patch.object(controller, 'cleanup',
+                                       lambda ctrl: None)]
+        for patch in self.patches:
+            patch.start()
+        with open(ONOS_CONF) as conf_file:
+            self.controller = stress_test.controller.Controller.new(
+                ONOS_BASE_DIR, json.load(conf_file))
+
+    def tearDown(self):
+        """Destroys the controller
+        """
+        del self.controller
+        gc.collect()
+        for patch in self.patches:
+            patch.stop()
+
+    def test_start(self):
+        """start() applies the configuration from scratch only when the
+        controller was started, a running controller keeps its configuration
+        """
+        self.assertIsInstance(self.controller, stress_test.controller.ONOS)
+        self.controller.applied_config = {'statistics_period_ms': 5000}
+        self.started = False
+        self.assertFalse(self.controller.start())
+        self.assertEqual(self.applied, [])
+        self.assertEqual(self.controller.applied_config,
+                         {'statistics_period_ms': 5000})
+        self.started = True
+        self.assertTrue(self.controller.start())
+        self.assertEqual(self.applied, [{}])
+
+
+if __name__ == '__main__':
+    SUITE_ODLCLUSTERTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(ODLClusterTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_ODLCLUSTERTEST)
+    SUITE_ONOSTEST = unittest.TestLoader().loadTestsFromTestCase(ONOSTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_ONOSTEST)
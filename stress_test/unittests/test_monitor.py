@@ -0,0 +1,125 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for stress_test/monitor.py."""
+
+import logging
+import stress_test.monitor
+import sys
+import unittest
+import unittest.mock
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+
+class StubMember:
+    """
+    Member of a controller cluster, with a fixed operational datastore
+    """
+
+    def __init__(self, ip, pid, switches):
+        """
+        Creates a stub member
+
+        :param ip: the member IP address
+        :param pid: the process ID of the controller
+        :param switches: the switches in the operational datastore
+        :type ip: str
+        :type pid: int
+        :type switches: int
+        """
+        self.ip = ip
+        self.pid = pid
+        self._ssh_conn = None
+        self.restconf_port = 8181
+        self.restconf_user = 'admin'
+        self.restconf_pass = 'admin'
+        self.switches = switches
+
+    def init_oper_ssh(self):
+        return None
+
+    def get_oper_snapshot(self, ssh_client):
+        return {'switches': self.switches, 'links': 0, 'hosts': 0,
+                'flows': 0}
+
+
+class StubCluster(StubMember):
+    """
+    Primary member of a controller cluster
+    """
+
+    def __init__(self, members):
+        """
+        Creates a stub cluster
+
+        :param members: the other members of the cluster
+        :type members: list<StubMember>
+        """
+        StubMember.__init__(self, '10.0.1.11', 100, 50)
+        self.peers = members
+
+    def get_members(self):
+        return [self] + self.peers
+
+
+def sys_proc_snapshot(pid, ssh_client=None):
+    """Snapshot of a member, failing for the member with pid 300"""
+    if pid == 300:
+        raise ValueError('invalid snapshot')
+    return {'proc_cpu_user_time': float(pid), 'proc_cpu_system_time': 1.0,
+            'proc_vm_size': pid * 1000, 'proc_num_threads': 10,
+            'used_memory_bytes': 2000}
+
+
+def get_shard_roles(ip, port, user, password):
+    """Shard roles of a member: the first member leads the inventory"""
+    if ip == '10.0.1.11':
+        return {'inventory': 'Leader', 'topology': 'Follower'}
+    return {'inventory': 'Follower', 'topology': 'Leader'}
+
+
+class ClusterResultsTest(unittest.TestCase):
+    """Unittests for the cluster statistics of stress_test/monitor.py
+    """
+
+    def test_cluster_results(self):
+        """cluster_results() collects the statistics of every member and
+        sums the process statistics of the members that reported them
+        """
+        cluster = StubCluster([StubMember('10.0.1.21', 200, 50),
+                               StubMember('10.0.1.31', 300, 40)])
+        monitor = stress_test.monitor.Monitor(cluster)
+        primary_statistics = {'controller_cpu_user_time': 100.0,
+                              'controller_vm_size': 100000,
+                              'controller_num_threads': 10,
+                              'used_memory_bytes': 1000}
+        with unittest.mock.patch('util.sysstats.sys_proc_snapshot',
+                                 sys_proc_snapshot), \
+                unittest.mock.patch('util.restconf.get_shard_roles',
+                                    get_shard_roles):
+            results = monitor.cluster_results(primary_statistics)
+        self.assertEqual(results['controller_cluster_size'], 3)
+        members = results['controller_cluster_members']
+        self.assertEqual([member['controller_node_ip'] for member in
+                          members], ['10.0.1.11', '10.0.1.21', '10.0.1.31'])
+        self.assertEqual(members[0]['shard_leaders'], ['inventory'])
+        self.assertEqual(members[1]['shard_leaders'], ['topology'])
+        self.assertEqual(members[1]['oper_switches'], 50)
+        self.assertEqual(members[1]['controller_cpu_user_time'], 200.0)
+        self.assertEqual(members[2], {'controller_node_ip': '10.0.1.31'})
+        self.assertEqual(results['cluster_controller_cpu_user_time'], 300.0)
+        self.assertEqual(results['cluster_controller_vm_size'], 300000)
+        self.assertEqual(results['cluster_used_memory_bytes'], 3000)
+
+
+if __name__ == '__main__':
+    SUITE_CLUSTERRESULTSTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(ClusterResultsTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_CLUSTERRESULTSTEST)
@@ -0,0 +1,117 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for stress_test/sbemu.py."""
+
+import json
+import logging
+import os
+import stress_test.sbemu
+import stress_test.sbemu_exceptions
+import sys
+import threading
+import unittest
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+NSTAT_BASE_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), os.pardir, os.pardir))
+MTCBENCH_BASE_DIR = os.path.join(NSTAT_BASE_DIR, 'emulators', 'sbemu',
+                                 'mtcbench', '')
+MTCBENCH_CONF = os.path.join(
+    NSTAT_BASE_DIR, 'stress_test', 'sample_test_confs', 'boron',
+    'boron_DS_sb_active_scalability_mtcbench.json')
+
+
+def mtcbench_group_config(node_ips):
+    """
+    Returns the sample MTCBench configuration, with a list of generator nodes
+
+    :param node_ips: the generator nodes
+    :returns: the test configuration
+    :rtype: dict
+    :type node_ips: list<str>
+    """
+    with open(MTCBENCH_CONF) as conf_file:
+        test_config = json.load(conf_file)
+    test_config['mtcbench_generator_node_ip_list'] = node_ips
+    return test_config
+
+
+class MTCBenchGroupTest(unittest.TestCase):
+    """Unittests for the MTCBench generator group of stress_test/sbemu.py
+    """
+
+    def setUp(self):
+        """Creates a group of two generators. No handler runs on the nodes.
+        """
+        self.group = stress_test.sbemu.SBEmu.new(
+            MTCBENCH_BASE_DIR,
+            mtcbench_group_config(['10.0.1.12', '10.0.1.13']))
+
+    def tearDown(self):
+        """Keeps the destruction of the generators off the nodes.
+        """
+        for generator in self.group.get_generators():
+            generator.clean = lambda: None
+
+    def test_new(self):
+        """SBEmu.new() creates a group with a generator on every node
+        """
+        self.assertIsInstance(self.group, stress_test.sbemu.MTCBenchGroup)
+        self.assertEqual([generator.ip for generator in
+                          self.group.get_generators()],
+                         ['10.0.1.12', '10.0.1.13'])
+        self.group.threads = 2
+        self.group.switches_per_thread = 50
+        self.assertEqual(self.group.peers[0].threads, None)
+        self.assertEqual(self.group.get_generators()[1].threads, 2)
+        self.assertEqual(self.group.get_overall_topo_size(), 200)
+
+    def test_duplicate_nodes(self):
+        """A generator node given twice is rejected
+        """
+        with self.assertRaises(
+                stress_test.sbemu_exceptions.MTCbenchGroupError):
+            stress_test.sbemu.MTCBenchGroup(
+                MTCBENCH_BASE_DIR,
+                mtcbench_group_config(['10.0.1.12', '10.0.1.12']))
+
+    def test_group_wide_calls(self):
+        """Calls from the thread running a method on the primary generator
+        stay on it, calls from other threads run on all generators
+        """
+        records = []
+        record = stress_test.sbemu._group_wide(
+            lambda generator: records.append(generator.ip))
+        primary_running = threading.Event()
+        other_call_done = threading.Event()
+
+        def hold_primary(generator):
+            if generator is self.group:
+                record(generator)
+                primary_running.set()
+                other_call_done.wait(5)
+
+        thread = threading.Thread(
+            target=stress_test.sbemu._group_wide(hold_primary),
+            args=(self.group,))
+        thread.start()
+        self.assertTrue(primary_running.wait(5))
+        record(self.group)
+        other_call_done.set()
+        thread.join()
+        self.assertEqual(sorted(records),
+                         ['10.0.1.12', '10.0.1.12', '10.0.1.13'])
+
+
+if __name__ == '__main__':
+    SUITE_MTCBENCHGROUPTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(MTCBenchGroupTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_MTCBENCHGROUPTEST)
@@ -0,0 +1,176 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Timing instrumentation of the commands and sessions nstat runs on the test
+nodes. util.netutil and util.localexec record, for every call, the time to
+connect, the time until the command is started (exec), the time until the
+first byte of its output arrives (first_byte) and the time until it
+completes (completion). Timings are grouped per handler name into fixed
+bucket histograms, which the monitors drain into every sample, so that the
+measurement overhead of nstat itself shows up next to the measured metrics.
+Only the calls made on the measurement path, i.e. inside the functions
+decorated with measurement(), count as measurement overhead. All other calls
+(start, build and clean handlers, log transfers, etc.) are lifecycle calls.
+"""
+
+import functools
+import os
+import threading
+
+PHASES = ['connect', 'exec', 'first_byte', 'completion']
+
+# Upper bounds (ms) of the histogram buckets. The last bucket holds every
+# timing above the previous bound.
+BUCKET_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000,
+                    10000, float('inf')]
+
+# Suffixes of the files recognized as handlers in a command line
+HANDLER_SUFFIXES = ('.py', '.sh', '.jar')
+
+# Recorded timings, keyed by handler name and phase. Every value is a list
+# of timings in ms, recorded since the last drain().
+_timings = {}
+# Total time (ms) of the measurement and of the lifecycle calls recorded since
+# the last drain()
+_call_ms = {'measurement': 0, 'lifecycle': 0}
+_timings_lock = threading.Lock()
+# Depth of the measurement() functions running in the current thread
+_measurement_depth = threading.local()
+
+
+def handler_name(command):
+    """
+    Extracts the handler name of a command line: the file name of the first \
+        handler script in the command, or its first word if it runs no \
+        handler script.
+
+    :param command: the command line
+    :returns: the handler name
+    :rtype: str
+    :type command: str
+    """
+    words = command.replace(';', ' ').split()
+    for word in words:
+        word = word.strip('\'"')
+        if word.endswith(HANDLER_SUFFIXES):
+            return os.path.basename(word)
+    for word in words:
+        if word not in ('sudo', 'cd', 'nohup', 'bash', 'sh', '-c', '&&'):
+            return os.path.basename(word.strip('\'"'))
+    return command
+
+
+def measurement(function):
+    """
+    Decorator of the functions on the measurement path (operational \
+        datastore probes, system statistics snapshots, etc.). The calls \
+        recorded while such a function runs in the current thread are \
+        measurement calls.
+
+    :param function: the decorated function
+    :returns: the decorated function
+    :rtype: function
+    :type function: function
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        depth = getattr(_measurement_depth, 'value', 0)
+        _measurement_depth.value = depth + 1
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _measurement_depth.value = depth
+    return wrapper
+
+
+def call_kind():
+    """
+    Returns the kind of the calls recorded in the current thread
+
+    :returns: 'measurement' inside a measurement() function, 'lifecycle' \
+        otherwise
+    :rtype: str
+    """
+    if getattr(_measurement_depth, 'value', 0) > 0:
+        return 'measurement'
+    return 'lifecycle'
+
+
+def record(handler, phase, duration_ms):
+    """
+    Records the timing of a phase of a call. The completion time of a call, \
+        or its connect time for the calls that only connect, is added to \
+        the total time of its kind (see call_kind()).
+
+    :param handler: the handler name of the call
+    :param phase: one of PHASES
+    :param duration_ms: time from the start of the call to the end of the \
+        phase, in ms
+    :type handler: str
+    :type phase: str
+    :type duration_ms: float
+    """
+    kind = call_kind()
+    with _timings_lock:
+        _timings.setdefault(handler, {}).setdefault(phase, []).\
+            append(duration_ms)
+        if phase in ('connect', 'completion'):
+            _call_ms[kind] += duration_ms
+
+
+def histogram(values):
+    """
+    Builds the histogram of a list of timings
+
+    :param values: timings in ms
+    :returns: dictionary with the number of timings per bucket of \
+        BUCKET_BOUNDS_MS ('counts'), and their count, sum, minimum and \
+        maximum
+    :rtype: dict
+    :type values: list<float>
+    """
+    counts = [0] * len(BUCKET_BOUNDS_MS)
+    for value in values:
+        for bucket_id, bound in enumerate(BUCKET_BOUNDS_MS):
+            if value <= bound:
+                counts[bucket_id] += 1
+                break
+    return {'counts': counts,
+            'count': len(values),
+            'sum_ms': sum(values),
+            'min_ms': min(values) if values else 0,
+            'max_ms': max(values) if values else 0}
+
+
+def drain():
+    """
+    Returns the histograms of the timings recorded since the previous call \
+        and clears them.
+
+    :returns: dictionary with the bucket bounds ('bucket_bounds_ms', the \
+        last one is reported as -1 for infinity), the histograms keyed by \
+        handler name and phase ('handlers'), the total time of the \
+        measurement calls ('overhead_ms') and the total time of the \
+        lifecycle calls ('lifecycle_ms')
+    :rtype: dict
+    """
+    with _timings_lock:
+        timings = dict(_timings)
+        _timings.clear()
+        call_ms = dict(_call_ms)
+        _call_ms.update({'measurement': 0, 'lifecycle': 0})
+    handlers = {}
+    for handler, phases in timings.items():
+        handlers[handler] = {}
+        for phase, values in phases.items():
+            handlers[handler][phase] = histogram(values)
+    bounds = [bound if bound != float('inf') else -1
+              for bound in BUCKET_BOUNDS_MS]
+    return {'bucket_bounds_ms': bounds,
+            'handlers': handlers,
+            'overhead_ms': call_ms['measurement'],
+            'lifecycle_ms': call_ms['lifecycle']}
@@ -0,0 +1,156 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Convergence detection with adaptive polling. A quantity (discovered
+switches, installed flows) is polled until it reaches its expected value.
+The polling interval follows the observed progress: it shrinks as the
+predicted completion approaches and backs off while the quantity does not
+change. The completion instant is bracketed between the last poll that did
+not see it and the first poll that did, and reported as the middle of the
+bracket with half its width as error bound.
+"""
+
+import logging
+import time
+
+
+class ConvergenceDetector:
+    """
+    Polls a quantity until it reaches an expected value, with adaptive \
+        polling intervals
+    """
+
+    def __init__(self, expected_value, idle_deadline_secs,
+                 min_interval_secs=0.1, max_interval_secs=2.0,
+                 initial_interval_secs=1.0, sleep=time.sleep,
+                 clock=time.time):
+        """
+        Creates a convergence detector
+
+        :param expected_value: value of the quantity on convergence
+        :param idle_deadline_secs: polling stops without convergence if the \
+            quantity does not change for this long
+        :param min_interval_secs: shortest interval between polls, used near \
+            the predicted completion
+        :param max_interval_secs: longest interval between polls, reached \
+            while the quantity does not change
+        :param initial_interval_secs: interval between polls until progress \
+            is observed
+        :param sleep: function used to wait between polls, e.g. gevent.sleep \
+            when polling from a greenlet
+        :param clock: function returning the current time in seconds
+        :type expected_value: int
+        :type idle_deadline_secs: float
+        :type min_interval_secs: float
+        :type max_interval_secs: float
+        :type initial_interval_secs: float
+        :type sleep: function
+        :type clock: function
+        """
+        self.expected_value = expected_value
+        self.idle_deadline_secs = idle_deadline_secs
+        self.min_interval_secs = min_interval_secs
+        self.max_interval_secs = max_interval_secs
+        self.initial_interval_secs = initial_interval_secs
+        self.sleep = sleep
+        self.clock = clock
+
+    def next_interval(self, interval, distance, rate):
+        """
+        Computes the interval until the next poll
+
+        :param interval: the interval before the last poll
+        :param distance: distance of the last polled value from the expected \
+            value
+        :param rate: rate the distance was last observed to shrink at, \
+            None if the last poll saw no progress
+        :returns: seconds until the next poll
+        :rtype: float
+        :type interval: float
+        :type distance: int
+        :type rate: float
+        """
+        if rate is None or rate <= 0:
+            # Back off during plateaus
+            interval = interval * 2
+        else:
+            # Poll at half the predicted remaining time, converging on the
+            # predicted completion
+            interval = distance / rate / 2
+        return max(self.min_interval_secs,
+                   min(self.max_interval_secs, interval))
+
+    def run(self, probe, t_reference=None):
+        """
+        Polls until the quantity reaches the expected value, or until it \
+            does not change for idle_deadline_secs.
+
+        :param probe: function without arguments returning the current \
+            value of the quantity, or -1 if it could not be read
+        :param t_reference: time known to precede convergence, lower bound of \
+            the completion instant if the first poll already sees it. \
+            Defaults to the time run() is called.
+        :returns: dictionary with 'converged', the estimated completion \
+            instant 'time' and its 'error_secs' (None if not converged), the \
+            last and maximum polled values ('value', 'max_value') and the \
+            number of polls ('probes')
+        :rtype: dict
+        :type probe: function
+        :type t_reference: float
+        """
+        if t_reference is None:
+            t_reference = self.clock()
+        t_lower = t_reference
+        t_last_change = self.clock()
+        # No value is known until the first successful poll
+        value = None
+        max_value = 0
+        previous_value = None
+        previous_change = None
+        interval = self.initial_interval_secs
+        probes = 0
+        while True:
+            t_probe_start = self.clock()
+            polled_value = probe()
+            t_probe_end = self.clock()
+            probes += 1
+            if polled_value != -1:
+                value = polled_value
+                max_value = max(max_value, value)
+            if value == self.expected_value:
+                return {'converged': True,
+                        'time': (t_lower + t_probe_end) / 2,
+                        'error_secs': (t_probe_end - t_lower) / 2,
+                        'value': value,
+                        'max_value': max_value,
+                        'probes': probes}
+            distance = abs(self.expected_value - (value or 0))
+            rate = None
+            if value != previous_value:
+                if previous_change is not None:
+                    (t_change, change_distance) = previous_change
+                    if t_probe_end > t_change:
+                        rate = ((change_distance - distance) /
+                                (t_probe_end - t_change))
+                previous_change = (t_probe_end, distance)
+                previous_value = value
+                t_last_change = t_probe_end
+            elif t_probe_end - t_last_change > self.idle_deadline_secs:
+                logging.info('[ConvergenceDetector] No change for {0} '
+                             'seconds, stopped at {1}/{2}'.
+                             format(self.idle_deadline_secs, value or 0,
+                                    self.expected_value))
+                return {'converged': False,
+                        'time': None,
+                        'error_secs': None,
+                        'value': value or 0,
+                        'max_value': max_value,
+                        'probes': probes}
+            # The next poll that sees convergence brackets it from here
+            t_lower = t_probe_start
+            interval = self.next_interval(interval, distance, rate)
+            self.sleep(interval)
@@ -0,0 +1,222 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Incremental, event-based JSON scanning. Large JSON documents, such as the
+operational inventory of a controller with millions of flows, are fed in
+chunks and the items of interest are counted as the document streams by,
+without ever building the document in memory. Subtrees that cannot contain
+counted items are skipped with a single regular expression match per chunk
+run, so scanning time grows linearly with the document size and memory
+stays constant.
+"""
+
+import codecs
+import json
+import re
+
+# A single token in scanning mode: a structural character, a string (its
+# body in group 2) or a bare scalar (number, true, false, null)
+_TOKEN = re.compile(r'[ \t\r\n]*(?:([\[\]{},:])|"((?:[^"\\]|\\.)*)"|'
+                    r'([^ \t\r\n\[\]{},:"]+))')
+
+# The characters of a skipped subtree up to and including the next bracket
+# (group 1). Strings are matched as a whole, so that brackets inside them
+# are ignored.
+_SKIP = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*'
+                   r'([\[\]{}])')
+
+# Positions in a frame of the container stack
+_IS_OBJECT = 0
+_KEY = 1
+_MATCHES = 2
+_EXPECT_KEY = 3
+_CANDIDATE = 4
+
+
+class JsonItemCounter:
+    """
+    Counts the items of the arrays found at a path of a JSON document, fed \
+        in chunks. The path is a sequence of object keys, with '*' standing \
+        for the elements of an array. For example, ('nodes', 'node', '*') \
+        counts the elements of the array document['nodes']['node']. \
+        Optionally only object items with a member whose value starts with \
+        a prefix are counted. Scalars other than strings are matched by \
+        their JSON text, e.g. prefix 'true' for a boolean member.
+    """
+
+    def __init__(self, path, member=None, prefix=''):
+        """
+        Creates a counter
+
+        :param path: path of the counted items, ending with '*'
+        :param member: if given, only object items having this member with \
+            a scalar value starting with prefix are counted
+        :param prefix: prefix of the member value of counted items
+        :type path: tuple<str>
+        :type member: str
+        :type prefix: str
+        """
+        self.path = tuple(path)
+        self.member = member
+        self.prefix = prefix
+        self.count = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._stack = []
+        self._skip_depth = 0
+
+    def feed(self, data):
+        """
+        Scans the next chunk of the document
+
+        :param data: the next chunk of the document
+        :type data: bytes or str
+        :raises ValueError: if the document is not valid JSON
+        """
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        self._buffer += data
+        self._scan(False)
+
+    def close(self):
+        """
+        Scans the rest of the document and checks that it is complete
+
+        :returns: the number of counted items
+        :rtype: int
+        :raises ValueError: if the document is not valid or truncated
+        """
+        self._buffer += self._decoder.decode(b'', final=True)
+        self._scan(True)
+        if self._buffer.strip() or self._stack or self._skip_depth:
+            raise ValueError('Invalid or truncated JSON document')
+        return self.count
+
+    def _scan(self, final):
+        """
+        Scans the buffered text, keeping any incomplete token at its end \
+            for the next chunk
+
+        :param final: True if no more chunks will follow
+        :type final: bool
+        """
+        buf = self._buffer
+        pos = 0
+        end = len(buf)
+        while pos < end:
+            if self._skip_depth:
+                match = _SKIP.match(buf, pos)
+                if match is None:
+                    # No bracket, or a string not terminated yet
+                    break
+                pos = match.end()
+                if match.group(1) in '[{':
+                    self._skip_depth += 1
+                else:
+                    self._skip_depth -= 1
+                continue
+            match = _TOKEN.match(buf, pos)
+            if match is None:
+                break
+            if match.end() == end and match.group(3) is not None and \
+                    not final:
+                # Scalar that may continue in the next chunk
+                break
+            pos = match.end()
+            if match.group(1) is not None:
+                self._structural(match.group(1))
+            elif match.group(2) is not None:
+                self._string(match.group(2))
+            else:
+                self._value(False, False, match.group(3))
+        self._buffer = buf[pos:]
+
+    def _structural(self, char):
+        """
+        Handles a structural character
+
+        :param char: the structural character
+        :type char: str
+        """
+        if char == '{':
+            self._value(True, True, None)
+        elif char == '[':
+            self._value(True, False, None)
+        elif char in '}]':
+            if not self._stack:
+                raise ValueError('Unbalanced JSON document')
+            self._stack.pop()
+        elif char == ',':
+            if self._stack and self._stack[-1][_IS_OBJECT]:
+                self._stack[-1][_EXPECT_KEY] = True
+
+    def _string(self, body):
+        """
+        Handles a string, which is either an object key or a value
+
+        :param body: the string, without the quotes
+        :type body: str
+        """
+        if '\\' in body:
+            body = json.loads('"' + body + '"')
+        if self._stack:
+            top = self._stack[-1]
+            if top[_IS_OBJECT] and top[_EXPECT_KEY]:
+                top[_KEY] = body
+                top[_EXPECT_KEY] = False
+                return
+        self._value(False, False, body)
+
+    def _value(self, is_container, is_object, text):
+        """
+        Handles the beginning of a value: counts it if it is an item at the \
+            counted path, descends into it if it is a container that may \
+            contain counted items, and skips it otherwise.
+
+        :param is_container: True for objects and arrays
+        :param is_object: True for objects
+        :param text: value of strings, JSON text of other scalars (numbers, \
+            true, false, null), None for containers
+        :type is_container: bool
+        :type is_object: bool
+        :type text: str
+        """
+        depth = len(self._stack)
+        if depth == 0:
+            matches = True
+            counted = len(self.path) == 0
+        else:
+            top = self._stack[-1]
+            if top[_CANDIDATE]:
+                # Member of an item that is counted if the member matches
+                if top[_KEY] == self.member and text is not None and \
+                        text.startswith(self.prefix):
+                    self.count += 1
+                    # Skip the rest of the item
+                    self._stack.pop()
+                    self._skip_depth = 1
+                elif is_container:
+                    self._skip_depth = 1
+                return
+            component = top[_KEY] if top[_IS_OBJECT] else '*'
+            matches = (top[_MATCHES] and depth <= len(self.path) and
+                       self.path[depth - 1] == component)
+            counted = matches and depth == len(self.path)
+        if counted:
+            if self.member is None:
+                self.count += 1
+                if is_container:
+                    self._skip_depth = 1
+            elif is_object:
+                self._stack.append([True, None, False, True, True])
+            elif is_container:
+                self._skip_depth = 1
+        elif is_container:
+            if matches:
+                self._stack.append([is_object, None, True, is_object, False])
+            else:
+                self._skip_depth = 1
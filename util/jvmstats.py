@@ -0,0 +1,147 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Parsing and summaries of the garbage collection counters of a JVM, as
+printed by `jstat -gc` every sampling period. Every line of the sampled
+output is prefixed with the wall clock time it was printed at, see
+stress_test.gc_sampler.
+"""
+
+# Fields of the parsed series: sampling times, heap occupancy per generation
+# in KB, and cumulative collection counts and times
+GC_SAMPLES_FIELDS = ['timestamps', 'eden_used_kb', 'survivor_used_kb',
+                     'old_used_kb', 'metaspace_used_kb', 'young_gc_count',
+                     'young_gc_time_secs', 'full_gc_count',
+                     'full_gc_time_secs']
+
+# jstat -gc columns of every field. Java 7 reports the permanent generation
+# (PU) instead of the metaspace (MU).
+_JSTAT_COLUMNS = {'eden_used_kb': ['EU'],
+                  'survivor_used_kb': ['S0U', 'S1U'],
+                  'old_used_kb': ['OU'],
+                  'metaspace_used_kb': ['MU', 'PU'],
+                  'young_gc_count': ['YGC'],
+                  'young_gc_time_secs': ['YGCT'],
+                  'full_gc_count': ['FGC'],
+                  'full_gc_time_secs': ['FGCT']}
+
+
+def parse_gc_samples(text):
+    """
+    Parses timestamped jstat -gc output into compact arrays, one per \
+        sampled value. Lines that cannot be parsed (e.g. jstat errors or a \
+        line cut at the end of the sampling) are skipped.
+
+    :param text: lines of '<wall clock time> <jstat -gc output line>'
+    :returns: dictionary with an array for each field of GC_SAMPLES_FIELDS. \
+        Timestamps are rounded to milliseconds.
+    :rtype: dict
+    :type text: str
+    """
+    series = dict((field, []) for field in GC_SAMPLES_FIELDS)
+    columns = None
+    for line in text.splitlines():
+        tokens = line.split()
+        if len(tokens) < 2:
+            continue
+        if tokens[1] in ('S0C', 'Timestamp'):
+            columns = dict((column, index + 1)
+                           for index, column in enumerate(tokens[1:]))
+            continue
+        if columns is None or len(tokens) != len(columns) + 1:
+            continue
+        try:
+            record = {'timestamps': round(float(tokens[0]), 3)}
+            for field, field_columns in _JSTAT_COLUMNS.items():
+                present = [column for column in field_columns
+                           if column in columns]
+                if field == 'metaspace_used_kb':
+                    present = present[:1]
+                record[field] = sum(float(tokens[columns[column]])
+                                    for column in present)
+        except ValueError:
+            continue
+        for field in GC_SAMPLES_FIELDS:
+            series[field].append(record[field])
+    for field in ['young_gc_count', 'full_gc_count']:
+        series[field] = [int(value) for value in series[field]]
+    return series
+
+
+def slice_gc_samples(series, t_from=None, t_to=None):
+    """
+    Returns the part of a series of GC samples that was taken in the time \
+        window (t_from, t_to]
+
+    :param series: GC samples as returned by parse_gc_samples()
+    :param t_from: start of the time window (exclusive), None for no limit
+    :param t_to: end of the time window (inclusive), None for no limit
+    :returns: dictionary with an array for each field of GC_SAMPLES_FIELDS
+    :rtype: dict
+    :type series: dict
+    :type t_from: float
+    :type t_to: float
+    """
+    indices = [i for i, t in enumerate(series['timestamps'])
+               if (t_from is None or t > t_from) and
+               (t_to is None or t <= t_to)]
+    return dict((field, [series[field][i] for i in indices])
+                for field in GC_SAMPLES_FIELDS)
+
+
+def summarize_gc_samples(series, previous=None):
+    """
+    Summarizes the garbage collection activity of a series of GC samples. \
+        The counters of jstat are cumulative, so the activity is measured \
+        against the last sample before the series if it is given, otherwise \
+        against the first sample of the series. The pause of a collection is \
+        not sampled by jstat: the largest pause is the largest mean pause of \
+        the collections between two samples, which is exact as long as \
+        there is at most one collection per sampling period.
+
+    :param series: GC samples as returned by parse_gc_samples()
+    :param previous: GC samples taken before the series, whose last sample \
+        is the reference of the counters
+    :returns: dictionary with the number of collections ('gc_count'), \
+        their total and largest pause time ('gc_time_ms', \
+        'gc_max_pause_ms') and the largest heap and old generation \
+        occupancy ('heap_used_max_bytes', 'old_used_max_bytes'). All values \
+        are -1 if the series is empty.
+    :rtype: dict
+    :type series: dict
+    :type previous: dict
+    """
+    summary = dict.fromkeys(['gc_count', 'gc_time_ms', 'gc_max_pause_ms',
+                             'heap_used_max_bytes', 'old_used_max_bytes'],
+                            -1)
+    if not series['timestamps']:
+        return summary
+    counts = [young + full for young, full in
+              zip(series['young_gc_count'], series['full_gc_count'])]
+    times = [young + full for young, full in
+             zip(series['young_gc_time_secs'], series['full_gc_time_secs'])]
+    if previous is not None and previous['timestamps']:
+        counts.insert(0, previous['young_gc_count'][-1] +
+                      previous['full_gc_count'][-1])
+        times.insert(0, previous['young_gc_time_secs'][-1] +
+                     previous['full_gc_time_secs'][-1])
+    max_pause_secs = 0.0
+    for index in range(1, len(counts)):
+        collections = counts[index] - counts[index - 1]
+        if collections > 0:
+            max_pause_secs = max(max_pause_secs,
+                                 (times[index] - times[index - 1]) /
+                                 collections)
+    summary['gc_count'] = counts[-1] - counts[0]
+    summary['gc_time_ms'] = (times[-1] - times[0]) * 1000
+    summary['gc_max_pause_ms'] = max_pause_secs * 1000
+    summary['heap_used_max_bytes'] = int(max(
+        eden + survivor + old for eden, survivor, old in
+        zip(series['eden_used_kb'], series['survivor_used_kb'],
+            series['old_used_kb'])) * 1024)
+    summary['old_used_max_bytes'] = int(max(series['old_used_kb']) * 1024)
+    return summary
@@ -0,0 +1,250 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Local-execution fast path. When a component runs on the nstat host, under
+the user that runs nstat, its handlers are spawned directly as local
+processes and its files are accessed with os calls, instead of going through
+paramiko and a loopback ssh server.
+"""
+
+import codecs
+import gevent
+import gevent.queue
+import getpass
+import logging
+import os
+import select
+import shutil
+import socket
+import subprocess
+import threading
+import time
+import util.cmdtimings
+
+# Cache of the is_local_target() checks, keyed by (ip, ssh_port, username)
+_local_targets = {}
+_local_targets_lock = threading.Lock()
+
+
+def is_local_address(ip):
+    """
+    Checks if an address belongs to the local host. An address is local if \
+        it is a loopback address or a socket can be bound to it.
+
+    :param ip: ip address or hostname
+    :returns: True if the address belongs to the local host, False otherwise
+    :rtype: bool
+    :type ip: str
+    """
+    try:
+        address = socket.gethostbyname(ip)
+    except socket.error:
+        return False
+    if address.startswith('127.'):
+        return True
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        probe.bind((address, 0))
+        return True
+    except socket.error:
+        return False
+    finally:
+        probe.close()
+
+
+def is_local_target(ip, ssh_port, username):
+    """
+    Checks if a target node can be driven through the local-execution fast \
+        path: its address belongs to the local host, it is reached on the \
+        default ssh port (other ports usually forward to containers) and its \
+        user is the user running nstat.
+
+    :param ip: ip address of the target node
+    :param ssh_port: ssh port of the target node
+    :param username: username on the target node
+    :returns: True if the target is local, False otherwise
+    :rtype: bool
+    :type ip: str
+    :type ssh_port: int
+    :type username: str
+    """
+    key = (ip, int(ssh_port), username)
+    with _local_targets_lock:
+        if key not in _local_targets:
+            _local_targets[key] = (int(ssh_port) == 22 and
+                                   username == getpass.getuser() and
+                                   is_local_address(ip))
+            if _local_targets[key]:
+                logging.info('[localexec] {0}@{1} is the local host, using '
+                             'local execution.'.format(username, ip))
+        return _local_targets[key]
+
+
+class LocalClient:
+    """
+    Stands in for the paramiko.SSHClient of a local target node. Commands \
+        run through it are spawned as local processes.
+    """
+
+    def close(self):
+        """
+        Nothing to close for local targets
+        """
+        pass
+
+
+class LocalSFTP:
+    """
+    Stands in for the paramiko.SFTPClient of a local target node, \
+        implementing the operations used by nstat with os calls.
+    """
+
+    def stat(self, path):
+        """Returns the os.stat() result of a path"""
+        return os.stat(path)
+
+    def chmod(self, path, mode):
+        """Changes the mode of a path"""
+        os.chmod(path, mode)
+
+    def mkdir(self, path, mode=0o777):
+        """Creates a directory"""
+        os.mkdir(path, mode)
+
+    def listdir(self, path='.'):
+        """Returns the entries of a directory"""
+        return os.listdir(path)
+
+    def remove(self, path):
+        """Removes a file"""
+        os.remove(path)
+
+    def rmdir(self, path):
+        """Removes an empty directory"""
+        os.rmdir(path)
+
+    def readlink(self, path):
+        """Returns the target of a symbolic link"""
+        return os.readlink(path)
+
+    def open(self, filename, mode='r', bufsize=-1):
+        """Opens a file"""
+        return open(filename, mode, bufsize)
+
+    def put(self, localpath, remotepath):
+        """Copies a file to the target, i.e. to another local path"""
+        if os.path.abspath(localpath) != os.path.abspath(remotepath):
+            shutil.copyfile(localpath, remotepath)
+
+    def get(self, remotepath, localpath):
+        """Copies a file from the target, i.e. from another local path"""
+        if os.path.abspath(localpath) != os.path.abspath(remotepath):
+            shutil.copyfile(remotepath, localpath)
+
+    def close(self):
+        """Nothing to close for local targets"""
+        pass
+
+
+def run_command(command_to_run, prefix='', lines_queue=None, print_flag=True,
+                block_flag=True, spool_path=None):
+    """
+    Runs a command as a local process, streaming its combined stdout - \
+        stderr through a pipe. Same interface and return value as \
+        util.netutil.ssh_run_command().
+
+    :param command_to_run: Command to execute
+    :param prefix: prefix of log message
+    :param lines_queue: Queue datastructure to buffer the result of execution
+    :param print_flag: Flag that defines if the output of the command will be \
+        printed on screen
+    :param block_flag: Defines if we block execution waiting for the running \
+        command to return its exit status
+    :param spool_path: if given, the output is written to this file instead \
+        of being kept in memory
+    :returns: the exit code of the command and the combined stdout - stderr \
+        of the executed command, or spool_path if the output was spooled to \
+        a file
+    :rtype: tuple
+    :type command_to_run: str
+    :type prefix: str
+    :type lines_queue: queue<str>
+    :type print_flag: bool
+    :type block_flag: bool
+    :type spool_path: str
+    """
+    handler = util.cmdtimings.handler_name(command_to_run)
+    t_start = time.time()
+    if not block_flag:
+        subprocess.Popen(command_to_run, shell=True,
+                         stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL,
+                         close_fds=True)
+        util.cmdtimings.record(handler, 'exec', (time.time() - t_start) * 1000)
+        return (0, '')
+
+    process = subprocess.Popen(command_to_run, shell=True,
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT,
+                               close_fds=True)
+    util.cmdtimings.record(handler, 'exec', (time.time() - t_start) * 1000)
+    stdout_fd = process.stdout.fileno()
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    spool_file = None
+    if spool_path is not None:
+        spool_file = open(spool_path, 'w', encoding='utf-8')
+    output_chunks = []
+    partial_line = ''
+    first_byte = True
+    try:
+        # Stop reading once the command has exited and its output is drained,
+        # even if background processes it started keep the pipe open
+        while True:
+            if not select.select([stdout_fd], [], [], 0.1)[0]:
+                if process.poll() is not None:
+                    break
+                continue
+            data = os.read(stdout_fd, 64 * 1024)
+            if not data:
+                break
+            if first_byte:
+                util.cmdtimings.record(handler, 'first_byte',
+                                       (time.time() - t_start) * 1000)
+                first_byte = False
+            text = decoder.decode(data)
+            if spool_file is not None:
+                spool_file.write(text)
+            else:
+                output_chunks.append(text)
+            if print_flag:
+                logging.debug('{0} {1}'.format(prefix, text).strip())
+            if lines_queue is not None:
+                lines = (partial_line + text).split('\n')
+                partial_line = lines.pop()
+                for line in lines:
+                    lines_queue.put(line.rstrip('\r'))
+                if type(lines_queue) is type(gevent.queue.Queue()):
+                    # Let the greenlet consuming the queue run
+                    gevent.sleep(0)
+        text = decoder.decode(b'', final=True)
+        if spool_file is not None:
+            spool_file.write(text)
+        else:
+            output_chunks.append(text)
+        partial_line += text
+        if lines_queue is not None and partial_line:
+            lines_queue.put(partial_line.rstrip('\r'))
+    finally:
+        if spool_file is not None:
+            spool_file.close()
+    process.stdout.close()
+    exit_status = process.wait()
+    util.cmdtimings.record(handler, 'completion',
+                           (time.time() - t_start) * 1000)
+    if spool_path is not None:
+        return (exit_status, spool_path)
+    return (exit_status, ''.join(output_chunks))
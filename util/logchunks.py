@@ -0,0 +1,98 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Storage of a log collected incrementally, as tagged compressed chunks. Every
+chunk is a gzip member appended to a single log file, so the whole file
+decompresses to the collected log with any gzip tool. Next to it an index
+file holds one JSON line per chunk, with the tags of the chunk (e.g. the
+sweep point and sample id it was collected for), its place in the
+compressed file and the range of log bytes it holds. The chunks of one
+iteration are extracted through the index, without scanning the whole file.
+"""
+
+import gzip
+import json
+import os
+import time
+
+
+def append_chunk(log_path, index_path, gz_data, tags, log_from, log_to):
+    """
+    Appends a compressed chunk to the collected log and records it in the \
+        index. Both files are flushed, so that the chunks collected so far \
+        survive a crash.
+
+    :param log_path: path of the compressed log file
+    :param index_path: path of the index file
+    :param gz_data: the chunk, as a complete gzip member
+    :param tags: the tags of the chunk
+    :param log_from: offset of the first byte of the chunk in the log
+    :param log_to: offset after the last byte of the chunk in the log
+    :returns: the index record of the chunk
+    :rtype: dict
+    :type log_path: str
+    :type index_path: str
+    :type gz_data: bytes
+    :type tags: dict
+    :type log_from: int
+    :type log_to: int
+    """
+    with open(log_path, 'ab') as log_file:
+        log_file.seek(0, os.SEEK_END)
+        offset = log_file.tell()
+        log_file.write(gz_data)
+    record = dict(tags)
+    record.update({'offset': offset, 'length': len(gz_data),
+                   'log_from': log_from, 'log_to': log_to,
+                   'timestamp': time.time()})
+    with open(index_path, 'a') as index_file:
+        index_file.write(json.dumps(record, sort_keys=True) + '\n')
+    return record
+
+
+def read_index(index_path):
+    """
+    Reads the index of a collected log. A line cut by a crash at the end of \
+        the index is skipped.
+
+    :param index_path: path of the index file
+    :returns: the index records, in collection order
+    :rtype: list<dict>
+    :type index_path: str
+    """
+    records = []
+    with open(index_path) as index_file:
+        for line in index_file:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def extract_chunks(log_path, index_path, **tags):
+    """
+    Extracts the part of a collected log with the given tags, e.g. \
+        extract_chunks(log_path, index_path, global_sample_id=3)
+
+    :param log_path: path of the compressed log file
+    :param index_path: path of the index file
+    :param tags: the tags the chunks must have
+    :returns: the decompressed chunks with the given tags, concatenated in \
+        collection order
+    :rtype: bytes
+    :type log_path: str
+    :type index_path: str
+    """
+    chunks = []
+    with open(log_path, 'rb') as log_file:
+        for record in read_index(index_path):
+            if all(record.get(tag) == value for tag, value in tags.items()):
+                log_file.seek(record['offset'])
+                chunks.append(gzip.decompress(
+                    log_file.read(record['length'])))
+    return b''.join(chunks)
@@ -0,0 +1,225 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Parsing of the output of MTCBench. Every internal repeat prints a line with
+the number of responses every emulated switch received in the repeat,
+followed by the total throughput, e.g.
+
+    12:00:01.123 4  switches: flows/sec:  120  118  121  0   total = 0.359 per ms
+
+and the run ends with a summary of the total throughput over the repeats,
+e.g.
+
+    RESULT: 4 switches 9 tests min/max/avg/stdev = 350.12/365.43/358.00/4.51 responses/s
+
+When MTCBench runs on several generator nodes started together, the k-th
+repeat of every node covers the same period, so the repeats of the nodes
+are aligned by their index and combined into the repeats of the whole load
+(see RepeatAligner).
+"""
+
+import re
+import util.stats
+
+_REPEAT_LINE = re.compile(r'flows/sec:\s*((?:\d+\s+)*)total = '
+                          r'([0-9.eE+-]+) per ms')
+_SUMMARY_LINE = re.compile(r'min/max/avg/stdev = ([0-9.eE+-]+)/'
+                           r'([0-9.eE+-]+)/([0-9.eE+-]+)/([0-9.eE+-]+)')
+
+
+def parse_repeat_line(line):
+    """
+    Parses the line MTCBench prints at the end of an internal repeat. The \
+        throughput of every switch is its share of the responses, applied \
+        to the total throughput.
+
+    :param line: a line of MTCBench output
+    :returns: dictionary with the total throughput \
+        ('throughput_responses_sec'), the responses of every switch in the \
+        repeat ('switch_responses') and the throughput of every switch \
+        ('switch_throughput_responses_sec'), None if the line is not the \
+        line of a repeat
+    :rtype: dict
+    :type line: str
+    """
+    match = _REPEAT_LINE.search(line)
+    if match is None:
+        return None
+    throughput = float(match.group(2)) * 1000.0
+    switch_responses = [int(responses) for responses in
+                        match.group(1).split()]
+    total_responses = sum(switch_responses)
+    if total_responses > 0:
+        switch_throughput = [throughput * responses / total_responses
+                             for responses in switch_responses]
+    else:
+        switch_throughput = [0.0] * len(switch_responses)
+    return {'throughput_responses_sec': throughput,
+            'switch_responses': switch_responses,
+            'switch_throughput_responses_sec': switch_throughput}
+
+
+def parse_summary_line(line):
+    """
+    Parses the summary line MTCBench prints at the end of a run
+
+    :param line: a line of MTCBench output
+    :returns: dictionary with the minimum, maximum, average and standard \
+        deviation of the total throughput over the repeats, in \
+        responses/sec ('throughput_min_responses_sec', ...), None if the \
+        line is not the summary line
+    :rtype: dict
+    :type line: str
+    """
+    match = _SUMMARY_LINE.search(line)
+    if match is None:
+        return None
+    return dict(zip(['throughput_min_responses_sec',
+                     'throughput_max_responses_sec',
+                     'throughput_avg_responses_sec',
+                     'throughput_stdev_responses_sec'],
+                    [float(value) for value in match.groups()]))
+
+
+def summarize_switch_throughput(switch_throughput):
+    """
+    Summarizes how the throughput of a repeat is shared among the switches
+
+    :param switch_throughput: the throughput of every switch
+    :returns: dictionary with the minimum, maximum, average and standard \
+        deviation of the throughput of the switches \
+        ('switch_throughput_min', 'switch_throughput_max', \
+        'switch_throughput_avg', 'switch_throughput_stdev') and Jain's \
+        fairness index of the switches ('fairness_index', see \
+        util.stats.jain_fairness_index()). All values are -1 if there are \
+        no switches.
+    :rtype: dict
+    :type switch_throughput: list<float>
+    """
+    summary = dict.fromkeys(['switch_throughput_min', 'switch_throughput_max',
+                             'switch_throughput_avg',
+                             'switch_throughput_stdev', 'fairness_index'], -1)
+    if not switch_throughput:
+        return summary
+    summary['switch_throughput_min'] = min(switch_throughput)
+    summary['switch_throughput_max'] = max(switch_throughput)
+    summary['switch_throughput_avg'] = util.stats.mean(switch_throughput)
+    summary['switch_throughput_stdev'] = util.stats.stdev(switch_throughput)
+    summary['fairness_index'] = \
+        util.stats.jain_fairness_index(switch_throughput)
+    return summary
+
+
+def combine_repeats(nodes, node_repeats, arrival_times):
+    """
+    Combines the same repeat of several generator nodes into a repeat of \
+        the whole load. The throughputs are summed and the switches of all \
+        nodes are listed in node order.
+
+    :param nodes: the generator nodes
+    :param node_repeats: the repeat of every node, in node order, as \
+        returned by parse_repeat_line()
+    :param arrival_times: the time the repeat of every node was received, \
+        in node order
+    :returns: the combined repeat, with the keys of parse_repeat_line(), \
+        the throughput of every node ('node_throughput_responses_sec', \
+        keyed by the node) and the spread of the arrival times of the \
+        repeats ('alignment_skew_secs'), which bounds the misalignment of \
+        the nodes
+    :rtype: dict
+    :type nodes: list<str>
+    :type node_repeats: list<dict>
+    :type arrival_times: list<float>
+    """
+    combined = {'throughput_responses_sec': 0.0, 'switch_responses': [],
+                'switch_throughput_responses_sec': [],
+                'node_throughput_responses_sec': {},
+                'alignment_skew_secs': max(arrival_times) -
+                min(arrival_times)}
+    for node, repeat in zip(nodes, node_repeats):
+        combined['throughput_responses_sec'] += \
+            repeat['throughput_responses_sec']
+        combined['switch_responses'] += repeat['switch_responses']
+        combined['switch_throughput_responses_sec'] += \
+            repeat['switch_throughput_responses_sec']
+        combined['node_throughput_responses_sec'][node] = \
+            repeat['throughput_responses_sec']
+    return combined
+
+
+def combine_summaries(node_summaries):
+    """
+    Combines the summary lines of several generator nodes. The average \
+        throughputs of the nodes add up to the average throughput of the \
+        load. The minimum, maximum and standard deviation of the nodes do \
+        not, so they are kept for a single node only.
+
+    :param node_summaries: the summary of every node keyed by the node, as \
+        returned by parse_summary_line()
+    :returns: the combined summary
+    :rtype: dict
+    :type node_summaries: dict
+    """
+    if len(node_summaries) == 1:
+        return dict(list(node_summaries.values())[0])
+    return {'throughput_avg_responses_sec':
+            sum(summary['throughput_avg_responses_sec']
+                for summary in node_summaries.values()),
+            'node_throughput_avg_responses_sec':
+            dict((node, summary['throughput_avg_responses_sec'])
+                 for node, summary in node_summaries.items())}
+
+
+class RepeatAligner:
+    """
+    Aligns the repeats of MTCBench runs started together on several \
+        generator nodes. A repeat of the whole load is complete when every \
+        node has reported it.
+    """
+    def __init__(self, nodes):
+        """
+        Creates a repeat aligner
+
+        :param nodes: the generator nodes
+        :type nodes: list<str>
+        """
+        self.nodes = list(nodes)
+        self._pending = dict((node, []) for node in self.nodes)
+
+    def add(self, node, repeat, arrival_time):
+        """
+        Adds the next repeat of a node
+
+        :param node: the generator node
+        :param repeat: the repeat, as returned by parse_repeat_line()
+        :param arrival_time: the time the repeat was received
+        :returns: the repeats of the whole load completed by this repeat, \
+            see combine_repeats()
+        :rtype: list<dict>
+        :type node: str
+        :type repeat: dict
+        :type arrival_time: float
+        """
+        self._pending[node].append((repeat, arrival_time))
+        completed = []
+        while all(self._pending[pending_node] for pending_node in self.nodes):
+            entries = [self._pending[pending_node].pop(0)
+                       for pending_node in self.nodes]
+            completed.append(combine_repeats(
+                self.nodes, [entry[0] for entry in entries],
+                [entry[1] for entry in entries]))
+        return completed
+
+    def unaligned(self):
+        """
+        Returns the number of repeats waiting for the same repeat of other \
+            nodes
+
+        :returns: the number of repeats not combined yet
+        :rtype: int
+        """
+        return sum(len(entries) for entries in self._pending.values())
@@ -0,0 +1,161 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Direct client for the REST API of the Multinet master. Requests go straight
+from nstat to the master over persistent keep-alive connections, instead of
+running a Multinet handler in a virtualenv over ssh, which makes the same
+request and logs the response. The master broadcasts every request to its
+workers and responds with the list of the worker responses, each a JSON
+object keyed by the worker, e.g. for get_switches
+
+    ["{\\"10.0.0.1:3333\\": 50}", "{\\"10.0.0.2:3333\\": 50}"]
+
+Sessions are pooled per master and can be used by concurrent callers.
+"""
+
+import atexit
+import json
+import requests
+import requests.adapters
+import threading
+import time
+import util.cmdtimings
+
+# Maximum number of keep-alive connections kept open per master
+POOL_MAXSIZE = 4
+
+# Pool of requests sessions, keyed by (ip, master_rest_port)
+_master_pool = {}
+_master_pool_lock = threading.Lock()
+
+
+def master_session(ip, master_rest_port):
+    """
+    Returns the pooled requests session for the REST API of a Multinet \
+        master, creating it on first use.
+
+    :param ip: Multinet master IP address
+    :param master_rest_port: Multinet master REST port
+    :returns: the pooled session
+    :rtype: requests.Session
+    :type ip: str
+    :type master_rest_port: int
+    """
+    key = (ip, int(master_rest_port))
+    with _master_pool_lock:
+        session = _master_pool.get(key)
+        if session is None:
+            session = requests.Session()
+            session.trust_env = False
+            session.headers.update({'Accept': 'application/json'})
+            session.mount('http://', requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=POOL_MAXSIZE))
+            _master_pool[key] = session
+        return session
+
+
+def master_pool_close_all():
+    """
+    Closes all pooled Multinet master sessions. Registered to run at \
+        interpreter exit.
+    """
+    with _master_pool_lock:
+        sessions = list(_master_pool.values())
+        _master_pool.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(master_pool_close_all)
+
+
+def master_request(ip, master_rest_port, opcode, body=None, timeout=30):
+    """
+    Makes a request to the REST API of a Multinet master
+
+    :param ip: Multinet master IP address
+    :param master_rest_port: Multinet master REST port
+    :param opcode: the requested operation, e.g. 'get_switches'
+    :param body: the JSON body of the request, None for an empty body
+    :param timeout: seconds to wait for the response
+    :returns: the decoded JSON body of the response
+    :rtype: list
+    :raises IOError: if the request fails or the response is not valid
+    :type ip: str
+    :type master_rest_port: int
+    :type opcode: str
+    :type body: dict
+    :type timeout: float
+    """
+    url = 'http://{0}:{1}/{2}'.format(ip, master_rest_port, opcode)
+    t_start = time.time()
+    try:
+        response = master_session(ip, master_rest_port).post(
+            url, json=body, timeout=timeout)
+        if response.status_code != 200:
+            raise IOError('Multinet master request {0} failed with status '
+                          'code {1}'.format(url, response.status_code))
+        return response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        raise IOError('Multinet master request {0} failed: {1}'.
+                      format(url, e))
+    finally:
+        util.cmdtimings.record('multinet_rest', 'completion',
+                               (time.time() - t_start) * 1000)
+
+
+def parse_worker_results(master_response):
+    """
+    Parses the response of the Multinet master into the results of its \
+        workers. Every worker response is a JSON object, or its JSON \
+        encoding, keyed by the worker.
+
+    :param master_response: the decoded response of the master
+    :returns: the result of every worker, keyed by the worker
+    :rtype: dict
+    :raises ValueError: if the response is not a list of worker responses
+    :type master_response: list
+    """
+    if not isinstance(master_response, list):
+        raise ValueError('Unexpected Multinet master response: {0}'.
+                         format(master_response))
+    results = {}
+    for worker_response in master_response:
+        if isinstance(worker_response, str):
+            worker_response = json.loads(worker_response)
+        if not isinstance(worker_response, dict):
+            raise ValueError('Unexpected Multinet worker response: {0}'.
+                             format(worker_response))
+        results.update(worker_response)
+    return results
+
+
+@util.cmdtimings.measurement
+def get_worker_counts(ip, master_rest_port, opcode, timeout=30):
+    """
+    Queries a count (e.g. switches or flows) from all the workers of a \
+        Multinet master
+
+    :param ip: Multinet master IP address
+    :param master_rest_port: Multinet master REST port
+    :param opcode: 'get_switches' or 'get_flows'
+    :param timeout: seconds to wait for the response
+    :returns: the count of every worker, keyed by the worker
+    :rtype: dict
+    :raises IOError: if the request fails or the response is not valid
+    :type ip: str
+    :type master_rest_port: int
+    :type opcode: str
+    :type timeout: float
+    """
+    response = master_request(ip, master_rest_port, opcode, timeout=timeout)
+    try:
+        return dict((worker, int(count)) for worker, count in
+                    parse_worker_results(response).items())
+    except (TypeError, ValueError) as e:
+        raise IOError('Invalid {0} response of the Multinet master: {1}'.
+                      format(opcode, e))
@@ -6,14 +6,34 @@
 
 """ General network utilities """
 
+import atexit
+import codecs
 import gevent
 import gevent.queue
+import gevent.select
 import logging
 import os
 import paramiko
+import select
+import socket
 import stat
+import threading
 import time
 import errno
+import util.cmdtimings
+import util.localexec
+import functools
+
+# Pool of open ssh sessions, keyed by (ip, ssh_port, username). Every value is
+# an ((sftp, transport_layer), borrowed) tuple. The (sftp, transport_layer)
+# session is handed out by ssh_pool_get(). A borrowed session runs over the
+# transport of an ssh client owned by its caller, so only its sftp channel is
+# closed by the pool.
+_ssh_pool = {}
+# Guards _ssh_pool and _ssh_pool_key_locks. It is never held during an ssh
+# handshake, the handshake with a node is serialized by the lock of its key.
+_ssh_pool_lock = threading.Lock()
+_ssh_pool_key_locks = {}
 
 
 def copy_dir_local_to_remote(ip, ssh_port, username, password,
@@ -34,8 +54,7 @@ def copy_dir_local_to_remote(ip, ssh_port, username, password,
 
     if local_path.endswith('/'):
         local_path = local_path[:-1]
-    (sftp, transport_layer) = \
-        ssh_connection_open(ip, int(ssh_port), username, password)
+    sftp = ssh_pool_get(ip, ssh_port, username, password)[0]
     os.chdir(os.path.split(local_path)[0])
     parent = os.path.split(local_path)[1]
 
@@ -51,8 +70,6 @@ def copy_dir_local_to_remote(ip, ssh_port, username, password,
             remote_file = os.path.join(remote_path, walker[0], curr_file)
             sftp.put(local_file, remote_file)
 
-    ssh_connection_close(sftp, transport_layer)
-
 
 def copy_dir_remote_to_local(ip, ssh_port, username, password,
                              remote_path, local_path):
@@ -68,10 +85,8 @@ def copy_dir_remote_to_local(ip, ssh_port, username, password,
     :type remote_path: str
     :type local_path: str
     """
-    (sftp, transport_layer) = ssh_connection_open(ip, int(ssh_port),
-                                                  username, password)
+    sftp = ssh_pool_get(ip, ssh_port, username, password)[0]
     if not isdir(remote_path, sftp):
-        ssh_connection_close(sftp, transport_layer)
         raise(IOError('[copy_dir_remote_to_local] The remote path {0} does '
                       'not exist.'.format(remote_path)))
 
@@ -90,7 +105,6 @@ def copy_dir_remote_to_local(ip, ssh_port, username, password,
                                          os.path.join(local_path, file_item))
             else:
                 sftp.get(remote_filepath, os.path.join(local_path, file_item))
-    ssh_connection_close(sftp, transport_layer)
 
 
 def create_dir_remote(ip, ssh_port, username, password, remote_path):
@@ -103,16 +117,15 @@ def create_dir_remote(ip, ssh_port, username, password, remote_path):
     :type remote_path: str
     """
 
-    (sftp, transport_layer) = \
-        ssh_connection_open(ip, int(ssh_port), username, password)
-    try:
-        # Test if remote_path exists
-        sftp.chdir(remote_path)
-    except IOError:
-        # Create remote_path
-        sftp.mkdir(remote_path)
-        sftp.chdir(remote_path)
-    ssh_connection_close(sftp, transport_layer)
+    def create_dir(sftp):
+        try:
+            # Test if remote_path exists
+            sftp.stat(remote_path)
+        except IOError:
+            # Create remote_path
+            sftp.mkdir(remote_path)
+
+    ssh_pool_run(ip, ssh_port, username, password, create_dir, 'create_dir')
 
 
 def isdir(path, sftp):
@@ -141,14 +154,102 @@ def make_remote_file_executable(ip, port, username, password, remote_file):
     :type connection: namedtuple<>
     :type remote_file: str
     """
-    (sftp, transport_layer) = ssh_connection_open(ip, int(port),
-                                                  username, password)
     try:
-        sftp.chmod(remote_file, stat.S_IEXEC | stat.S_IREAD | stat.S_IWRITE)
+        ssh_pool_run(ip, port, username, password,
+                     lambda sftp: sftp.chmod(remote_file, stat.S_IEXEC |
+                                             stat.S_IREAD | stat.S_IWRITE),
+                     'chmod')
     except:
         raise(IOError('[make_remote_file_executable] Fail to make remote file '
                       '{0} on {1} node executable.'.format(remote_file, ip)))
-    ssh_connection_close(sftp, transport_layer)
+
+
+def make_remote_files_executable(ip, port, username, password, file_list):
+    """
+    Checks that the remote files of a list exist and makes them executable, \
+        using a single sftp session for the whole list.
+
+    :param ip: ip address of the remote host
+    :param port: port number of the remote host
+    :param username: username of the remote host
+    :param password: password of the remote host
+    :param file_list: list of remote files to check and make executable
+    :returns: the files of file_list that do not exist on the remote host
+    :rtype: list<str>
+    :raises IOError: if an existing file cannot be made executable
+    :type ip: str
+    :type port: int
+    :type username: str
+    :type password: str
+    :type file_list: list<str>
+    """
+
+    def check_and_chmod(sftp):
+        missing_files = []
+        for remote_file in file_list:
+            try:
+                sftp.stat(remote_file)
+            except IOError:
+                missing_files.append(remote_file)
+                continue
+            try:
+                sftp.chmod(remote_file,
+                           stat.S_IEXEC | stat.S_IREAD | stat.S_IWRITE)
+            except:
+                raise(IOError('[make_remote_files_executable] Fail to make '
+                              'remote file {0} on {1} node executable.'.
+                              format(remote_file, ip)))
+        return missing_files
+
+    return ssh_pool_run(ip, port, username, password, check_and_chmod,
+                        'check_and_chmod')
+
+
+def verify_handlers(ip, port, username, password, handlers, verified_hnds,
+                    prefix, required=True):
+    """
+    Checks that the handlers of a component exist on its node and makes \
+        them executable, in a single sftp session. The verified handlers \
+        are cached by the component, so every handler is checked only once \
+        until the component clears its cache.
+
+    :param ip: ip address of the remote host
+    :param port: port number of the remote host
+    :param username: username of the remote host
+    :param password: password of the remote host
+    :param handlers: full paths of the handlers on the remote host
+    :param verified_hnds: the verified handler cache of the component, the \
+        handlers found are added to it
+    :param prefix: prefix of the log and error messages, e.g. '[Controller]'
+    :param required: if True a missing handler is an error, otherwise it is \
+        only logged, e.g. when all handlers are checked after a build
+    :returns: the handlers that do not exist on the remote host
+    :rtype: list<str>
+    :raises IOError: if a required handler does not exist on the remote \
+        host, or a handler cannot be made executable
+    :type ip: str
+    :type port: int
+    :type username: str
+    :type password: str
+    :type handlers: list<str>
+    :type verified_hnds: set<str>
+    :type prefix: str
+    :type required: bool
+    """
+    unverified_hnds = [handler for handler in handlers
+                        if handler not in verified_hnds]
+    if not unverified_hnds:
+        return []
+    missing_hnds = make_remote_files_executable(ip, port, username, password,
+                                                unverified_hnds)
+    verified_hnds.update(set(unverified_hnds) - set(missing_hnds))
+    for handler in missing_hnds:
+        if required:
+            raise(IOError('{0} handler {1} does not exist'.
+                          format(prefix, handler)))
+        logging.warning('{0} handler {1} does not exist'.
+                        format(prefix, handler))
+    return missing_hnds
 
 
 def remove_remote_directory(ip, ssh_port, username, password, path):
@@ -163,8 +264,7 @@ def remove_remote_directory(ip, ssh_port, username, password, path):
     :type path: str
     """
 
-    (sftp, transport_layer) = \
-        ssh_connection_open(ip, int(ssh_port), username, password)
+    sftp = ssh_pool_get(ip, ssh_port, username, password)[0]
     files = sftp.listdir(path=path)
 
     for file_item in files:
@@ -175,7 +275,6 @@ def remove_remote_directory(ip, ssh_port, username, password, path):
             sftp.remove(filepath)
 
     sftp.rmdir(path)
-    ssh_connection_close(sftp, transport_layer)
 
 
 def isfile(ip, port, username, password, file_list):
@@ -197,16 +296,18 @@ def isfile(ip, port, username, password, file_list):
     :type file_list: list<str>
     """
 
-    sftp = ssh_connection_open(ip, int(port), username, password)[0]
-    for filename in file_list:
-        try:
-            sftp.stat(filename)
-        except IOError as e:
-            if e.errno == errno.EEXIST:
-                return False
-            raise IOError('[utils.netutils.isfile] Other error number')
-        else:
-            return True
+    def stat_files(sftp):
+        for filename in file_list:
+            try:
+                sftp.stat(filename)
+            except IOError as e:
+                if e.errno == errno.ENOENT:
+                    return False
+                raise IOError('[utils.netutils.isfile] Other error number')
+        return True
+
+    return ssh_pool_run(ip, port, username, password, stat_files,
+                        'stat_files')
 
 
 def ssh_connect_or_return(ip, ssh_port, username, password, maxretries):
@@ -228,6 +329,9 @@ def ssh_connect_or_return(ip, ssh_port, username, password, maxretries):
     :type maxretries: int
     """
 
+    if util.localexec.is_local_target(ip, ssh_port, username):
+        return util.localexec.LocalClient()
+
     retries = 1
 
     while retries <= maxretries:
@@ -237,6 +341,7 @@ def ssh_connect_or_return(ip, ssh_port, username, password, maxretries):
             format(ip, ssh_port, retries, maxretries))
 
         try:
+            t_connect = time.time()
             ssh = paramiko.SSHClient()
             ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             ssh.load_host_keys(os.path.expanduser(os.path.join("~", ".ssh",
@@ -244,6 +349,8 @@ def ssh_connect_or_return(ip, ssh_port, username, password, maxretries):
             ssh.connect(hostname=ip, port=ssh_port,
                         username=username,
                         password=password)
+            util.cmdtimings.record('ssh_connect', 'connect',
+                                   (time.time() - t_connect) * 1000)
             logging.info('[utils.netutils.ssh_connect_or_return] '
                          'connected to {0} '.format(ip))
             print('Connected OK')
@@ -293,16 +400,165 @@ def ssh_connection_open(ip, ssh_port, username, password):
     :type password: str
     """
     try:
+        t_connect = time.time()
         transport_layer = paramiko.Transport((ip, ssh_port))
         transport_layer.connect(username=username,
                                 password=password)
         sftp = paramiko.SFTPClient.from_transport(transport_layer)
+        util.cmdtimings.record('sftp_session', 'connect',
+                               (time.time() - t_connect) * 1000)
 
         return (sftp, transport_layer)
     except:
         logging.error('[ssh_connection_open] error: check connection object')
 
 
+def _ssh_pool_close(entry):
+    """
+    Closes a session removed from the ssh pool. The transport of a borrowed \
+        session belongs to its ssh client and is left open.
+
+    :param entry: the pool entry of the session, a \
+        ((sftp, transport_layer), borrowed) tuple
+    :type entry: tuple
+    """
+    ((sftp, transport_layer), borrowed) = entry
+    if not borrowed:
+        ssh_connection_close(sftp, transport_layer)
+        return
+    try:
+        sftp.close()
+    except Exception as e:
+        logging.error('Fail during closing connection. {0}'.format(e))
+
+
+def ssh_pool_get(ip, ssh_port, username, password, ssh_client=None):
+    """
+    Returns a live ssh session with a remote node from the connection pool. \
+        Sessions are keyed by (ip, ssh_port, username) and are reused by all \
+        callers, so that only the first operation on a node pays the ssh \
+        handshake. The handshakes with different nodes run concurrently. A \
+        session whose transport is no longer active is evicted and replaced \
+        by a new one. For local targets the session is a \
+        util.localexec.LocalSFTP object and no transport is opened.
+
+    :param ip: ip address of the remote host
+    :param ssh_port: port number of the remote host
+    :param username: username of the remote host
+    :param password: password of the remote host
+    :param ssh_client: open ssh client with the remote host. If given, a \
+        new session is opened over its transport instead of a new one. The \
+        session is borrowed: the pool never closes the transport.
+    :returns: sftp, transport_layer
+    :rtype: tuple<paramiko.SFTPClient, paramiko.Transport>
+    :raises IOError: if a new session cannot be opened
+    :type ip: str
+    :type ssh_port: int
+    :type username: str
+    :type password: str
+    :type ssh_client: paramiko.SSHClient
+    """
+    if util.localexec.is_local_target(ip, ssh_port, username):
+        return (util.localexec.LocalSFTP(), None)
+    key = (ip, int(ssh_port), username)
+    with _ssh_pool_lock:
+        key_lock = _ssh_pool_key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        with _ssh_pool_lock:
+            entry = _ssh_pool.get(key)
+        if entry is not None:
+            (sftp, transport_layer) = entry[0]
+            if transport_layer.is_active() and \
+                    not sftp.get_channel().closed:
+                return entry[0]
+            logging.info('[ssh_pool_get] evicting stale session with '
+                         '{0}:{1}'.format(ip, ssh_port))
+            with _ssh_pool_lock:
+                if _ssh_pool.get(key) is entry:
+                    del _ssh_pool[key]
+            _ssh_pool_close(entry)
+        if ssh_client is not None:
+            session = (ssh_client.open_sftp(), ssh_client.get_transport())
+        else:
+            session = ssh_connection_open(ip, int(ssh_port), username,
+                                          password)
+        if session is None:
+            raise(IOError('[ssh_pool_get] Fail to open ssh session with '
+                          '{0}:{1}'.format(ip, ssh_port)))
+        with _ssh_pool_lock:
+            _ssh_pool[key] = (session, ssh_client is not None)
+        return session
+
+
+def ssh_pool_run(ip, ssh_port, username, password, sftp_operation,
+                 operation_name):
+    """
+    Runs an operation on the pooled sftp session of a remote node. If the \
+        session turns out to be broken while the operation runs, it is \
+        evicted and the operation is retried once on a new session.
+
+    :param ip: ip address of the remote host
+    :param ssh_port: port number of the remote host
+    :param username: username of the remote host
+    :param password: password of the remote host
+    :param sftp_operation: callable that takes a paramiko.SFTPClient as its \
+        only argument
+    :param operation_name: name of the operation, its timings are recorded \
+        as 'sftp.<operation_name>' (see util.cmdtimings)
+    :returns: the return value of sftp_operation
+    :type ip: str
+    :type ssh_port: int
+    :type username: str
+    :type password: str
+    :type sftp_operation: function
+    :type operation_name: str
+    """
+    t_start = time.time()
+    try:
+        return sftp_operation(ssh_pool_get(ip, ssh_port, username,
+                                           password)[0])
+    except (EOFError, paramiko.SSHException):
+        ssh_pool_evict(ip, ssh_port, username)
+        return sftp_operation(ssh_pool_get(ip, ssh_port, username,
+                                           password)[0])
+    finally:
+        util.cmdtimings.record('sftp.' + operation_name,
+                               'completion', (time.time() - t_start) * 1000)
+
+
+def ssh_pool_evict(ip, ssh_port, username):
+    """
+    Closes and removes the pooled ssh session of a remote node, if any. \
+        Only the sftp channel of a borrowed session is closed.
+
+    :param ip: ip address of the remote host
+    :param ssh_port: port number of the remote host
+    :param username: username of the remote host
+    :type ip: str
+    :type ssh_port: int
+    :type username: str
+    """
+    with _ssh_pool_lock:
+        entry = _ssh_pool.pop((ip, int(ssh_port), username), None)
+    if entry is not None:
+        _ssh_pool_close(entry)
+
+
+def ssh_pool_close_all():
+    """
+    Closes all pooled ssh sessions, except for the transports of the \
+        borrowed sessions. Registered to run at interpreter exit.
+    """
+    with _ssh_pool_lock:
+        entries = list(_ssh_pool.values())
+        _ssh_pool.clear()
+    for entry in entries:
+        _ssh_pool_close(entry)
+
+
+atexit.register(ssh_pool_close_all)
+
+
 def ssh_copy_file_to_target(ip, ssh_port, username, password, local_file,
                             remote_file):
     """
@@ -322,10 +578,8 @@ def ssh_copy_file_to_target(ip, ssh_port, username, password, local_file,
     :type local_file: str
     :type remote_file: str
     """
-    (sftp, transport_layer) = ssh_connection_open(ip, int(ssh_port), username,
-                                                  password)
-    sftp.put(local_file, remote_file)
-    ssh_connection_close(sftp, transport_layer)
+    ssh_pool_run(ip, ssh_port, username, password,
+                 lambda sftp: sftp.put(local_file, remote_file), 'put')
 
 
 def ssh_delete_file_if_exists(ip, ssh_port, username, password, remote_file):
@@ -339,10 +593,9 @@ def ssh_delete_file_if_exists(ip, ssh_port, username, password, remote_file):
     :type remote_file: str
     """
 
-    (sftp, transport_layer) = \
-        ssh_connection_open(ip, int(ssh_port), username, password)
     try:
-        sftp.remove(remote_file)
+        ssh_pool_run(ip, ssh_port, username, password,
+                     lambda sftp: sftp.remove(remote_file), 'remove')
         logging.info('[delete_file_if_exists]: file {0} removed'.
                      format(remote_file))
     except IOError:
@@ -354,13 +607,16 @@ def ssh_delete_file_if_exists(ip, ssh_port, username, password, remote_file):
             '[delete_file_if_exists] Error: unknown error occurred '
             'removing remote file.')
 
-    ssh_connection_close(sftp, transport_layer)
-
 
 def ssh_run_command(ssh_client, command_to_run, prefix='', lines_queue=None,
-                    print_flag=True, block_flag=True, getpty_flag=False):
+                    print_flag=True, block_flag=True, getpty_flag=False,
+                    spool_path=None):
     """
-    Runs the specified command on a remote machine
+    Runs the specified command on a remote machine, or as a local process \
+        if ssh_client is a util.localexec.LocalClient. The output is read as \
+        soon as the channel has data, decoded incrementally and split into \
+        lines once, so lines and multi-byte characters split across chunks \
+        are kept intact.
 
     :param ssh_client: SSH client provided by paramiko to run the command
     :param command_to_run: Command to execute
@@ -372,8 +628,11 @@ def ssh_run_command(ssh_client, command_to_run, prefix='', lines_queue=None,
         command to return its exit status
     :param getpty_flag: add a pseudo-terminal console (pty console) to the \
         channel
+    :param spool_path: if given, the output is written to this local file \
+        instead of being kept in memory, for commands with very large output
     :returns: the exit code of the command to be executed remotely and the \
-        combined stdout - stderr of the executed command
+        combined stdout - stderr of the executed command, or spool_path if \
+        the output was spooled to a file
     :rtype: tuple
     :type ssh_client: paramiko.SSHClient
     :type command_to_run: str
@@ -382,10 +641,17 @@ def ssh_run_command(ssh_client, command_to_run, prefix='', lines_queue=None,
     :type print_flag: bool
     :type block_flag: bool
     :type getpty_flag: bool
+    :type spool_path: str
     """
 
+    if isinstance(ssh_client, util.localexec.LocalClient):
+        return util.localexec.run_command(command_to_run, prefix, lines_queue,
+                                          print_flag, block_flag, spool_path)
+
+    handler = util.cmdtimings.handler_name(command_to_run)
+    t_start = time.time()
     channel = ssh_client.get_transport().open_session()
-    buffersize = 8*1024
+    buffersize = 64*1024
     channel_timeout = None
     channel.setblocking(1)
     channel.set_combine_stderr(True)
@@ -393,6 +659,7 @@ def ssh_run_command(ssh_client, command_to_run, prefix='', lines_queue=None,
     if getpty_flag:
         channel.get_pty()
     channel.exec_command(command_to_run)
+    util.cmdtimings.record(handler, 'exec', (time.time() - t_start) * 1000)
 
     if not block_flag:
         # Carefull!! Do not close channel here if it is closed the running
@@ -400,21 +667,172 @@ def ssh_run_command(ssh_client, command_to_run, prefix='', lines_queue=None,
         # of non blocking execution.
         return (0, '')
 
-    channel_output = ''
-    while not channel.exit_status_ready():
-        data = ''
-        data = channel.recv(buffersize).decode('utf-8')
-        while data is not '':
-            channel_output += data
+    # When the output is consumed by a greenlet, wait for data through the
+    # gevent hub, so that the consumer runs while the channel is idle.
+    gevent_consumer = type(lines_queue) is type(gevent.queue.Queue())
+    if gevent_consumer:
+        wait_readable = gevent.select.select
+    else:
+        wait_readable = select.select
+    print_flag = print_flag and logging.getLogger().isEnabledFor(logging.DEBUG)
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    spool_file = None
+    if spool_path is not None:
+        spool_file = open(spool_path, 'w', encoding='utf-8')
+    output_chunks = []
+    partial_line = ''
+    first_byte = True
+    try:
+        while True:
+            if not (channel.recv_ready() or channel.eof_received or
+                    channel.closed):
+                wait_readable([channel], [], [], 1.0)
+                continue
+            data = channel.recv(buffersize)
+            if not data:
+                break
+            if first_byte:
+                util.cmdtimings.record(handler, 'first_byte',
+                                       (time.time() - t_start) * 1000)
+                first_byte = False
+            text = decoder.decode(data)
+            if spool_file is not None:
+                spool_file.write(text)
+            else:
+                output_chunks.append(text)
             if print_flag:
-                logging.debug('{0} {1}'.format(prefix, data).strip())
+                logging.debug('{0} {1}'.format(prefix, text).strip())
             if lines_queue is not None:
-                for line in data.splitlines():
-                    lines_queue.put(line)
-            if type(lines_queue) is type(gevent.queue.Queue()):
-                gevent.sleep(0.01)
-            data = channel.recv(buffersize).decode('utf-8')
+                lines = (partial_line + text).split('\n')
+                partial_line = lines.pop()
+                for line in lines:
+                    lines_queue.put(line.rstrip('\r'))
+                if gevent_consumer:
+                    gevent.sleep(0)
+        text = decoder.decode(b'', final=True)
+        if spool_file is not None:
+            spool_file.write(text)
+        else:
+            output_chunks.append(text)
+        partial_line += text
+        if lines_queue is not None and partial_line:
+            lines_queue.put(partial_line.rstrip('\r'))
+    finally:
+        if spool_file is not None:
+            spool_file.close()
 
     channel_exit_status = channel.recv_exit_status()
     channel.close()
-    return (channel_exit_status, channel_output)
+    util.cmdtimings.record(handler, 'completion',
+                           (time.time() - t_start) * 1000)
+    if spool_path is not None:
+        return (channel_exit_status, spool_path)
+    return (channel_exit_status, ''.join(output_chunks))
+
+
+def tcp_port_listens(ip, port, timeout=0.5):
+    """
+    Checks whether a TCP port accepts connections, with a plain TCP connect \
+        from the local node. Much cheaper than looking for the listening \
+        process on the remote node, so it can be polled at a fine interval.
+
+    :param ip: the IP address of the remote node
+    :param port: the TCP port to probe
+    :param timeout: seconds to wait for the connection
+    :returns: True if the connection was accepted
+    :rtype: bool
+    :type ip: str
+    :type port: int
+    :type timeout: float
+    """
+    try:
+        probe = socket.create_connection((ip, int(port)), timeout)
+    except (OSError, socket.timeout):
+        return False
+    probe.close()
+    return True
+
+
+def fan_out(tasks, max_concurrency=8, timeout=None):
+    """
+    Runs independent tasks concurrently, usually one per host, with a \
+        bounded number of tasks running at the same time. Each task runs in \
+        its own thread, since paramiko calls block the calling thread.
+
+    :param tasks: dictionary with a name (e.g. the host) and a callable \
+        without arguments for each task
+    :param max_concurrency: maximum number of tasks running at the same time
+    :param timeout: seconds to wait for all tasks to finish, None to wait \
+        forever. Tasks still running at the deadline are reported as timed \
+        out and left running in the background.
+    :returns: dictionary with a (status, value) tuple for each task name. \
+        status is 'ok' with the return value of the task, 'error' with the \
+        exception raised by the task, or 'timeout' with None.
+    :rtype: dict
+    :type tasks: dict
+    :type max_concurrency: int
+    :type timeout: float
+    """
+    results = {}
+    results_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(max_concurrency)
+
+    def run_task(name, task):
+        with slots:
+            try:
+                outcome = ('ok', task())
+            except BaseException as e:
+                logging.error('[fan_out] task {0} failed: {1}'.
+                              format(name, e))
+                outcome = ('error', e)
+        with results_lock:
+            results[name] = outcome
+
+    threads = []
+    for name, task in tasks.items():
+        thread = threading.Thread(target=run_task, args=(name, task),
+                                  name='fan_out-{0}'.format(name))
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+    deadline = None if timeout is None else time.time() + timeout
+    for thread in threads:
+        if deadline is None:
+            thread.join()
+        else:
+            thread.join(max(0, deadline - time.time()))
+    with results_lock:
+        return dict((name, results.get(name, ('timeout', None)))
+                    for name in tasks)
+
+
+def ssh_fan_out(host_commands, max_concurrency=8, timeout=None):
+    """
+    Runs commands on many hosts at once, over a new ssh connection per \
+        host, and collects the exit status and output of each host.
+
+    :param host_commands: dictionary with a name for each host and an \
+        (ip, ssh_port, username, password, command) tuple
+    :param max_concurrency: maximum number of hosts driven at the same time
+    :param timeout: seconds to wait for all commands to finish, None to \
+        wait forever
+    :returns: dictionary with a (status, value) tuple for each host name, \
+        as returned by fan_out(). On success value is the (exit_status, \
+        output) tuple of ssh_run_command().
+    :rtype: dict
+    :type host_commands: dict
+    :type max_concurrency: int
+    :type timeout: float
+    """
+    def host_task(ip, ssh_port, username, password, command):
+        ssh_client = ssh_connect_or_return(ip, int(ssh_port), username,
+                                           password, 10)
+        try:
+            return ssh_run_command(ssh_client, command,
+                                   '[ssh_fan_out][{0}]'.format(ip))
+        finally:
+            ssh_client.close()
+
+    tasks = dict((name, functools.partial(host_task, *host_command))
+                 for name, host_command in host_commands.items())
+    return fan_out(tasks, max_concurrency, timeout)
@@ -0,0 +1,437 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Direct RESTCONF client for the operational datastore queries of the
+controller. Requests go straight from nstat to the RESTCONF port of the
+controller over persistent keep-alive connections, instead of running a
+handler over ssh which makes its own HTTP request. Sessions are pooled per
+controller and credentials, and can be used by concurrent callers. The same
+client serves the REST API of ONOS, whose topology and flow stores are
+queried like the operational datastore of ODL (see ONOS_OPER_QUERIES).
+"""
+
+import atexit
+import functools
+import requests
+import requests.adapters
+import threading
+import time
+import util.cmdtimings
+import util.jsonstream
+import util.netutil
+
+OPER_INVENTORY_PATH = '/restconf/operational/opendaylight-inventory:nodes'
+OPER_TOPOLOGY_PATH = ('/restconf/operational/network-topology:'
+                      'network-topology/topology/flow:1')
+CONFIG_INVENTORY_PATH = '/restconf/config/opendaylight-inventory:nodes'
+
+# Jolokia read of the raft state of all local shards of a datastore of a
+# clustered controller, served on the RESTCONF port
+SHARD_ROLES_PATH = ('/jolokia/read/org.opendaylight.controller:'
+                    'Category=Shards,name=*,type={0}/RaftState')
+SHARD_DATASTORES = {'operational': 'DistributedOperationalDatastore',
+                    'config': 'DistributedConfigDatastore'}
+
+# ONOS REST API: the topology and flow stores, the component configuration
+# and the applications
+ONOS_DEVICES_PATH = '/onos/v1/devices'
+ONOS_LINKS_PATH = '/onos/v1/links'
+ONOS_HOSTS_PATH = '/onos/v1/hosts'
+ONOS_FLOWS_PATH = '/onos/v1/flows'
+ONOS_CONFIGURATION_PATH = '/onos/v1/configuration/{0}'
+ONOS_APPLICATION_PATH = '/onos/v1/applications/{0}'
+
+# Maximum number of keep-alive connections kept open per controller, i.e.
+# number of queries that can run concurrently without opening new ones
+POOL_MAXSIZE = 16
+
+# Size of the chunks of streamed responses fed to the counters
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Pool of requests sessions, keyed by
+# (ip, restconf_port, username, password)
+_restconf_pool = {}
+_restconf_pool_lock = threading.Lock()
+
+
+def restconf_session(ip, restconf_port, username, password):
+    """
+    Returns the pooled requests session for the RESTCONF interface of a \
+        controller, creating it on first use.
+
+    :param ip: controller IP address
+    :param restconf_port: controller RESTCONF port
+    :param username: RESTCONF username
+    :param password: RESTCONF password
+    :returns: the pooled session
+    :rtype: requests.Session
+    :type ip: str
+    :type restconf_port: int
+    :type username: str
+    :type password: str
+    """
+    key = (ip, int(restconf_port), username, password)
+    with _restconf_pool_lock:
+        session = _restconf_pool.get(key)
+        if session is None:
+            session = requests.Session()
+            session.trust_env = False
+            session.auth = (username, password)
+            session.headers.update({'Accept': 'application/json'})
+            session.mount('http://', requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=POOL_MAXSIZE))
+            _restconf_pool[key] = session
+        return session
+
+
+def restconf_pool_close_all():
+    """
+    Closes all pooled RESTCONF sessions. Registered to run at interpreter \
+        exit.
+    """
+    with _restconf_pool_lock:
+        sessions = list(_restconf_pool.values())
+        _restconf_pool.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(restconf_pool_close_all)
+
+
+def restconf_get(ip, restconf_port, username, password, path, timeout=10):
+    """
+    Makes a GET request to the RESTCONF interface of a controller
+
+    :param ip: controller IP address
+    :param restconf_port: controller RESTCONF port
+    :param username: RESTCONF username
+    :param password: RESTCONF password
+    :param path: path of the requested resource
+    :param timeout: seconds to wait for the response
+    :returns: the decoded JSON body of the response, None if the resource \
+        does not exist (an empty datastore subtree)
+    :rtype: dict
+    :raises IOError: if the request fails or the response is not valid
+    :type ip: str
+    :type restconf_port: int
+    :type username: str
+    :type password: str
+    :type path: str
+    :type timeout: float
+    """
+    url = 'http://{0}:{1}{2}'.format(ip, restconf_port, path)
+    t_start = time.time()
+    try:
+        response = restconf_session(ip, restconf_port, username,
+                                    password).get(url, timeout=timeout)
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise IOError('RESTCONF request {0} failed with status code '
+                          '{1}'.format(url, response.status_code))
+        return response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        raise IOError('RESTCONF request {0} failed: {1}'.format(url, e))
+    finally:
+        util.cmdtimings.record('restconf', 'completion',
+                               (time.time() - t_start) * 1000)
+
+
+def restconf_post(ip, restconf_port, username, password, path, body=None,
+                  timeout=10):
+    """
+    Makes a POST request to the RESTCONF interface of a controller
+
+    :param ip: controller IP address
+    :param restconf_port: controller RESTCONF port
+    :param username: RESTCONF username
+    :param password: RESTCONF password
+    :param path: path of the resource
+    :param body: the JSON body of the request, None for an empty body
+    :param timeout: seconds to wait for the response
+    :raises IOError: if the request fails
+    :type ip: str
+    :type restconf_port: int
+    :type username: str
+    :type password: str
+    :type path: str
+    :type body: dict
+    :type timeout: float
+    """
+    url = 'http://{0}:{1}{2}'.format(ip, restconf_port, path)
+    t_start = time.time()
+    try:
+        response = restconf_session(ip, restconf_port, username,
+                                    password).post(url, json=body,
+                                                   timeout=timeout)
+        if response.status_code not in (200, 201, 204):
+            raise IOError('RESTCONF request {0} failed with status code '
+                          '{1}'.format(url, response.status_code))
+    except requests.exceptions.RequestException as e:
+        raise IOError('RESTCONF request {0} failed: {1}'.format(url, e))
+    finally:
+        util.cmdtimings.record('restconf', 'completion',
+                               (time.time() - t_start) * 1000)
+
+
+def restconf_delete(ip, restconf_port, username, password, path, timeout=10):
+    """
+    Makes a DELETE request to the RESTCONF interface of a controller
+
+    :param ip: controller IP address
+    :param restconf_port: controller RESTCONF port
+    :param username: RESTCONF username
+    :param password: RESTCONF password
+    :param path: path of the deleted resource
+    :param timeout: seconds to wait for the response
+    :returns: True if the resource was deleted, False if it did not exist
+    :rtype: bool
+    :raises IOError: if the request fails
+    :type ip: str
+    :type restconf_port: int
+    :type username: str
+    :type password: str
+    :type path: str
+    :type timeout: float
+    """
+    url = 'http://{0}:{1}{2}'.format(ip, restconf_port, path)
+    t_start = time.time()
+    try:
+        response = restconf_session(ip, restconf_port, username,
+                                    password).delete(url, timeout=timeout)
+        if response.status_code == 404:
+            return False
+        if response.status_code not in (200, 204):
+            raise IOError('RESTCONF request {0} failed with status code '
+                          '{1}'.format(url, response.status_code))
+        return True
+    except requests.exceptions.RequestException as e:
+        raise IOError('RESTCONF request {0} failed: {1}'.format(url, e))
+    finally:
+        util.cmdtimings.record('restconf', 'completion',
+                               (time.time() - t_start) * 1000)
+
+
+# Source document, path of the counted items and optional member filter of
+# every operational datastore query, see util.jsonstream.JsonItemCounter
+OPER_QUERIES = {
+    'switches': (OPER_INVENTORY_PATH, ('nodes', 'node', '*'), 'id',
+                 'openflow:'),
+    'flows': (OPER_INVENTORY_PATH,
+              ('nodes', 'node', '*', 'flow-node-inventory:table', '*', 'flow',
+               '*'), None, ''),
+    'links': (OPER_TOPOLOGY_PATH, ('topology', '*', 'link', '*'), None, ''),
+    'hosts': (OPER_TOPOLOGY_PATH, ('topology', '*', 'node', '*'), 'node-id',
+              'host:')}
+
+# The same queries against the stores of ONOS: connected devices, active
+# links, hosts and flows installed on the devices
+ONOS_OPER_QUERIES = {
+    'switches': (ONOS_DEVICES_PATH, ('devices', '*'), 'available', 'true'),
+    'flows': (ONOS_FLOWS_PATH, ('flows', '*'), 'state', 'ADDED'),
+    'links': (ONOS_LINKS_PATH, ('links', '*'), 'state', 'ACTIVE'),
+    'hosts': (ONOS_HOSTS_PATH, ('hosts', '*'), None, '')}
+
+
+def restconf_count(ip, restconf_port, username, password, path, counters,
+                   timeout=10):
+    """
+    Makes a GET request to the RESTCONF interface of a controller and feeds \
+        the response body to incremental counters as it arrives, so that \
+        the response is never held in memory as a whole. Several counters \
+        can count different items in a single read of the resource.
+
+    :param ip: controller IP address
+    :param restconf_port: controller RESTCONF port
+    :param username: RESTCONF username
+    :param password: RESTCONF password
+    :param path: path of the requested resource
+    :param counters: the counters the response body is fed to
+    :param timeout: seconds to wait for the response
+    :returns: the number of items counted by every counter, 0 if the \
+        resource does not exist (an empty datastore subtree)
+    :rtype: list<int>
+    :raises IOError: if the request fails or the response is not valid
+    :type ip: str
+    :type restconf_port: int
+    :type username: str
+    :type password: str
+    :type path: str
+    :type counters: list<util.jsonstream.JsonItemCounter>
+    :type timeout: float
+    """
+    url = 'http://{0}:{1}{2}'.format(ip, restconf_port, path)
+    t_start = time.time()
+    response = None
+    try:
+        response = restconf_session(ip, restconf_port, username,
+                                    password).get(url, timeout=timeout,
+                                                  stream=True)
+        if response.status_code == 404:
+            return [0] * len(counters)
+        if response.status_code != 200:
+            raise IOError('RESTCONF request {0} failed with status code '
+                          '{1}'.format(url, response.status_code))
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            for counter in counters:
+                counter.feed(chunk)
+        return [counter.close() for counter in counters]
+    except (requests.exceptions.RequestException, ValueError) as e:
+        raise IOError('RESTCONF request {0} failed: {1}'.format(url, e))
+    finally:
+        if response is not None:
+            response.close()
+        util.cmdtimings.record('restconf', 'completion',
+                               (time.time() - t_start) * 1000)
+
+
+def oper_counter(query, queries=OPER_QUERIES):
+    """
+    Creates the counter of an operational datastore query
+
+    :param query: one of the keys of queries
+    :param queries: the queries of the controller, OPER_QUERIES or \
+        ONOS_OPER_QUERIES
+    :returns: a counter for the items of the query
+    :rtype: util.jsonstream.JsonItemCounter
+    :type query: str
+    :type queries: dict
+    """
+    (path, items_path, member, prefix) = queries[query]
+    return util.jsonstream.JsonItemCounter(items_path, member, prefix)
+
+
+@util.cmdtimings.measurement
+def get_oper_count(ip, restconf_port, username, password, query, timeout=10,
+                   queries=OPER_QUERIES):
+    """
+    Queries the operational datastore of a controller. The items are \
+        counted while the response streams in, with constant memory.
+
+    :param ip: controller IP address
+    :param restconf_port: controller RESTCONF port
+    :param username: RESTCONF username
+    :param password: RESTCONF password
+    :param query: one of 'switches', 'flows', 'links', 'hosts'
+    :param timeout: seconds to wait for the response
+    :param queries: the queries of the controller, OPER_QUERIES or \
+        ONOS_OPER_QUERIES
+    :returns: the number of the queried elements
+    :rtype: int
+    :raises IOError: if the request fails or the response is not valid
+    :type ip: str
+    :type restconf_port: int
+    :type username: str
+    :type password: str
+    :type query: str
+    :type timeout: float
+    :type queries: dict
+    """
+    return restconf_count(ip, restconf_port, username, password,
+                          queries[query][0], [oper_counter(query, queries)],
+                          timeout)[0]
+
+
+@util.cmdtimings.measurement
+def get_oper_snapshot(ip, restconf_port, username, password, timeout=10,
+                      queries=OPER_QUERIES):
+    """
+    Takes a snapshot of the topology in the operational datastore of a \
+        controller: switches, links, hosts and flows. Every datastore \
+        resource is read once, with all its counters fed from the same \
+        read, and the resources are read concurrently, so that all values \
+        refer to the same moment.
+
+    :param ip: controller IP address
+    :param restconf_port: controller RESTCONF port
+    :param username: RESTCONF username
+    :param password: RESTCONF password
+    :param timeout: seconds to wait for the responses
+    :param queries: the queries of the controller, OPER_QUERIES or \
+        ONOS_OPER_QUERIES
+    :returns: dictionary with the number of switches, links, hosts and \
+        flows, the timestamp of the snapshot (middle of the reads) and the \
+        time the reads took ('read_time_secs'), which bounds the skew \
+        between the values
+    :rtype: dict
+    :raises IOError: if a request fails or a response is not valid
+    :type ip: str
+    :type restconf_port: int
+    :type username: str
+    :type password: str
+    :type timeout: float
+    :type queries: dict
+    """
+    queries_per_path = {}
+    for query in sorted(queries):
+        queries_per_path.setdefault(queries[query][0], []).append(query)
+
+    def read_path(path):
+        path_queries = queries_per_path[path]
+        counts = restconf_count(ip, restconf_port, username, password, path,
+                                [oper_counter(query, queries)
+                                 for query in path_queries],
+                                timeout)
+        return dict(zip(path_queries, counts))
+
+    t_start = time.time()
+    results = util.netutil.fan_out(
+        dict((path, functools.partial(read_path, path))
+             for path in queries_per_path),
+        max_concurrency=len(queries_per_path))
+    t_end = time.time()
+    snapshot = {'timestamp': (t_start + t_end) / 2,
+                'read_time_secs': t_end - t_start}
+    for path, (status, value) in results.items():
+        if status != 'ok':
+            raise IOError('RESTCONF read of {0} failed: {1}'.
+                          format(path, value))
+        snapshot.update(value)
+    return snapshot
+
+
+@util.cmdtimings.measurement
+def get_shard_roles(ip, restconf_port, username, password,
+                    datastore='operational', timeout=10):
+    """
+    Returns the raft state of the local shards of a member of a clustered \
+        controller, read through the Jolokia interface of the member.
+
+    :param ip: member IP address
+    :param restconf_port: member RESTCONF port
+    :param username: RESTCONF username
+    :param password: RESTCONF password
+    :param datastore: 'operational' or 'config'
+    :param timeout: seconds to wait for the response
+    :returns: dictionary with the raft state ('Leader', 'Follower', \
+        'Candidate', ...) of every local shard, keyed by shard name
+    :rtype: dict
+    :raises IOError: if the request fails or the response is not valid
+    :type ip: str
+    :type restconf_port: int
+    :type username: str
+    :type password: str
+    :type datastore: str
+    :type timeout: float
+    """
+    response = restconf_get(
+        ip, restconf_port, username, password,
+        SHARD_ROLES_PATH.format(SHARD_DATASTORES[datastore]), timeout)
+    if response is None or response.get('status') != 200:
+        raise IOError('Jolokia read of the {0} shards of {1} failed'.
+                      format(datastore, ip))
+    roles = {}
+    try:
+        for mbean, attributes in response['value'].items():
+            properties = dict(prop.split('=', 1) for prop in
+                              mbean.split(':', 1)[1].split(','))
+            roles[properties['name']] = attributes['RaftState']
+    except (AttributeError, KeyError, ValueError) as e:
+        raise IOError('Invalid Jolokia response for the {0} shards of {1}: '
+                      '{2}'.format(datastore, ip, e))
+    return roles
@@ -20,3 +20,56 @@ def mean(samples):
     """
 
     return sum(samples) * 1.0 / len(samples)
+
+
+def median(samples):
+    """
+    Computes the median of a number list
+
+    :param samples: a list of float numbers
+    :returns: the middle number of the sorted list, or the mean of the two \
+        middle numbers for a list of even length
+    :rtype: float
+    :type samples: list<float>
+    """
+
+    ordered = sorted(samples)
+    middle = len(ordered) // 2
+    if len(ordered) % 2 == 1:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2.0
+
+
+def stdev(samples):
+    """
+    Computes the population standard deviation of a number list
+
+    :param samples: a list of float numbers
+    :returns: the standard deviation of the numbers in the list
+    :rtype: float
+    :type samples: list<float>
+    """
+
+    samples_mean = mean(samples)
+    return (sum((sample - samples_mean) ** 2 for sample in samples) * 1.0 /
+            len(samples)) ** 0.5
+
+
+def jain_fairness_index(samples):
+    """
+    Computes Jain's fairness index of the allocations in a number list, \
+        (sum x)^2 / (n * sum x^2). It is 1 when all allocations are equal \
+        and 1/n when a single one gets everything.
+
+    :param samples: a list of non-negative allocations, e.g. the \
+        throughput of every switch
+    :returns: the fairness index, between 1/n and 1, or -1 if all \
+        allocations are zero
+    :rtype: float
+    :type samples: list<float>
+    """
+
+    sum_of_squares = sum(sample ** 2 for sample in samples)
+    if sum_of_squares == 0:
+        return -1
+    return sum(samples) ** 2 * 1.0 / (len(samples) * sum_of_squares)
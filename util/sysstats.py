@@ -8,11 +8,82 @@
 Module with functions for getting system and process statistics
 """
 
-import re
+import json
+import os
+import struct
 import subprocess
 import sys
+import time
+import util.cmdtimings
+import util.localexec
 import util.netutil
 
+# Layout of the ring-buffer file written by the sampling agent
+# (monitors/proc_sampler/proc_sampler.py): a header with the total number of
+# samples written, followed by fixed-size sample records. The record fields
+# are stored in the order of PROC_SAMPLES_FIELDS.
+PROC_SAMPLES_HEADER_FORMAT = '<Q'
+PROC_SAMPLES_RECORD_FORMAT = '<dqqqqq'
+PROC_SAMPLES_FIELDS = ['timestamps', 'cpu_user_time', 'cpu_system_time',
+                       'vm_size', 'num_threads', 'num_fds']
+
+# Shell script that takes a snapshot of all system and process statistics in
+# a single execution and prints it as a JSON document. All values are read
+# from /proc in one pass, so they refer to the same point in time, given by
+# the single timestamp of the snapshot. Process values are -1 if the process
+# does not exist. Backslashes and double quotes are escaped in the printed
+# strings.
+SNAPSHOT_SCRIPT = r'''
+pid={0}
+now=$(date +%s)
+date_str=$(date -d @$now)
+read load1 load5 load15 rest < /proc/loadavg
+set -- $(awk '/^MemTotal:/{{t=$2*1024}} /^MemFree:/{{f=$2*1024}} END{{printf "%.0f %.0f", t, f}}' /proc/meminfo)
+mem_total=$1
+mem_free=$2
+utime=-1
+stime=-1
+vm_size=-1
+threads=-1
+fds=-1
+cwd=-1
+xopts=''
+if [ -r /proc/$pid/stat ]; then
+    stat=$(cat /proc/$pid/stat)
+    set -- ${{stat##*)}}
+    utime=${{12}}
+    stime=${{13}}
+    set -- $(awk '/^VmSize:/{{v=$2*1024}} /^Threads:/{{t=$2}} END{{printf "%.0f %d", v, t}}' /proc/$pid/status)
+    vm_size=$1
+    threads=$2
+    fds=$(ls /proc/$pid/fd 2>/dev/null | wc -l)
+    cwd=$(readlink /proc/$pid/cwd | sed 's/[\\"]/\\&/g')
+    xopts=$(tr '\0' '\n' < /proc/$pid/cmdline | sed 's/[\\"]/\\&/g' | awk '/^-X/{{printf "%s\"%s\"", (n++ ? ", " : ""), $0}}')
+fi
+printf '{{"timestamp": %s, "date": "%s", "total_memory_bytes": %s, ' "$now" "$date_str" "$mem_total"
+printf '"free_memory_bytes": %s, "one_minute_load": %s, ' "$mem_free" "$load1"
+printf '"five_minute_load": %s, "fifteen_minute_load": %s, ' "$load5" "$load15"
+printf '"proc_cpu_user_time": %s, "proc_cpu_system_time": %s, ' "$utime" "$stime"
+printf '"proc_vm_size": %s, "proc_num_threads": %s, ' "$vm_size" "$threads"
+printf '"proc_num_fds": %s, "proc_cwd": "%s", ' "$fds" "$cwd"
+printf '"proc_java_xopts": [%s]}}\n' "$xopts"
+'''
+
+
+def is_remote(ssh_client):
+    """
+    Checks if statistics must be collected over an ssh client. No ssh \
+        client, or the client of a local target, means that statistics are \
+        collected locally.
+
+    :param ssh_client: SSH client provided by paramiko
+    :returns: True for remote collection, False for local collection
+    :rtype: bool
+    :type ssh_client: paramiko.SSHClient
+    """
+    return (ssh_client is not None and
+            not isinstance(ssh_client, util.localexec.LocalClient))
+
 
 def command_exec_wrapper(cmd, ssh_client=None, return_type='str'):
     """
@@ -78,6 +149,204 @@ def get_units_base(unit_key):
         return 1
 
 
+def _sftp_session(ssh_client):
+    """
+    Returns the pooled sftp session with the host of an ssh client (see \
+        util.netutil.ssh_pool_get()). If there is no pooled session, it is \
+        opened over the transport of the ssh client.
+
+    :param ssh_client: SSH client provided by paramiko
+    :returns: sftp session
+    :rtype: paramiko.SFTPClient
+    :type ssh_client: paramiko.SSHClient
+    """
+    transport_layer = ssh_client.get_transport()
+    (ip, ssh_port) = transport_layer.getpeername()[:2]
+    return util.netutil.ssh_pool_get(ip, ssh_port,
+                                     transport_layer.get_username(), None,
+                                     ssh_client)[0]
+
+
+def read_proc_files(paths, ssh_client=None):
+    """
+    Reads a list of /proc files, with os calls locally or over a single \
+        sftp session remotely.
+
+    :param paths: full paths of the files to read
+    :param ssh_client: SSH client provided by paramiko to read the files
+    :returns: dictionary with the content of each file, None for the files \
+        that could not be read
+    :rtype: dict
+    :type paths: list<str>
+    :type ssh_client: paramiko.SSHClient
+    """
+    contents = {}
+    sftp = None
+    if is_remote(ssh_client):
+        sftp = _sftp_session(ssh_client)
+    for path in paths:
+        try:
+            if sftp is None:
+                with open(path, 'rb') as proc_file:
+                    data = proc_file.read()
+            else:
+                with sftp.open(path, 'rb') as proc_file:
+                    data = proc_file.read()
+            contents[path] = data.decode('utf-8', 'replace')
+        except (IOError, OSError):
+            contents[path] = None
+    return contents
+
+
+def list_proc_dir(path, ssh_client=None):
+    """
+    Lists the entries of a /proc directory, with os calls locally or over \
+        sftp remotely.
+
+    :param path: full path of the directory
+    :param ssh_client: SSH client provided by paramiko to list the directory
+    :returns: the directory entries, None if the directory cannot be listed
+    :rtype: list<str>
+    :type path: str
+    :type ssh_client: paramiko.SSHClient
+    """
+    try:
+        if not is_remote(ssh_client):
+            return os.listdir(path)
+        return _sftp_session(ssh_client).listdir(path)
+    except (IOError, OSError):
+        return None
+
+
+def read_proc_link(path, ssh_client=None):
+    """
+    Returns the target of a /proc symbolic link, with os calls locally or \
+        over sftp remotely.
+
+    :param path: full path of the link
+    :param ssh_client: SSH client provided by paramiko to read the link
+    :returns: the link target, '-1' if the link cannot be read
+    :rtype: str
+    :type path: str
+    :type ssh_client: paramiko.SSHClient
+    """
+    try:
+        if not is_remote(ssh_client):
+            return os.readlink(path)
+        return str(_sftp_session(ssh_client).readlink(path))
+    except (IOError, OSError):
+        return '-1'
+
+
+def parse_meminfo(content):
+    """
+    Parses the content of /proc/meminfo
+
+    :param content: the content of /proc/meminfo
+    :returns: dictionary with the value of each field in bytes
+    :rtype: dict
+    :type content: str
+    """
+    meminfo = {}
+    for line in content.splitlines():
+        fields = line.replace(':', ' ').split()
+        if len(fields) < 2:
+            continue
+        unit_base = get_units_base(fields[2]) if len(fields) > 2 else 1
+        meminfo[fields[0]] = int(fields[1]) * unit_base
+    return meminfo
+
+
+def parse_proc_stat(content):
+    """
+    Parses the content of /proc/<pid>/stat. The command name field, which \
+        may contain spaces, is skipped.
+
+    :param content: the content of /proc/<pid>/stat
+    :returns: the fields of the file, indexed as in proc(5) minus one, \
+        e.g. utime (field 14) is at index 13
+    :rtype: list<str>
+    :type content: str
+    """
+    pid_field, rest = content.split(' (', 1)
+    return [pid_field, ''] + rest.rsplit(') ', 1)[1].split()
+
+
+def parse_proc_status(content):
+    """
+    Parses the content of /proc/<pid>/status
+
+    :param content: the content of /proc/<pid>/status
+    :returns: dictionary with the value of each field as a list of strings
+    :rtype: dict
+    :type content: str
+    """
+    status = {}
+    for line in content.splitlines():
+        key, sep, value = line.partition(':')
+        if sep:
+            status[key] = value.split()
+    return status
+
+
+def sys_memory_stats(ssh_client=None):
+    """
+    Returns the system memory statistics, taken from a single read of \
+        /proc/meminfo.
+
+    :param ssh_client: SSH client provided by paramiko to read the file
+    :returns: dictionary with total_memory_bytes, free_memory_bytes and \
+        used_memory_bytes, -1 values if /proc/meminfo cannot be read
+    :rtype: dict
+    :type ssh_client: paramiko.SSHClient
+    """
+    content = read_proc_files(['/proc/meminfo'], ssh_client)['/proc/meminfo']
+    if content is None:
+        return {'total_memory_bytes': -1, 'free_memory_bytes': -1,
+                'used_memory_bytes': -1}
+    meminfo = parse_meminfo(content)
+    return {'total_memory_bytes': meminfo['MemTotal'],
+            'free_memory_bytes': meminfo['MemFree'],
+            'used_memory_bytes': meminfo['MemTotal'] - meminfo['MemFree']}
+
+
+def proc_stats(pid, ssh_client=None):
+    """
+    Returns the statistics of a process, taken from a single read of \
+        /proc/<pid>/stat and /proc/<pid>/status and a single listing of \
+        /proc/<pid>/fd.
+
+    :param pid: the process ID of the target process
+    :param ssh_client: SSH client provided by paramiko to read the files
+    :returns: dictionary with proc_cpu_user_time, proc_cpu_system_time, \
+        proc_vm_size, proc_num_threads and proc_num_fds, -1 values for the \
+        statistics that cannot be read
+    :rtype: dict
+    :type pid: int
+    :type ssh_client: paramiko.SSHClient
+    """
+    stat_path = '/proc/{0}/stat'.format(pid)
+    status_path = '/proc/{0}/status'.format(pid)
+    contents = read_proc_files([stat_path, status_path], ssh_client)
+    stats = {'proc_cpu_user_time': -1.0, 'proc_cpu_system_time': -1.0,
+             'proc_vm_size': -1, 'proc_num_threads': -1, 'proc_num_fds': -1}
+    if contents[stat_path] is not None:
+        stat_fields = parse_proc_stat(contents[stat_path])
+        stats['proc_cpu_user_time'] = float(stat_fields[13])
+        stats['proc_cpu_system_time'] = float(stat_fields[14])
+    if contents[status_path] is not None:
+        status = parse_proc_status(contents[status_path])
+        if 'VmSize' in status:
+            stats['proc_vm_size'] = int(status['VmSize'][0]) * \
+                get_units_base(status['VmSize'][1])
+        if 'Threads' in status:
+            stats['proc_num_threads'] = int(status['Threads'][0])
+    fds = list_proc_dir('/proc/{0}/fd'.format(pid), ssh_client)
+    if fds is not None:
+        stats['proc_num_fds'] = len(fds)
+    return stats
+
+
 def sys_used_ram_mb(ssh_client=None):
     """
     Returns system used memory in MB.
@@ -95,13 +364,16 @@ def sys_nprocs(ssh_client=None):
     """
     Returns the number of CPUs in the system.
 
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: the number of CPUs in the system
     :rtype: int
     :type ssh_client: paramiko.SSHClient
     """
-    return command_exec_wrapper('cat /proc/cpuinfo | grep processor | wc -l',
-                                ssh_client, 'int')
+    content = read_proc_files(['/proc/cpuinfo'], ssh_client)['/proc/cpuinfo']
+    if content is None:
+        return -1
+    return len([line for line in content.splitlines()
+                if line.startswith('processor')])
 
 
 def sys_free_ram_mb(ssh_client=None):
@@ -121,46 +393,36 @@ def sys_used_memory_bytes(ssh_client=None):
     """
     Returns system used memory in bytes.
 
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: The amount of used RAM memory in the system in bytes.
     :rtype: int
     :type ssh_client: paramiko.SSHClient
     """
-    return sys_total_memory_bytes(ssh_client) - sys_free_memory_bytes(ssh_client)
+    return sys_memory_stats(ssh_client)['used_memory_bytes']
 
 
 def sys_free_memory_bytes(ssh_client=None):
     """
     Returns system free memory in bytes
 
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: the amount of free RAM memory in the system in bytes
     :rtype: int
     :type ssh_client: paramiko.SSHClient
     """
-    unit_key = command_exec_wrapper('cat /proc/meminfo | grep MemFree | awk \'{{print $3}}\'',
-                                    ssh_client, 'str')
-    unit_base = get_units_base(unit_key)
-    free_memory = command_exec_wrapper('cat /proc/meminfo | grep MemFree | awk \'{{print $2}}\'',
-                                       ssh_client, 'int')
-    return free_memory * unit_base
+    return sys_memory_stats(ssh_client)['free_memory_bytes']
 
 
 def sys_total_memory_bytes(ssh_client=None):
     """
     Returns system total memory in bytes
 
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: total system memory in bytes
     :rtype: int
     :type ssh_client: paramiko.SSHClient
     """
-    unit_key = command_exec_wrapper('cat /proc/meminfo | grep MemTotal | awk \'{{print $3}}\'',
-                                    ssh_client, 'str')
-    unit_base = get_units_base(unit_key)
-    total_memory = command_exec_wrapper('cat /proc/meminfo | grep MemTotal | awk \'{{print $2}}\'',
-                                        ssh_client, 'int')
-    return total_memory * unit_base
+    return sys_memory_stats(ssh_client)['total_memory_bytes']
 
 
 def sys_iowait_time(ssh_client=None):
@@ -170,14 +432,15 @@ def sys_iowait_time(ssh_client=None):
         outstanding disk I/O operation requested by a task scheduled on that \
         CPU (at the time it generated that I/O request).
 
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: the I/O wait time
     :rtype: float
     :type ssh_client: paramiko.SSHClient
     """
-
-    return command_exec_wrapper('cat /proc/stat | awk \'NR==1 {{print $6}}\'',
-                                ssh_client, 'float')
+    content = read_proc_files(['/proc/stat'], ssh_client)['/proc/stat']
+    if content is None:
+        return -1.0
+    return float(content.split('\n', 1)[0].split()[5])
 
 
 def proc_cmdline(pid, ssh_client=None):
@@ -185,14 +448,17 @@ def proc_cmdline(pid, ssh_client=None):
     Returns the command line of a process as a string.
 
     :param pid: the process ID of the target process
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: The command execution output
     :rtype: str
     :type pid: int
     :type ssh_client: paramiko.SSHClient
     """
-    return command_exec_wrapper("cat /proc/{0}/cmdline".format(pid),
-                                ssh_client, 'str').replace('\x00', '')
+    path = '/proc/{0}/cmdline'.format(pid)
+    content = read_proc_files([path], ssh_client)[path]
+    if not content:
+        return '-1'
+    return content.strip().replace('\x00', '')
 
 
 def proc_cwd(pid, ssh_client=None):
@@ -200,15 +466,13 @@ def proc_cwd(pid, ssh_client=None):
     Method that returns the process current working directory.
 
     :param pid: the process ID of the target process
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: the full path of working directory
     :rtype: str
     :type pid: int
     :type ssh_client: paramiko.SSHClient
     """
-
-    return command_exec_wrapper("pwdx {0} | awk '{{print $2}}'".format(pid),
-                                ssh_client, 'str')
+    return read_proc_link('/proc/{0}/cwd'.format(pid), ssh_client)
 
 
 def proc_cpu_system_time(pid, ssh_client=None):
@@ -216,14 +480,13 @@ def proc_cpu_system_time(pid, ssh_client=None):
     Method that returns the CPU system time of a process.
 
     :param pid: the process ID of the target process
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: the CPU system time of a process
     :rtype: float
     :type pid: int
     :type ssh_client: paramiko.SSHClient
     """
-    return command_exec_wrapper('cat /proc/{0}/stat | awk \' {{ print $15 }} \''.
-                                format(pid), ssh_client, 'float')
+    return proc_stats(pid, ssh_client)['proc_cpu_system_time']
 
 
 def proc_cpu_user_time(pid, ssh_client=None):
@@ -231,14 +494,13 @@ def proc_cpu_user_time(pid, ssh_client=None):
     Method that returns the CPU user time of a process.
 
     :param pid: the process ID of the target process
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: the CPU user time of a process
     :rtype: float
     :type pid: int
     :type ssh_client: paramiko.SSHClient
     """
-    return command_exec_wrapper('cat /proc/{0}/stat | awk \'{{print $14}}\''.
-                                format(pid), ssh_client, 'float')
+    return proc_stats(pid, ssh_client)['proc_cpu_user_time']
 
 
 def proc_vm_size(pid, ssh_client=None):
@@ -246,14 +508,13 @@ def proc_vm_size(pid, ssh_client=None):
     Method that returns the virtual memory size of a process.
 
     :param pid: the process ID of the target process
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: the virtual memory size of a process
     :rtype: int
     :type pid: int
     :type ssh_client: paramiko.SSHClient
     """
-    return (command_exec_wrapper(('cat /proc/{0}/status |grep VmSize | awk \'{{print $2}}\''.
-            format(pid)), ssh_client, 'int') * 1024)
+    return proc_stats(pid, ssh_client)['proc_vm_size']
 
 
 def proc_num_fds(pid, ssh_client=None):
@@ -261,15 +522,13 @@ def proc_num_fds(pid, ssh_client=None):
     Returns the number of file descriptors opened by this process.
 
     :param pid: the process ID of the target process
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: total amount of open files for the specific process ID
     :rtype: int
     :type pid: int
     :type ssh_client: paramiko.SSHClient
     """
-
-    return (command_exec_wrapper('ls -la /proc/{0}/fd | wc -l'.format(pid),
-                                 ssh_client, 'int') - 3)
+    return proc_stats(pid, ssh_client)['proc_num_fds']
 
 
 def proc_num_threads(pid, ssh_client=None):
@@ -277,30 +536,30 @@ def proc_num_threads(pid, ssh_client=None):
     Returns the number of threads used by this process.
 
     :param pid: the process ID of the target process
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: the number of threads for the specific pid
     :rtype: int
     :type pid: int
     :type ssh_client: paramiko.SSHClient
     """
-    return command_exec_wrapper(('cat /proc/{0}/status |grep Threads | awk \'{{print $2}}\''.
-                                 format(pid)), ssh_client, 'int')
+    return proc_stats(pid, ssh_client)['proc_num_threads']
 
 
 def sys_load_average(ssh_client=None):
     """
     Returns the system load average.
 
-    :param ssh_client: SSH client provided by paramiko to run the command
-    :returns: tuple of floats with the 1-,5- and 15-min load average
+    :param ssh_client: SSH client provided by paramiko to read the files
+    :returns: tuple of floats with the 1-,5- and 15-min load average, -1 \
+        values if /proc/loadavg cannot be read
     :rtype: tuple<float>
     :type ssh_client: paramiko.SSHClient
     """
-    cmd_output = command_exec_wrapper('uptime', ssh_client, 'str')
-    matches = re.search(r'load average: (.+), (.+), (.+)', cmd_output.strip())
-    return (float(matches.group(1)),
-            float(matches.group(2)),
-            float(matches.group(3)))
+    content = read_proc_files(['/proc/loadavg'], ssh_client)['/proc/loadavg']
+    if content is None:
+        return (-1.0, -1.0, -1.0)
+    loads = content.split()
+    return (float(loads[0]), float(loads[1]), float(loads[2]))
 
 
 def get_java_options(pid, ssh_client=None):
@@ -308,14 +567,112 @@ def get_java_options(pid, ssh_client=None):
     Returns a list with all java options of a process defined by its process ID
 
     :param pid: process id of the process we want to get the javaopts
-    :param ssh_client: SSH client provided by paramiko to run the command
+    :param ssh_client: SSH client provided by paramiko to read the files
     :returns: a list with all java options
     :rtype: list<str>
     :type pid: int
     :type ssh_client: paramiko.SSHClient
     """
-    cmd_output = command_exec_wrapper('ps -ef | grep \' {0} \''.format(pid),
-                                      ssh_client, 'str')
-    java_options = \
-        [o for o in cmd_output.strip().split() if o.startswith('-X')]
-    return java_options
+    path = '/proc/{0}/cmdline'.format(pid)
+    content = read_proc_files([path], ssh_client)[path]
+    if content is None:
+        return []
+    return [o for o in content.split('\x00') if o.startswith('-X')]
+
+
+@util.cmdtimings.measurement
+def sys_proc_snapshot(pid, ssh_client=None):
+    """
+    Returns a snapshot of the system statistics and of the statistics of a \
+        process. Remotely, the snapshot is collected in a single command \
+        execution, which prints all statistics as a JSON document. Locally, \
+        the /proc files are read and parsed directly. In both cases the \
+        snapshot refers to a single point in time, given by its timestamp.
+
+    :param pid: the process ID of the target process
+    :param ssh_client: SSH client provided by paramiko to run the command
+    :returns: dictionary with the system statistics (timestamp, date, \
+        total_memory_bytes, free_memory_bytes, used_memory_bytes, \
+        one_minute_load, five_minute_load, fifteen_minute_load) and the \
+        process statistics (proc_cpu_user_time, proc_cpu_system_time, \
+        proc_vm_size, proc_num_threads, proc_num_fds, proc_cwd, \
+        proc_java_xopts)
+    :rtype: dict
+    :type pid: int
+    :type ssh_client: paramiko.SSHClient
+    :raises ValueError: if the command output is not a valid JSON document
+    """
+    if not is_remote(ssh_client):
+        now = time.time()
+        snapshot = {'timestamp': int(now),
+                    'date': time.strftime('%a %b %d %H:%M:%S %Z %Y',
+                                          time.localtime(now))}
+        (snapshot['one_minute_load'], snapshot['five_minute_load'],
+         snapshot['fifteen_minute_load']) = sys_load_average()
+        snapshot.update(sys_memory_stats())
+        snapshot.update(proc_stats(pid))
+        snapshot['proc_cwd'] = proc_cwd(pid)
+        snapshot['proc_java_xopts'] = get_java_options(pid)
+        return snapshot
+    cmd_output = util.netutil.ssh_run_command(
+        ssh_client, SNAPSHOT_SCRIPT.format(pid), print_flag=False)[1]
+    snapshot = json.loads(cmd_output.strip())
+    snapshot['used_memory_bytes'] = (snapshot['total_memory_bytes'] -
+                                     snapshot['free_memory_bytes'])
+    snapshot['proc_cpu_user_time'] = float(snapshot['proc_cpu_user_time'])
+    snapshot['proc_cpu_system_time'] = \
+        float(snapshot['proc_cpu_system_time'])
+    snapshot['proc_cwd'] = str(snapshot['proc_cwd'])
+    return snapshot
+
+
+def parse_proc_samples(data):
+    """
+    Parses the content of the ring-buffer file written by the sampling \
+        agent into compact arrays, one per sampled value, in chronological \
+        order.
+
+    :param data: the content of the ring-buffer file
+    :returns: dictionary with an array for each field of \
+        PROC_SAMPLES_FIELDS. Timestamps are rounded to milliseconds.
+    :rtype: dict
+    :type data: bytes
+    """
+    header_size = struct.calcsize(PROC_SAMPLES_HEADER_FORMAT)
+    record_size = struct.calcsize(PROC_SAMPLES_RECORD_FORMAT)
+    series = dict((field, []) for field in PROC_SAMPLES_FIELDS)
+    if len(data) < header_size:
+        return series
+    num_samples = struct.unpack_from(PROC_SAMPLES_HEADER_FORMAT, data, 0)[0]
+    capacity = (len(data) - header_size) // record_size
+    if capacity == 0:
+        return series
+    for sample_id in range(max(0, num_samples - capacity), num_samples):
+        record = struct.unpack_from(
+            PROC_SAMPLES_RECORD_FORMAT, data,
+            header_size + (sample_id % capacity) * record_size)
+        for field, value in zip(PROC_SAMPLES_FIELDS, record):
+            series[field].append(value)
+    series['timestamps'] = [round(t, 3) for t in series['timestamps']]
+    return series
+
+
+def slice_proc_samples(series, t_from=None, t_to=None):
+    """
+    Returns the part of a series of process samples that was taken in the \
+        time window (t_from, t_to]
+
+    :param series: process samples as returned by parse_proc_samples()
+    :param t_from: start of the time window (exclusive), None for no limit
+    :param t_to: end of the time window (inclusive), None for no limit
+    :returns: dictionary with an array for each field of PROC_SAMPLES_FIELDS
+    :rtype: dict
+    :type series: dict
+    :type t_from: float
+    :type t_to: float
+    """
+    indices = [i for i, t in enumerate(series['timestamps'])
+               if (t_from is None or t > t_from) and
+               (t_to is None or t <= t_to)]
+    return dict((field, [series[field][i] for i in indices])
+                for field in PROC_SAMPLES_FIELDS)
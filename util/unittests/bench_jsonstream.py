@@ -0,0 +1,119 @@
+#! /usr/bin/env python3
+
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Benchmark of the flow counting of util/jsonstream.py against json.loads(),
+on synthetic operational inventories of 10k to 1M flows. For every size it
+prints the counting time and the peak memory allocated while counting. The
+time includes the generation of the synthetic document.
+
+Usage: python3 util/unittests/bench_jsonstream.py [--flows N [N ...]]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+import util.jsonstream
+import util.restconf
+
+FLOWS_PER_SWITCH = 1000
+
+FLOW_TEMPLATE = (
+    '{{"id":"nstat-flow-{0}","priority":{1},"table_id":0,'
+    '"hard-timeout":0,"idle-timeout":0,"cookie":{0},'
+    '"opendaylight-flow-statistics:flow-statistics":{{"packet-count":0,'
+    '"byte-count":0,"duration":{{"second":12,"nanosecond":345}}}},'
+    '"match":{{"ethernet-match":{{"ethernet-type":{{"type":2048}}}},'
+    '"ipv4-destination":"10.{2}.{3}.{4}/32"}},'
+    '"instructions":{{"instruction":[{{"order":0,"apply-actions":'
+    '{{"action":[{{"order":0,"drop-action":{{}}}}]}}}}]}}}}')
+
+
+def inventory_chunks(total_flows):
+    """
+    Generates a synthetic opendaylight-inventory:nodes document, one switch \
+        at a time
+
+    :param total_flows: number of flows in the inventory
+    :returns: generator of the chunks of the document
+    :rtype: generator<bytes>
+    :type total_flows: int
+    """
+    yield b'{"nodes":{"node":['
+    switches = max(1, total_flows // FLOWS_PER_SWITCH)
+    flow_id = 0
+    for switch_id in range(switches):
+        flows = []
+        while flow_id < total_flows * (switch_id + 1) // switches:
+            flows.append(FLOW_TEMPLATE.format(
+                flow_id, flow_id % 100, (flow_id >> 16) & 255,
+                (flow_id >> 8) & 255, flow_id & 255))
+            flow_id += 1
+        yield ('{0}{{"id":"openflow:{1}","flow-node-inventory:table":'
+               '[{{"id":0,"flow":[{2}]}}]}}'.format(
+                   ',' if switch_id else '', switch_id + 1,
+                   ','.join(flows))).encode()
+    yield b']}}'
+
+
+def measure(count_function, total_flows):
+    """
+    Measures the time and peak memory of a counting function. Memory is \
+        traced in a separate run, since tracing slows down allocations.
+
+    :param count_function: function counting the flows of the document \
+        chunks it is given
+    :param total_flows: number of flows in the inventory
+    :returns: counted flows, seconds and peak memory in MB
+    :rtype: tuple
+    :type count_function: function
+    :type total_flows: int
+    """
+    t_start = time.time()
+    flows = count_function(inventory_chunks(total_flows))
+    elapsed = time.time() - t_start
+    tracemalloc.start()
+    count_function(inventory_chunks(total_flows))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (flows, elapsed, float(peak) / 2 ** 20)
+
+
+def count_streaming(chunks):
+    """Counts the flows with the incremental counter"""
+    (path, items_path, member, prefix) = util.restconf.OPER_QUERIES['flows']
+    counter = util.jsonstream.JsonItemCounter(items_path, member, prefix)
+    for chunk in chunks:
+        counter.feed(chunk)
+    return counter.close()
+
+
+def count_loading(chunks):
+    """Counts the flows after loading the whole document"""
+    document = json.loads(b''.join(chunks).decode('utf-8'))
+    return sum(len(table.get('flow', []))
+               for node in document['nodes']['node']
+               for table in node['flow-node-inventory:table'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--flows', type=int, nargs='+',
+                        default=[10000, 100000, 1000000],
+                        help='inventory sizes in flows')
+    args = parser.parse_args()
+    print('{0:>10} {1:>12} {2:>12} {3:>12} {4:>12}'.format(
+        'flows', 'stream (s)', 'stream (MB)', 'load (s)', 'load (MB)'))
+    for total_flows in args.flows:
+        (stream_flows, stream_secs, stream_mb) = measure(count_streaming,
+                                                         total_flows)
+        (load_flows, load_secs, load_mb) = measure(count_loading, total_flows)
+        assert stream_flows == load_flows == total_flows
+        print('{0:>10} {1:>12.2f} {2:>12.1f} {3:>12.2f} {4:>12.1f}'.format(
+            total_flows, stream_secs, stream_mb, load_secs, load_mb))
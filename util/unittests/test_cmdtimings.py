@@ -0,0 +1,84 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for util/cmdtimings.py."""
+
+import logging
+import sys
+import unittest
+import util.cmdtimings
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+
+class CmdTimingsTest(unittest.TestCase):
+    """Unittests for the command timing instrumentation in
+    util/cmdtimings.py
+    """
+
+    def setUp(self):
+        """Discards timings recorded by previous tests
+        """
+        util.cmdtimings.drain()
+
+    def test_handler_name(self):
+        """handler_name() returns the handler script of a command line
+        """
+        self.assertEqual(util.cmdtimings.handler_name(
+            'sudo python3.4 /opt/nstat/handlers/status.py 8181'),
+            'status.py')
+        self.assertEqual(util.cmdtimings.handler_name(
+            'cd /opt/multinet; ./build.sh'), 'build.sh')
+        self.assertEqual(util.cmdtimings.handler_name(
+            'sudo ps -p 1234 -o pid'), 'ps')
+
+    def test_histogram(self):
+        """histogram() counts timings into the right buckets
+        """
+        hist = util.cmdtimings.histogram([0.5, 3, 3, 20000])
+        self.assertEqual(hist['count'], 4)
+        self.assertEqual(hist['counts'][0], 1)
+        self.assertEqual(hist['counts'][2], 2)
+        self.assertEqual(hist['counts'][-1], 1)
+        self.assertEqual(hist['min_ms'], 0.5)
+        self.assertEqual(hist['max_ms'], 20000)
+
+    def test_drain(self):
+        """drain() returns the histograms per handler and clears them. Only
+        the calls made inside measurement() functions are overhead.
+        """
+        @util.cmdtimings.measurement
+        def probe():
+            util.cmdtimings.record('status.py', 'exec', 5)
+            util.cmdtimings.record('status.py', 'completion', 30)
+            nested_probe()
+
+        @util.cmdtimings.measurement
+        def nested_probe():
+            util.cmdtimings.record('status.py', 'completion', 50)
+
+        probe()
+        util.cmdtimings.record('ssh_connect', 'connect', 100)
+        util.cmdtimings.record('start.sh', 'completion', 2000)
+        self.assertEqual(util.cmdtimings.call_kind(), 'lifecycle')
+        timings = util.cmdtimings.drain()
+        self.assertEqual(timings['overhead_ms'], 80)
+        self.assertEqual(timings['lifecycle_ms'], 2100)
+        self.assertEqual(
+            timings['handlers']['status.py']['completion']['count'], 2)
+        self.assertEqual(timings['bucket_bounds_ms'][-1], -1)
+        timings = util.cmdtimings.drain()
+        self.assertEqual(timings['handlers'], {})
+        self.assertEqual(timings['overhead_ms'], 0)
+
+
+if __name__ == '__main__':
+    SUITE_CMDTIMINGSTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(CmdTimingsTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_CMDTIMINGSTEST)
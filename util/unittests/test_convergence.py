@@ -0,0 +1,121 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for util/convergence.py."""
+
+import logging
+import sys
+import unittest
+import util.convergence
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+
+class FakeClock:
+    """Simulated time, advanced only by sleeping
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        """Returns the simulated time
+        """
+        return self.now
+
+    def sleep(self, secs):
+        """Advances the simulated time
+        """
+        self.now += secs
+
+
+class ConvergenceTest(unittest.TestCase):
+    """Unittests for the convergence detector in util/convergence.py
+    """
+
+    def setUp(self):
+        """Creates the simulated clock
+        """
+        self.clock = FakeClock()
+
+    def detector(self, expected_value, idle_deadline_secs=10):
+        """Creates a detector running on the simulated clock
+        """
+        return util.convergence.ConvergenceDetector(
+            expected_value, idle_deadline_secs, sleep=self.clock.sleep,
+            clock=self.clock.time)
+
+    def test_linear_growth(self):
+        """The completion instant lies within the reported error bound
+        """
+        # 100 items per second, complete at 7.3 seconds
+        def probe():
+            return min(730, int(self.clock.time() * 100))
+        outcome = self.detector(730).run(probe, 0.0)
+        self.assertTrue(outcome['converged'])
+        self.assertEqual(outcome['value'], 730)
+        self.assertTrue(abs(outcome['time'] - 7.3) <= outcome['error_secs'])
+        # Polling accelerates near completion
+        self.assertTrue(outcome['error_secs'] < 0.5)
+
+    def test_plateau_backoff(self):
+        """Polls back off while the value does not change
+        """
+        def probe():
+            return 0 if self.clock.time() < 30 else 10
+        outcome = self.detector(10, idle_deadline_secs=60).run(probe, 0.0)
+        self.assertTrue(outcome['converged'])
+        # A poll per second would have taken 31 polls
+        self.assertTrue(outcome['probes'] < 25)
+        self.assertTrue(abs(outcome['time'] - 30) <= outcome['error_secs'])
+
+    def test_idle_deadline(self):
+        """Stops without convergence when the value stops changing
+        """
+        values = iter([1, 2, 3])
+
+        def probe():
+            return next(values, 3)
+        outcome = self.detector(5).run(probe)
+        self.assertFalse(outcome['converged'])
+        self.assertEqual(outcome['value'], 3)
+        self.assertEqual(outcome['max_value'], 3)
+        self.assertTrue(self.clock.time() > 10)
+
+    def test_failed_probes(self):
+        """Failed polls keep the previous value
+        """
+        values = iter([4, -1, -1, 8])
+        outcome = self.detector(8).run(lambda: next(values))
+        self.assertTrue(outcome['converged'])
+        self.assertEqual(outcome['probes'], 4)
+
+    def test_failed_first_probes(self):
+        """Failed polls before the first successful one never converge
+        """
+        values = iter([-1, -1, 3, 0])
+        outcome = self.detector(0).run(lambda: next(values))
+        self.assertTrue(outcome['converged'])
+        self.assertEqual(outcome['probes'], 4)
+        self.assertEqual(outcome['max_value'], 3)
+
+    def test_next_interval(self):
+        """Intervals are clamped between the minimum and maximum
+        """
+        detector = self.detector(100)
+        self.assertEqual(detector.next_interval(1.0, 50, None), 2.0)
+        self.assertEqual(detector.next_interval(0.2, 50, None), 0.4)
+        self.assertEqual(detector.next_interval(1.0, 10, 10.0), 0.5)
+        self.assertEqual(detector.next_interval(1.0, 1, 1000.0), 0.1)
+
+
+if __name__ == '__main__':
+    SUITE_CONVERGENCETEST = unittest.TestLoader().\
+        loadTestsFromTestCase(ConvergenceTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_CONVERGENCETEST)
@@ -0,0 +1,99 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for util/jsonstream.py."""
+
+import json
+import logging
+import sys
+import unittest
+import util.jsonstream
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+FLOWS_PATH = ('nodes', 'node', '*', 'flow-node-inventory:table', '*', 'flow',
+              '*')
+
+INVENTORY = {'nodes': {'node': [
+    {'id': 'openflow:1',
+     'description': 'braces in strings } ] { [ and "quotes"',
+     'flow-node-inventory:table': [
+         {'id': 0,
+          'flow': [{'id': 'a', 'match': {'flow': [1, 2, 3]}},
+                   {'id': 'bé', 'instructions': [[], {}]}]},
+         {'id': 1, 'flow': []}]},
+    {'flow-node-inventory:table': [{'id': 0, 'flow': [{'id': 'c'}]}],
+     'id': 'openflow:2'},
+    {'id': 'other:3', 'flow-node-inventory:table': []}]}}
+
+
+class JsonStreamTest(unittest.TestCase):
+    """Unittests for the incremental JSON counter in util/jsonstream.py
+    """
+
+    def count(self, document, path, member=None, prefix='', chunk_size=None):
+        """Feeds a document to a counter in chunks of chunk_size bytes
+        """
+        data = document.encode('utf-8')
+        if chunk_size is None:
+            chunk_size = len(data)
+        counter = util.jsonstream.JsonItemCounter(path, member, prefix)
+        for chunk_start in range(0, len(data), chunk_size):
+            counter.feed(data[chunk_start:chunk_start + chunk_size])
+        return counter.close()
+
+    def test_count_items(self):
+        """Counts the items at a path, ignoring other arrays and strings
+        """
+        document = json.dumps(INVENTORY, ensure_ascii=False)
+        self.assertEqual(self.count(document, FLOWS_PATH), 3)
+        self.assertEqual(self.count(document, ('nodes', 'node', '*')), 3)
+
+    def test_count_member_prefix(self):
+        """Counts only the items with a matching member, wherever it is
+        """
+        document = json.dumps(INVENTORY, ensure_ascii=False)
+        self.assertEqual(self.count(document, ('nodes', 'node', '*'), 'id',
+                                    'openflow:'), 2)
+
+    def test_count_member_scalar(self):
+        """Scalars other than strings are matched by their JSON text
+        """
+        document = json.dumps({'devices': [{'id': 'of:1', 'available': True},
+                                           {'id': 'of:2', 'available': False},
+                                           {'available': True, 'id': 'of:3'}]})
+        for chunk_size in [None, 1, 3]:
+            self.assertEqual(self.count(document, ('devices', '*'),
+                                        'available', 'true',
+                                        chunk_size=chunk_size), 2)
+
+    def test_chunk_boundaries(self):
+        """Same counts for any split of the document into chunks
+        """
+        document = json.dumps(INVENTORY, ensure_ascii=False, indent=1)
+        for chunk_size in range(1, 16):
+            self.assertEqual(self.count(document, FLOWS_PATH,
+                                        chunk_size=chunk_size), 3)
+            self.assertEqual(self.count(document, ('nodes', 'node', '*'),
+                                        'id', 'openflow:',
+                                        chunk_size=chunk_size), 2)
+
+    def test_invalid_document(self):
+        """Truncated documents are detected
+        """
+        document = json.dumps(INVENTORY)
+        with self.assertRaises(ValueError):
+            self.count(document[:-5], FLOWS_PATH)
+        self.assertEqual(self.count('{}', FLOWS_PATH), 0)
+
+
+if __name__ == '__main__':
+    SUITE_JSONSTREAMTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(JsonStreamTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_JSONSTREAMTEST)
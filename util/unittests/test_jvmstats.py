@@ -0,0 +1,80 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for util/jvmstats.py."""
+
+import logging
+import sys
+import unittest
+import util.jvmstats
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+# Timestamped jstat -gc output of a Java 8 JVM
+JSTAT_JAVA8 = '''\
+100.000 S0C    S1C    S0U    S1U      EC       EU        OC         OU       MC     MU    CCSC   CCSU   YGC     YGCT    FGC    FGCT     GCT
+100.000 0.0   4096.0  0.0   4096.0 524288.0 102400.0 1048576.0   204800.0  65536.0 60000.0 8192.0 7000.0     10    0.200   0      0.000    0.200
+101.000 0.0   4096.0  0.0   4096.0 524288.0 204800.0 1048576.0   204800.0  65536.0 60000.0 8192.0 7000.0     10    0.200   0      0.000    0.200
+102.000 0.0   4096.0  0.0   2048.0 524288.0  51200.0 1048576.0   307200.0  65536.0 60000.0 8192.0 7000.0     11    0.250   0      0.000    0.250
+103.000 0.0   4096.0  0.0   2048.0 524288.0  51200.0 1048576.0   102400.0  65536.0 60000.0 8192.0 7000.0     13    0.290   1      0.500    0.790
+103.500 0.0   4096.0  0.0   2048.0 524288.0  51200.0 10485
+'''
+
+# Timestamped jstat -gc -t output of a Java 7 JVM
+JSTAT_JAVA7 = '''\
+200.000 Timestamp        S0C    S1C    S0U    S1U      EC       EU        OC         OU       PC     PU    YGC     YGCT    FGC    FGCT     GCT
+200.000         5000.0 1024.0 1024.0  0.0   512.0   8192.0   4096.0   20480.0    10240.0   16384.0 12000.0      3    0.030   0      0.000    0.030
+'''
+
+
+class JvmStatsTest(unittest.TestCase):
+    """Unittests for the JVM GC statistics in util/jvmstats.py
+    """
+
+    def test_parse_gc_samples(self):
+        """Parses jstat -gc output of Java 8 and Java 7 JVMs
+        """
+        series = util.jvmstats.parse_gc_samples(JSTAT_JAVA8)
+        self.assertEqual(series['timestamps'],
+                         [100.0, 101.0, 102.0, 103.0])
+        self.assertEqual(series['eden_used_kb'][1], 204800.0)
+        self.assertEqual(series['survivor_used_kb'][0], 4096.0)
+        self.assertEqual(series['metaspace_used_kb'][0], 60000.0)
+        self.assertEqual(series['young_gc_count'], [10, 10, 11, 13])
+        self.assertEqual(series['full_gc_count'], [0, 0, 0, 1])
+        series = util.jvmstats.parse_gc_samples(JSTAT_JAVA7)
+        self.assertEqual(series['timestamps'], [200.0])
+        self.assertEqual(series['survivor_used_kb'], [512.0])
+        self.assertEqual(series['metaspace_used_kb'], [12000.0])
+        self.assertEqual(series['young_gc_count'], [3])
+
+    def test_summarize_gc_samples(self):
+        """Summarizes the GC activity in a time window
+        """
+        series = util.jvmstats.parse_gc_samples(JSTAT_JAVA8)
+        window = util.jvmstats.slice_gc_samples(series, 101.0, None)
+        self.assertEqual(window['timestamps'], [102.0, 103.0])
+        summary = util.jvmstats.summarize_gc_samples(
+            window, util.jvmstats.slice_gc_samples(series, None, 101.0))
+        self.assertEqual(summary['gc_count'], 4)
+        self.assertAlmostEqual(summary['gc_time_ms'], 590.0)
+        # Two young and one full collection in 540 ms
+        self.assertAlmostEqual(summary['gc_max_pause_ms'], 180.0)
+        self.assertEqual(summary['old_used_max_bytes'], 307200 * 1024)
+        self.assertEqual(summary['heap_used_max_bytes'],
+                         (51200 + 2048 + 307200) * 1024)
+        empty = util.jvmstats.slice_gc_samples(series, 200.0, None)
+        self.assertEqual(util.jvmstats.summarize_gc_samples(empty)
+                         ['gc_count'], -1)
+
+
+if __name__ == '__main__':
+    SUITE_JVMSTATSTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(JvmStatsTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_JVMSTATSTEST)
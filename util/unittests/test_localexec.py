@@ -0,0 +1,86 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for util/localexec.py."""
+
+import getpass
+import logging
+import os
+import queue
+import sys
+import time
+import unittest
+import util.localexec
+import util.netutil
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+
+class LocalExecTest(unittest.TestCase):
+    """Unittests for the local-execution fast path in util/localexec.py
+    """
+
+    def test_is_local_target(self):
+        """is_local_target() for local and remote targets
+        """
+        self.assertTrue(util.localexec.is_local_target(
+            '127.0.0.1', 22, getpass.getuser()))
+        self.assertFalse(util.localexec.is_local_target(
+            '127.0.0.1', 2222, getpass.getuser()))
+        self.assertFalse(util.localexec.is_local_target(
+            '127.0.0.1', 22, getpass.getuser() + '_other'))
+
+    def test_run_command(self):
+        """run_command() returns exit status and output, fills the queue
+        """
+        lines_queue = queue.Queue()
+        exit_status, cmd_output = util.localexec.run_command(
+            'echo first; echo second; exit 3', lines_queue=lines_queue)
+        self.assertEqual(exit_status, 3)
+        self.assertEqual(cmd_output, 'first\nsecond\n')
+        self.assertEqual(list(lines_queue.queue), ['first', 'second'])
+
+    def test_run_command_spool(self):
+        """run_command() spools the output to a file, splitting multi-byte
+        characters and lines across reads correctly
+        """
+        spool_path = '/tmp/nstat_test_localexec.spool'
+        lines_queue = queue.Queue()
+        exit_status, cmd_output = util.localexec.run_command(
+            'printf "\\316"; sleep 0.2; printf "\\261 line\\nlast"',
+            lines_queue=lines_queue, spool_path=spool_path)
+        self.assertEqual((exit_status, cmd_output), (0, spool_path))
+        with open(spool_path, encoding='utf-8') as spool_file:
+            self.assertEqual(spool_file.read(), '\u03b1 line\nlast')
+        self.assertEqual(list(lines_queue.queue), ['\u03b1 line', 'last'])
+        os.remove(spool_path)
+
+    def test_run_command_background(self):
+        """run_command() returns when the command exits, even if a
+        background process keeps its output pipe open
+        """
+        t_start = time.time()
+        exit_status = util.localexec.run_command('(sleep 5 &); exit 0')[0]
+        self.assertEqual(exit_status, 0)
+        self.assertTrue(time.time() - t_start < 5)
+
+    def test_ssh_run_command_local(self):
+        """ssh_run_command() runs locally with the client of a local target
+        """
+        ssh_client = util.netutil.ssh_connect_or_return(
+            '127.0.0.1', 22, getpass.getuser(), '', 1)
+        self.assertIsInstance(ssh_client, util.localexec.LocalClient)
+        self.assertEqual(util.netutil.ssh_run_command(ssh_client, 'pwd'),
+                         (0, os.getcwd() + '\n'))
+
+
+if __name__ == '__main__':
+    SUITE_LOCALEXECTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(LocalExecTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_LOCALEXECTEST)
@@ -0,0 +1,91 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for util/logchunks.py."""
+
+import gzip
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import util.logchunks
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+# Log lines collected for (sweep point, sample id)
+LOG_CHUNKS = [((0, 0), b'bundle started\n'),
+              ((0, 1), b'switch openflow:1 connected\n'),
+              ((0, 1), b'switch openflow:2 connected\n'),
+              ((1, 2), b'restarted\n')]
+
+
+class LogChunksTest(unittest.TestCase):
+    """Unittests for the tagged compressed logs of util/logchunks.py
+    """
+
+    def setUp(self):
+        """Collects LOG_CHUNKS in a temporary directory
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.test_dir, 'controller_log.gz')
+        self.index_path = os.path.join(self.test_dir,
+                                       'controller_log.index')
+        log_offset = 0
+        for (sweep_point_id, global_sample_id), data in LOG_CHUNKS:
+            util.logchunks.append_chunk(
+                self.log_path, self.index_path, gzip.compress(data),
+                {'sweep_point_id': sweep_point_id,
+                 'global_sample_id': global_sample_id},
+                log_offset, log_offset + len(data))
+            log_offset += len(data)
+
+    def tearDown(self):
+        """Removes the temporary directory
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_whole_log(self):
+        """The collected log decompresses to the whole log
+        """
+        with gzip.open(self.log_path) as log_file:
+            self.assertEqual(log_file.read(),
+                             b''.join(data for tags, data in LOG_CHUNKS))
+
+    def test_read_index(self):
+        """read_index() returns a record per chunk and skips cut lines
+        """
+        with open(self.index_path, 'a') as index_file:
+            index_file.write('{"offset": 1')
+        records = util.logchunks.read_index(self.index_path)
+        self.assertEqual(len(records), 4)
+        self.assertEqual(records[0]['offset'], 0)
+        self.assertEqual(records[1]['offset'], records[0]['length'])
+        self.assertEqual([record['log_to'] for record in records],
+                         [15, 43, 71, 81])
+
+    def test_extract_chunks(self):
+        """extract_chunks() returns the log of a sample or a sweep point
+        """
+        self.assertEqual(util.logchunks.extract_chunks(
+            self.log_path, self.index_path, global_sample_id=1),
+            b'switch openflow:1 connected\nswitch openflow:2 connected\n')
+        self.assertEqual(util.logchunks.extract_chunks(
+            self.log_path, self.index_path, sweep_point_id=1),
+            b'restarted\n')
+        self.assertEqual(util.logchunks.extract_chunks(
+            self.log_path, self.index_path, sweep_point_id=1,
+            global_sample_id=0), b'')
+
+
+if __name__ == '__main__':
+    SUITE_LOGCHUNKSTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(LogChunksTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_LOGCHUNKSTEST)
@@ -0,0 +1,120 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for util/mtcbench.py."""
+
+import logging
+import sys
+import unittest
+import util.mtcbench
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+# Output of an MTCBench run with 4 switches, one of them starved
+MTCBENCH_OUTPUT = '''\
+cbench: controller benchmarking tool
+connecting to controller at 127.0.0.1:6653
+12:00:01.123 4  switches: flows/sec:  3000  3000  2000  0   total = 8.000000 per ms
+12:00:02.123 4  switches: flows/sec:  2500  2500  2500  2500   total = 10.000000 per ms
+RESULT: 4 switches 2 tests min/max/avg/stdev = 8000.00/10000.00/9000.00/1000.00 responses/s
+'''
+
+
+class MtcbenchTest(unittest.TestCase):
+    """Unittests for the MTCBench output parser in util/mtcbench.py
+    """
+
+    def test_parse_repeat_line(self):
+        """parse_repeat_line() returns the per switch responses and
+        throughput of the repeat lines only
+        """
+        lines = MTCBENCH_OUTPUT.splitlines()
+        repeats = [util.mtcbench.parse_repeat_line(line) for line in lines]
+        self.assertEqual(repeats[:2], [None, None])
+        self.assertEqual(repeats[4], None)
+        self.assertEqual(repeats[2]['throughput_responses_sec'], 8000.0)
+        self.assertEqual(repeats[2]['switch_responses'],
+                         [3000, 3000, 2000, 0])
+        self.assertEqual(repeats[2]['switch_throughput_responses_sec'],
+                         [3000.0, 3000.0, 2000.0, 0.0])
+        self.assertEqual(repeats[3]['switch_throughput_responses_sec'],
+                         [2500.0] * 4)
+        idle = util.mtcbench.parse_repeat_line(
+            '12:00:03.123 2  switches: flows/sec:  0  0   total = 0.000000 '
+            'per ms')
+        self.assertEqual(idle['switch_throughput_responses_sec'], [0.0, 0.0])
+
+    def test_parse_summary_line(self):
+        """parse_summary_line() returns the statistics of the total
+        throughput over the repeats
+        """
+        summaries = [util.mtcbench.parse_summary_line(line)
+                     for line in MTCBENCH_OUTPUT.splitlines()]
+        self.assertEqual(summaries[:4], [None] * 4)
+        self.assertEqual(summaries[4],
+                         {'throughput_min_responses_sec': 8000.0,
+                          'throughput_max_responses_sec': 10000.0,
+                          'throughput_avg_responses_sec': 9000.0,
+                          'throughput_stdev_responses_sec': 1000.0})
+
+    def test_summarize_switch_throughput(self):
+        """summarize_switch_throughput() detects the starved switch
+        """
+        summary = util.mtcbench.summarize_switch_throughput(
+            [3000.0, 3000.0, 2000.0, 0.0])
+        self.assertEqual(summary['switch_throughput_min'], 0.0)
+        self.assertEqual(summary['switch_throughput_max'], 3000.0)
+        self.assertEqual(summary['switch_throughput_avg'], 2000.0)
+        self.assertAlmostEqual(summary['fairness_index'],
+                               8000.0 ** 2 / (4 * 22000000.0))
+        self.assertEqual(util.mtcbench.summarize_switch_throughput(
+            [2500.0] * 4)['fairness_index'], 1.0)
+        self.assertEqual(util.mtcbench.summarize_switch_throughput(
+            [])['fairness_index'], -1)
+
+    def test_repeat_aligner(self):
+        """RepeatAligner combines the same repeat of every node, once every
+        node has reported it
+        """
+        aligner = util.mtcbench.RepeatAligner(['n1', 'n2'])
+        repeats = [util.mtcbench.parse_repeat_line(line) for line in
+                   MTCBENCH_OUTPUT.splitlines()[2:4]]
+        self.assertEqual(aligner.add('n1', repeats[0], 10.0), [])
+        self.assertEqual(aligner.add('n1', repeats[1], 11.0), [])
+        self.assertEqual(aligner.unaligned(), 2)
+        combined = aligner.add('n2', repeats[1], 10.25)
+        self.assertEqual(len(combined), 1)
+        self.assertEqual(combined[0]['throughput_responses_sec'], 18000.0)
+        self.assertEqual(combined[0]['node_throughput_responses_sec'],
+                         {'n1': 8000.0, 'n2': 10000.0})
+        self.assertEqual(combined[0]['switch_responses'],
+                         [3000, 3000, 2000, 0, 2500, 2500, 2500, 2500])
+        self.assertEqual(len(combined[0]['switch_throughput_responses_sec']),
+                         8)
+        self.assertEqual(combined[0]['alignment_skew_secs'], 0.25)
+        self.assertEqual(aligner.unaligned(), 1)
+
+    def test_combine_summaries(self):
+        """combine_summaries() sums the average throughput of the nodes
+        """
+        summary = util.mtcbench.parse_summary_line(
+            MTCBENCH_OUTPUT.splitlines()[4])
+        self.assertEqual(util.mtcbench.combine_summaries({'n1': summary}),
+                         summary)
+        self.assertEqual(
+            util.mtcbench.combine_summaries({'n1': summary, 'n2': summary}),
+            {'throughput_avg_responses_sec': 18000.0,
+             'node_throughput_avg_responses_sec': {'n1': 9000.0,
+                                                   'n2': 9000.0}})
+
+
+if __name__ == '__main__':
+    SUITE_MTCBENCHTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(MtcbenchTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_MTCBENCHTEST)
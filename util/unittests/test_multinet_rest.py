@@ -0,0 +1,142 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for util/multinet_rest.py."""
+
+import http.server
+import json
+import logging
+import socketserver
+import sys
+import threading
+import unittest
+import util.multinet_rest
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+# Responses of a stub master with two workers, in the format of the master:
+# a list of the JSON encoded worker responses
+WORKER_COUNTS = {'get_switches': {'10.0.0.1:3333': 50, '10.0.0.2:3333': 48},
+                 'get_flows': {'10.0.0.1:3333': 1000, '10.0.0.2:3333': 990}}
+
+
+class StubMasterHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the worker counts of a stub Multinet master
+    """
+    protocol_version = 'HTTP/1.1'
+    responses = {}
+    connections = set()
+
+    def do_POST(self):
+        """Returns the response of the requested operation, 404 if there is
+        none
+        """
+        StubMasterHandler.connections.add(self.client_address)
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        opcode = self.path.lstrip('/')
+        if opcode not in StubMasterHandler.responses:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = StubMasterHandler.responses[opcode].encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keeps the test output clean
+        """
+        pass
+
+
+class StubMasterServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """Multi-threaded stub Multinet master
+    """
+    daemon_threads = True
+
+
+class MultinetRestTest(unittest.TestCase):
+    """Unittests for the Multinet master client in util/multinet_rest.py
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Starts the stub master on a free local port
+        """
+        cls.server = StubMasterServer(('127.0.0.1', 0), StubMasterHandler)
+        cls.port = cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stops the stub master
+        """
+        util.multinet_rest.master_pool_close_all()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Resets the responses of the stub master
+        """
+        StubMasterHandler.responses = dict(
+            (opcode, json.dumps([json.dumps({worker: count}) for
+                                 worker, count in sorted(counts.items())]))
+            for opcode, counts in WORKER_COUNTS.items())
+        StubMasterHandler.connections = set()
+
+    def test_get_worker_counts(self):
+        """get_worker_counts() returns the count of every worker
+        """
+        for opcode in WORKER_COUNTS:
+            self.assertEqual(util.multinet_rest.get_worker_counts(
+                '127.0.0.1', self.port, opcode), WORKER_COUNTS[opcode])
+
+    def test_parse_worker_results(self):
+        """parse_worker_results() accepts decoded and JSON encoded worker
+        responses
+        """
+        self.assertEqual(util.multinet_rest.parse_worker_results(
+            ['{"w1": 1}', {'w2': 2}]), {'w1': 1, 'w2': 2})
+        with self.assertRaises(ValueError):
+            util.multinet_rest.parse_worker_results({'w1': 1})
+        with self.assertRaises(ValueError):
+            util.multinet_rest.parse_worker_results(['1'])
+
+    def test_errors(self):
+        """get_worker_counts() raises IOError for failed requests and invalid
+        responses
+        """
+        with self.assertRaises(IOError):
+            util.multinet_rest.get_worker_counts('127.0.0.1', self.port,
+                                                 'get_hosts')
+        StubMasterHandler.responses['get_flows'] = '["{\\"w1\\": \\"n/a\\"}"]'
+        with self.assertRaises(IOError):
+            util.multinet_rest.get_worker_counts('127.0.0.1', self.port,
+                                                 'get_flows')
+        with self.assertRaises(IOError):
+            util.multinet_rest.get_worker_counts('127.0.0.1', 1,
+                                                 'get_switches', timeout=1)
+
+    def test_keep_alive(self):
+        """Successive queries reuse the same connection
+        """
+        util.multinet_rest.master_pool_close_all()
+        for _ in range(10):
+            util.multinet_rest.get_worker_counts('127.0.0.1', self.port,
+                                                 'get_switches')
+        self.assertEqual(len(StubMasterHandler.connections), 1)
+
+
+if __name__ == '__main__':
+    SUITE_MULTINETRESTTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(MultinetRestTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_MULTINETRESTTEST)
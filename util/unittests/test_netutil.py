@@ -17,6 +17,7 @@ import string
 import struct
 import subprocess
 import sys
+import threading
 import time
 import unittest
 import util.netutil
@@ -27,6 +28,36 @@ LOGGEROBJ.level = logging.INFO
 STREAMHANDLER = logging.StreamHandler(sys.stdout)
 LOGGEROBJ.addHandler(STREAMHANDLER)
 
+
+class StubChannel:
+    """Channel of a stub sftp session or transport"""
+
+    def __init__(self):
+        self.closed = False
+
+    def get_channel(self):
+        return self
+
+    def is_active(self):
+        return not self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class StubSSHClient:
+    """ssh client with a stub transport, opening stub sftp sessions"""
+
+    def __init__(self):
+        self.transport = StubChannel()
+
+    def get_transport(self):
+        return self.transport
+
+    def open_sftp(self):
+        return StubChannel()
+
+
 class NetUtilTest(unittest.TestCase):
     """Unitest class for testing methods within netutil.py
     Methods checked: testing file.py: ssh_connect_or_return, copy_to_target,
@@ -158,6 +189,107 @@ class NetUtilTest(unittest.TestCase):
         self.assertIsNotNone(util.netutil.ssh_connect_or_return2(
              self.remote_node.ip, self.remote_node.ssh_port, self.remote_node.username, self.remote_node.password, self.constants_set.maxretries))
 
+    def test_ssh_pool_get(self):
+        """ssh_pool_get() reuses the session and replaces a stale one
+        """
+        (sftp, transport_layer) = util.netutil.ssh_pool_get(
+            self.remote_node.ip, self.remote_node.ssh_port,
+            self.remote_node.username, self.remote_node.password)
+        self.assertIs(transport_layer, util.netutil.ssh_pool_get(
+            self.remote_node.ip, self.remote_node.ssh_port,
+            self.remote_node.username, self.remote_node.password)[1])
+        transport_layer.close()
+        self.assertIsNot(transport_layer, util.netutil.ssh_pool_get(
+            self.remote_node.ip, self.remote_node.ssh_port,
+            self.remote_node.username, self.remote_node.password)[1])
+        util.netutil.ssh_pool_close_all()
+
+    def test_ssh_pool_borrowed_session(self):
+        """ssh_pool_get() never closes the transport of a borrowed session
+        """
+        ssh_client = StubSSHClient()
+        (sftp, transport_layer) = util.netutil.ssh_pool_get(
+            '10.0.1.99', 2222, 'nstat', None, ssh_client)
+        self.assertIs(transport_layer, ssh_client.transport)
+        util.netutil.ssh_pool_evict('10.0.1.99', 2222, 'nstat')
+        self.assertTrue(sftp.closed)
+        self.assertFalse(transport_layer.closed)
+        sftp = util.netutil.ssh_pool_get('10.0.1.99', 2222, 'nstat', None,
+                                         ssh_client)[0]
+        util.netutil.ssh_pool_close_all()
+        self.assertTrue(sftp.closed)
+        self.assertFalse(transport_layer.closed)
+
+    def test_ssh_pool_concurrent_handshakes(self):
+        """ssh_pool_get() opens a session while a handshake with another
+        node is in progress
+        """
+        handshake_started = threading.Event()
+        handshake_done = threading.Event()
+
+        def connection_open(ip, ssh_port, username, password):
+            if ip == '10.0.1.98':
+                handshake_started.set()
+                handshake_done.wait(5)
+            return (StubChannel(), StubChannel())
+
+        connection_open_orig = util.netutil.ssh_connection_open
+        util.netutil.ssh_connection_open = connection_open
+        try:
+            thread = threading.Thread(target=util.netutil.ssh_pool_get,
+                                      args=('10.0.1.98', 2222, 'nstat', None))
+            thread.start()
+            self.assertTrue(handshake_started.wait(5))
+            util.netutil.ssh_pool_get('10.0.1.99', 2222, 'nstat', None)
+            self.assertTrue(thread.is_alive())
+            handshake_done.set()
+            thread.join()
+        finally:
+            util.netutil.ssh_connection_open = connection_open_orig
+            util.netutil.ssh_pool_close_all()
+
+    def test_tcp_port_listens(self):
+        """tcp_port_listens() detects a listening local port
+        """
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        port = server.getsockname()[1]
+        self.assertTrue(util.netutil.tcp_port_listens('127.0.0.1', port))
+        server.close()
+        self.assertFalse(util.netutil.tcp_port_listens('127.0.0.1', port))
+
+    def test_fan_out(self):
+        """fan_out() runs tasks concurrently and collects per-task results
+        """
+        def failing_task():
+            raise IOError('task failure')
+        t_start = time.time()
+        results = util.netutil.fan_out(
+            {'host_a': lambda: time.sleep(1) or 'a',
+             'host_b': lambda: time.sleep(1) or 'b',
+             'host_c': failing_task,
+             'host_d': lambda: time.sleep(10)},
+            max_concurrency=4, timeout=2)
+        self.assertTrue(time.time() - t_start < 3)
+        self.assertEqual(results['host_a'], ('ok', 'a'))
+        self.assertEqual(results['host_b'], ('ok', 'b'))
+        self.assertEqual(results['host_c'][0], 'error')
+        self.assertIsInstance(results['host_c'][1], IOError)
+        self.assertEqual(results['host_d'], ('timeout', None))
+
+    def test_ssh_fan_out(self):
+        """ssh_fan_out() runs a command on many hosts and collects results
+        """
+        host = (self.remote_node.ip, self.remote_node.ssh_port,
+                self.remote_node.username, self.remote_node.password)
+        results = util.netutil.ssh_fan_out(
+            {'node_a': host + ('echo a',), 'node_b': host + ('exit 3',)})
+        self.assertEqual(results['node_a'][0], 'ok')
+        self.assertEqual(results['node_a'][1][0], 0)
+        self.assertEqual(results['node_a'][1][1].strip(), 'a')
+        self.assertEqual(results['node_b'][1][0], 3)
+
     @classmethod
     def tearDownClass(cls):
         """cleans setUpClass environment
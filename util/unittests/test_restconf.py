@@ -0,0 +1,278 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for util/restconf.py."""
+
+import base64
+import http.server
+import json
+import logging
+import socketserver
+import sys
+import threading
+import unittest
+import util.netutil
+import util.restconf
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+INVENTORY = {'nodes': {'node': [
+    {'id': 'openflow:1',
+     'flow-node-inventory:table': [{'id': 0, 'flow': [{'id': 'a'},
+                                                      {'id': 'b'}]},
+                                   {'id': 1}]},
+    {'id': 'openflow:2',
+     'flow-node-inventory:table': [{'id': 0, 'flow': [{'id': 'c'}]}]}]}}
+
+TOPOLOGY = {'topology': [{'topology-id': 'flow:1',
+                          'node': [{'node-id': 'openflow:1'},
+                                   {'node-id': 'openflow:2'},
+                                   {'node-id': 'host:00:00:00:00:00:01'}],
+                          'link': [{'link-id': '1'}, {'link-id': '2'},
+                                   {'link-id': '3'}]}]}
+
+ONOS_DEVICES = {'devices': [{'id': 'of:0000000000000001', 'available': True},
+                            {'id': 'of:0000000000000002', 'available': True},
+                            {'id': 'of:0000000000000003',
+                             'available': False}]}
+
+ONOS_LINKS = {'links': [{'src': {'device': 'of:0000000000000001'},
+                         'state': 'ACTIVE'},
+                        {'src': {'device': 'of:0000000000000002'},
+                         'state': 'ACTIVE'}]}
+
+ONOS_HOSTS = {'hosts': [{'id': '00:00:00:00:00:01/None'}]}
+
+ONOS_FLOWS = {'flows': [{'id': '1', 'state': 'ADDED'},
+                        {'id': '2', 'state': 'PENDING_ADD'},
+                        {'id': '3', 'state': 'ADDED'},
+                        {'id': '4', 'state': 'ADDED'}]}
+
+SHARDS = {'status': 200, 'value': {
+    'org.opendaylight.controller:Category=Shards,'
+    'name=member-1-shard-default-operational,'
+    'type=DistributedOperationalDatastore': {'RaftState': 'Leader'},
+    'org.opendaylight.controller:Category=Shards,'
+    'name=member-1-shard-inventory-operational,'
+    'type=DistributedOperationalDatastore': {'RaftState': 'Follower'}}}
+
+
+class StubRestconfHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the operational datastore documents of a stub controller
+    """
+    protocol_version = 'HTTP/1.1'
+    documents = {}
+    connections = set()
+
+    def do_GET(self):
+        """Returns the document of the requested path, 404 if there is none
+        and 401 for wrong credentials
+        """
+        StubRestconfHandler.connections.add(self.client_address)
+        credentials = base64.b64encode(b'admin:admin').decode()
+        if self.headers.get('Authorization') != 'Basic ' + credentials:
+            self.send_response(401)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path not in StubRestconfHandler.documents:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps(StubRestconfHandler.documents[self.path]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        """Stores the JSON body of the request as the document of the path
+        """
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        StubRestconfHandler.documents[self.path] = \
+            json.loads(body.decode()) if body else {}
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_DELETE(self):
+        """Deletes the document of the requested path, 404 if there is none
+        """
+        if StubRestconfHandler.documents.pop(self.path, None) is None:
+            self.send_response(404)
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        """Keeps the test output clean
+        """
+        pass
+
+
+class StubRestconfServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """Multi-threaded stub RESTCONF server
+    """
+    daemon_threads = True
+
+
+class RestconfTest(unittest.TestCase):
+    """Unittests for the direct RESTCONF client in util/restconf.py
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Starts the stub RESTCONF server on a free local port
+        """
+        cls.server = StubRestconfServer(('127.0.0.1', 0), StubRestconfHandler)
+        cls.port = cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stops the stub RESTCONF server
+        """
+        util.restconf.restconf_pool_close_all()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Resets the datastore of the stub server
+        """
+        StubRestconfHandler.documents = {
+            util.restconf.OPER_INVENTORY_PATH: INVENTORY,
+            util.restconf.OPER_TOPOLOGY_PATH: TOPOLOGY,
+            util.restconf.ONOS_DEVICES_PATH: ONOS_DEVICES,
+            util.restconf.ONOS_LINKS_PATH: ONOS_LINKS,
+            util.restconf.ONOS_HOSTS_PATH: ONOS_HOSTS,
+            util.restconf.ONOS_FLOWS_PATH: ONOS_FLOWS,
+            util.restconf.SHARD_ROLES_PATH.format(
+                'DistributedOperationalDatastore'): SHARDS}
+        StubRestconfHandler.connections = set()
+
+    def get_oper_count(self, query, password='admin'):
+        """Queries the stub server
+        """
+        return util.restconf.get_oper_count('127.0.0.1', self.port, 'admin',
+                                            password, query)
+
+    def test_get_oper_count(self):
+        """get_oper_count() for all queries
+        """
+        self.assertEqual(self.get_oper_count('switches'), 2)
+        self.assertEqual(self.get_oper_count('flows'), 3)
+        self.assertEqual(self.get_oper_count('links'), 3)
+        self.assertEqual(self.get_oper_count('hosts'), 1)
+
+    def test_get_oper_snapshot(self):
+        """get_oper_snapshot() returns all counts with a single timestamp
+        """
+        snapshot = util.restconf.get_oper_snapshot('127.0.0.1', self.port,
+                                                   'admin', 'admin')
+        self.assertEqual(snapshot['switches'], 2)
+        self.assertEqual(snapshot['flows'], 3)
+        self.assertEqual(snapshot['links'], 3)
+        self.assertEqual(snapshot['hosts'], 1)
+        self.assertTrue(snapshot['read_time_secs'] >= 0)
+        self.assertTrue('timestamp' in snapshot)
+
+    def test_get_oper_snapshot_onos(self):
+        """get_oper_snapshot() with the queries of the ONOS REST API counts
+        connected devices, active links, hosts and installed flows
+        """
+        snapshot = util.restconf.get_oper_snapshot(
+            '127.0.0.1', self.port, 'admin', 'admin',
+            queries=util.restconf.ONOS_OPER_QUERIES)
+        self.assertEqual(snapshot['switches'], 2)
+        self.assertEqual(snapshot['links'], 2)
+        self.assertEqual(snapshot['hosts'], 1)
+        self.assertEqual(snapshot['flows'], 3)
+
+    def test_restconf_post(self):
+        """restconf_post() sends the JSON body of the request
+        """
+        path = util.restconf.ONOS_CONFIGURATION_PATH.format('component')
+        util.restconf.restconf_post('127.0.0.1', self.port, 'admin', 'admin',
+                                    path, {'flowPollFrequency': '5'})
+        self.assertEqual(StubRestconfHandler.documents[path],
+                         {'flowPollFrequency': '5'})
+
+    def test_get_shard_roles(self):
+        """get_shard_roles() returns the raft state of every local shard
+        """
+        roles = util.restconf.get_shard_roles('127.0.0.1', self.port,
+                                              'admin', 'admin')
+        self.assertEqual(roles,
+                         {'member-1-shard-default-operational': 'Leader',
+                          'member-1-shard-inventory-operational':
+                          'Follower'})
+        with self.assertRaises(IOError):
+            util.restconf.get_shard_roles('127.0.0.1', self.port, 'admin',
+                                          'admin', 'config')
+
+    def test_empty_datastore(self):
+        """get_oper_count() returns 0 for an empty datastore subtree
+        """
+        StubRestconfHandler.documents = {}
+        self.assertEqual(self.get_oper_count('switches'), 0)
+        self.assertEqual(self.get_oper_count('links'), 0)
+
+    def test_restconf_delete(self):
+        """restconf_delete() deletes a resource, once
+        """
+        StubRestconfHandler.documents[
+            util.restconf.CONFIG_INVENTORY_PATH] = INVENTORY
+        for deleted in [True, False]:
+            self.assertEqual(util.restconf.restconf_delete(
+                '127.0.0.1', self.port, 'admin', 'admin',
+                util.restconf.CONFIG_INVENTORY_PATH), deleted)
+        self.assertFalse(util.restconf.CONFIG_INVENTORY_PATH in
+                         StubRestconfHandler.documents)
+
+    def test_errors(self):
+        """get_oper_count() raises IOError for failed requests
+        """
+        with self.assertRaises(IOError):
+            self.get_oper_count('switches', password='wrong')
+        with self.assertRaises(IOError):
+            util.restconf.get_oper_count('127.0.0.1', 1, 'admin', 'admin',
+                                         'switches', timeout=1)
+
+    def test_keep_alive(self):
+        """Successive queries reuse the same connection
+        """
+        util.restconf.restconf_pool_close_all()
+        for _ in range(10):
+            self.get_oper_count('flows')
+        self.assertEqual(len(StubRestconfHandler.connections), 1)
+
+    def test_concurrent_queries(self):
+        """Concurrent queries through the pooled session
+        """
+        tasks = {}
+        for task_id in range(32):
+            query = sorted(util.restconf.OPER_QUERIES)[task_id % 4]
+            tasks[task_id] = (lambda query=query: self.get_oper_count(query))
+        results = util.netutil.fan_out(tasks, max_concurrency=8)
+        expected = {'flows': 3, 'hosts': 1, 'links': 3, 'switches': 2}
+        for task_id, result in results.items():
+            query = sorted(util.restconf.OPER_QUERIES)[task_id % 4]
+            self.assertEqual(result, ('ok', expected[query]))
+        self.assertTrue(len(StubRestconfHandler.connections) <=
+                        util.restconf.POOL_MAXSIZE)
+
+
+if __name__ == '__main__':
+    SUITE_RESTCONFTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(RestconfTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_RESTCONFTEST)
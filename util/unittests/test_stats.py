@@ -36,6 +36,32 @@ class StatsAllFunctionsTest(unittest.TestCase):
         self.assertEqual(self.mean, util.stats.mean(self.l),
                          'Testing mean')
 
+    def test_median(self):
+        """
+        Checks the median() function of util/statutil.stats.py
+        module.
+        """
+        self.assertEqual(util.stats.median(self.l), 20)
+        self.assertEqual(util.stats.median([4, 1, 3, 2]), 2.5)
+
+    def test_stdev(self):
+        """
+        Checks the stdev() function of util/statutil.stats.py
+        module.
+        """
+        self.assertAlmostEqual(self.stddev, util.stats.stdev(self.l))
+
+    def test_jain_fairness_index(self):
+        """
+        Checks the jain_fairness_index() function of util/statutil.stats.py
+        module.
+        """
+        self.assertEqual(util.stats.jain_fairness_index([5, 5, 5, 5]), 1.0)
+        self.assertEqual(util.stats.jain_fairness_index([8, 0, 0, 0]), 0.25)
+        self.assertAlmostEqual(util.stats.jain_fairness_index(self.l),
+                               1.0 / (1 + self.coefvariance ** 2))
+        self.assertEqual(util.stats.jain_fairness_index([0, 0]), -1)
+
     @classmethod
     def tearDownClass(cls):
         """
@@ -8,6 +8,7 @@
 
 import logging
 import os
+import struct
 import subprocess
 import sys
 import threading
@@ -354,6 +355,120 @@ class SysLoadAverageTest(unittest.TestCase):
         """
         cls.ssh_client.close()
 
+
+class ProcParsersTest(unittest.TestCase):
+    """Unittests for the /proc parsers in util/sysstats.py"""
+
+    def test_parse_meminfo(self):
+        """Test functionality of sysstats.parse_meminfo function
+        """
+        meminfo = util.sysstats.parse_meminfo(
+            'MemTotal:        8061732 kB\nMemFree:         1419532 kB\n'
+            'HugePages_Total:       0\n')
+        self.assertEqual(meminfo['MemTotal'], 8061732 * 1024)
+        self.assertEqual(meminfo['MemFree'], 1419532 * 1024)
+        self.assertEqual(meminfo['HugePages_Total'], 0)
+
+    def test_parse_proc_stat(self):
+        """Test functionality of sysstats.parse_proc_stat function
+        """
+        stat_fields = util.sysstats.parse_proc_stat(
+            '1234 (java (main)) S 1 1234 1234 0 -1 4202496 52 0 0 0 '
+            '1500 320 0 0 20 0 45 0 100 0')
+        self.assertEqual(stat_fields[0], '1234')
+        self.assertEqual(stat_fields[2], 'S')
+        self.assertEqual(stat_fields[13], '1500')
+        self.assertEqual(stat_fields[14], '320')
+        self.assertEqual(stat_fields[19], '45')
+
+    def test_parse_proc_status(self):
+        """Test functionality of sysstats.parse_proc_status function
+        """
+        status = util.sysstats.parse_proc_status(
+            'Name:\tjava\nVmSize:\t 3215000 kB\nThreads:\t45\n')
+        self.assertEqual(status['VmSize'], ['3215000', 'kB'])
+        self.assertEqual(status['Threads'], ['45'])
+
+    def test_proc_stats(self):
+        """Test functionality of sysstats.proc_stats function
+        """
+        stats = util.sysstats.proc_stats(os.getpid())
+        self.assertEqual(stats['proc_num_threads'],
+                         threading.active_count())
+        self.assertTrue(stats['proc_vm_size'] > 0)
+        self.assertTrue(stats['proc_num_fds'] > 0)
+        stats = util.sysstats.proc_stats(-1)
+        self.assertEqual(stats['proc_vm_size'], -1)
+        self.assertEqual(stats['proc_cpu_user_time'], -1.0)
+
+    def test_parse_proc_samples(self):
+        """Test functionality of sysstats.parse_proc_samples function
+        """
+        header = struct.pack(util.sysstats.PROC_SAMPLES_HEADER_FORMAT, 5)
+        records = [struct.pack(util.sysstats.PROC_SAMPLES_RECORD_FORMAT,
+                               100.0 + n, n, n, n, n, n)
+                   for n in [3, 4, 2]]
+        series = util.sysstats.parse_proc_samples(header + b''.join(records))
+        self.assertEqual(series['timestamps'], [102.0, 103.0, 104.0])
+        self.assertEqual(series['num_fds'], [2, 3, 4])
+        series = util.sysstats.slice_proc_samples(series, 102.0, 103.0)
+        self.assertEqual(series['cpu_user_time'], [3])
+
+
+class SysProcSnapshotTest(unittest.TestCase):
+    """Unittests for the single execution snapshot in util/sysstats.py"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Creates the initial environment to run testcases of this class.
+        """
+        cls.ssh_client = util.netutil.ssh_connect_or_return(SSH_IP, 22,
+                                                            SSH_UNAME, SSH_PWD,
+                                                            10)
+
+    def test_sys_proc_snapshot(self):
+        """Test functionality of sysstats.sys_proc_snapshot function
+        """
+        snapshot = util.sysstats.sys_proc_snapshot(os.getpid())
+        self.assertTrue(snapshot['total_memory_bytes'] > 0,
+                        'Testing without using ssh_client')
+        self.assertEqual(snapshot['used_memory_bytes'],
+                         snapshot['total_memory_bytes'] -
+                         snapshot['free_memory_bytes'],
+                         'Testing without using ssh_client')
+        self.assertEqual(snapshot['proc_num_threads'],
+                         util.sysstats.proc_num_threads(os.getpid()),
+                         'Testing without using ssh_client')
+        self.assertTrue(isinstance(snapshot['proc_cpu_user_time'], float),
+                        'Testing without using ssh_client')
+        snapshot = util.sysstats.sys_proc_snapshot(-1, self.ssh_client)
+        self.assertTrue(isinstance(snapshot['timestamp'], int),
+                        'Testing using ssh_client')
+        self.assertEqual(snapshot['proc_vm_size'], -1,
+                         'Testing using ssh_client')
+
+    def test_sys_proc_snapshot_escaping(self):
+        """Test sysstats.sys_proc_snapshot with a quote in the process cwd
+        """
+        cwd = os.path.join('/tmp', 'nstat_"snapshot\\test')
+        os.makedirs(cwd)
+        proc = subprocess.Popen(['sleep', '10'], cwd=cwd)
+        try:
+            snapshot = util.sysstats.sys_proc_snapshot(proc.pid,
+                                                       self.ssh_client)
+            self.assertEqual(snapshot['proc_cwd'], cwd,
+                             'Testing using ssh_client')
+        finally:
+            proc.kill()
+            proc.wait()
+            os.rmdir(cwd)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Cleans up the environment after testing.
+        """
+        cls.ssh_client.close()
+
 if __name__ == '__main__':
 
     SUITE_MEMORYUTILSTEST = unittest.TestLoader().\
@@ -376,3 +491,11 @@ if __name__ == '__main__':
     SUITE_SYSLOADAVERAGETEST = unittest.TestLoader().\
     loadTestsFromTestCase(SysLoadAverageTest)
     unittest.TextTestRunner(verbosity=2).run(SUITE_SYSLOADAVERAGETEST)
+
+    SUITE_PROCPARSERSTEST = unittest.TestLoader().\
+    loadTestsFromTestCase(ProcParsersTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_PROCPARSERSTEST)
+
+    SUITE_SYSPROCSNAPSHOTTEST = unittest.TestLoader().\
+    loadTestsFromTestCase(SysProcSnapshotTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_SYSPROCSNAPSHOTTEST)
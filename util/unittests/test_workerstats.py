@@ -0,0 +1,89 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""Unittest Module for util/workerstats.py."""
+
+import logging
+import sys
+import unittest
+import util.workerstats
+
+LOGGER = logging.getLogger()
+LOGGER.level = logging.INFO
+STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+LOGGER.addHandler(STREAM_HANDLER)
+
+
+class FakeClock:
+    """Clock advanced only by the sleeps of the polling loop
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, secs):
+        self.now += secs
+
+
+class WorkerstatsTest(unittest.TestCase):
+    """Unittests for the per worker breakdown in util/workerstats.py
+    """
+
+    def poll(self, worker_switches, deadline_secs=10):
+        """Polls workers booting their switches as given by
+        worker_switches(time), with a fake clock
+        """
+        clock = FakeClock()
+        return util.workerstats.poll_worker_convergence(
+            lambda: worker_switches(clock.now), 50, deadline_secs, 0.0,
+            interval_secs=1.0, sleep=clock.sleep, clock=clock.time)
+
+    def test_poll_worker_convergence(self):
+        """poll_worker_convergence() brackets the boot time of every worker
+        """
+        outcome = self.poll(lambda t: {'w1': min(50, int(25 * t)),
+                                       'w2': min(50, int(25 * t)),
+                                       'w3': min(50, int(10 * t))})
+        self.assertEqual(outcome['worker_times'],
+                         {'w1': 1.5, 'w2': 1.5, 'w3': 4.5})
+        self.assertEqual(outcome['worker_error_secs'],
+                         {'w1': 0.5, 'w2': 0.5, 'w3': 0.5})
+        self.assertEqual(outcome['worker_values'],
+                         {'w1': 50, 'w2': 50, 'w3': 50})
+
+    def test_poll_worker_convergence_deadline(self):
+        """poll_worker_convergence() stops at the deadline, with -1 for the
+        workers that did not converge, and skips failed polls
+        """
+        outcome = self.poll(lambda t: None if t < 2 else
+                            {'w1': 50, 'w2': 20}, deadline_secs=5)
+        self.assertEqual(outcome['worker_times'], {'w1': 1.0, 'w2': -1})
+        self.assertEqual(outcome['worker_error_secs'], {'w1': 1.0, 'w2': -1})
+        self.assertEqual(outcome['worker_values'], {'w1': 50, 'w2': 20})
+        self.assertEqual(self.poll(lambda t: None, deadline_secs=3),
+                         {'worker_times': {}, 'worker_error_secs': {},
+                          'worker_values': {}})
+
+    def test_find_stragglers(self):
+        """find_stragglers() flags the workers far from the median and the
+        workers that did not complete
+        """
+        self.assertEqual(util.workerstats.find_stragglers(
+            {'w1': 10.0, 'w2': 11.0, 'w3': 9.5, 'w4': 25.0}), ['w4'])
+        self.assertEqual(util.workerstats.find_stragglers(
+            {'w1': 10.0, 'w2': 11.0, 'w3': 11.2, 'w4': -1}, tolerance=0.05),
+            ['w1', 'w4'])
+        self.assertEqual(util.workerstats.find_stragglers(
+            {'w1': 10.0, 'w2': 11.0}), [])
+        self.assertEqual(util.workerstats.find_stragglers({}), [])
+
+
+if __name__ == '__main__':
+    SUITE_WORKERSTATSTEST = unittest.TestLoader().\
+        loadTestsFromTestCase(WorkerstatsTest)
+    unittest.TextTestRunner(verbosity=2).run(SUITE_WORKERSTATSTEST)
@@ -0,0 +1,106 @@
+# Copyright (c) 2016 Intracom S.A. Telecom Solutions. All rights reserved.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution,
+# and is available at http://www.eclipse.org/legal/epl-v10.html
+
+"""
+Per worker breakdown of the results of a distributed emulator (Multinet).
+The workers are polled together, and the instant every worker reaches its
+expected value (e.g. all its switches booted) is bracketed between the last
+poll that did not see it and the first poll that did. A worker whose timing
+deviates from the median of all workers is flagged as a straggler, e.g. an
+overloaded worker VM which boots its switches late.
+"""
+
+import time
+import util.stats
+
+
+def poll_worker_convergence(probe, expected_value, deadline_secs,
+                            t_reference=None, interval_secs=0.5,
+                            sleep=time.sleep, clock=time.time):
+    """
+    Polls the values of all workers until every worker reaches the \
+        expected value, or until the deadline passes.
+
+    :param probe: function without arguments returning the current value \
+        of every worker keyed by the worker, or None if the values could \
+        not be read
+    :param expected_value: value of every worker on convergence
+    :param deadline_secs: polling stops after this long
+    :param t_reference: time known to precede convergence, the times of \
+        the workers are relative to it. Defaults to the time the function \
+        is called.
+    :param interval_secs: interval between polls
+    :param sleep: function used to wait between polls, e.g. gevent.sleep \
+        when polling from a greenlet
+    :param clock: function returning the current time in seconds
+    :returns: dictionary with the time every worker reached the expected \
+        value, relative to t_reference ('worker_times', -1 for the workers \
+        that did not converge), the half width of the bracket of every time \
+        ('worker_error_secs') and the last value of every worker \
+        ('worker_values')
+    :rtype: dict
+    :type probe: function
+    :type expected_value: int
+    :type deadline_secs: float
+    :type t_reference: float
+    :type interval_secs: float
+    :type sleep: function
+    :type clock: function
+    """
+    if t_reference is None:
+        t_reference = clock()
+    t_deadline = clock() + deadline_secs
+    t_lower = t_reference
+    worker_values = {}
+    worker_times = {}
+    worker_error_secs = {}
+    while True:
+        t_probe_start = clock()
+        polled_values = probe()
+        t_probe_end = clock()
+        if polled_values is not None:
+            worker_values = polled_values
+            for worker, value in worker_values.items():
+                if worker not in worker_times and value >= expected_value:
+                    worker_times[worker] = \
+                        (t_lower + t_probe_end) / 2 - t_reference
+                    worker_error_secs[worker] = (t_probe_end - t_lower) / 2
+            t_lower = t_probe_start
+        if ((worker_values and len(worker_times) == len(worker_values)) or
+                clock() >= t_deadline):
+            break
+        sleep(interval_secs)
+    for worker in worker_values:
+        worker_times.setdefault(worker, -1)
+        worker_error_secs.setdefault(worker, -1)
+    return {'worker_times': worker_times,
+            'worker_error_secs': worker_error_secs,
+            'worker_values': worker_values}
+
+
+def find_stragglers(worker_times, tolerance=0.5):
+    """
+    Finds the workers whose timing deviates from the median of all workers
+
+    :param worker_times: the time of every worker, keyed by the worker, -1 \
+        for a worker that did not complete
+    :param tolerance: allowed deviation from the median, as a fraction of \
+        the median
+    :returns: the workers that did not complete, or whose time deviates \
+        from the median by more than tolerance, sorted
+    :rtype: list<str>
+    :type worker_times: dict
+    :type tolerance: float
+    """
+    completed = [value for value in worker_times.values() if value != -1]
+    stragglers = [worker for worker, value in worker_times.items()
+                  if value == -1]
+    if completed:
+        median = util.stats.median(completed)
+        stragglers += [worker for worker, value in worker_times.items()
+                       if value != -1 and
+                       abs(value - median) > tolerance * median]
+    return sorted(stragglers)